@@ -0,0 +1,57 @@
+"""
+Benchmark suite for :py:mod:`modern_robotics`.
+
+Run it from the ``python`` directory of the repository with::
+
+    python -m benchmarks
+
+Every benchmark reports the latency of one call and the throughput in
+evaluated items (poses, twists, Jacobians, ...) per second, for the single
+argument API and for batches. Results are stored per git commit in
+``python/.benchmarks``, and compared with the results of an earlier commit,
+so that regressions are flagged. See ``python -m benchmarks --help`` for the
+options.
+
+Benchmarks are registered with the :py:func:`benchmark` decorator, in the
+``bench_*`` modules of this package.
+
+"""
+
+import typing
+
+
+class Benchmark(typing.NamedTuple):
+    """
+    Registered benchmark. ``setup`` is called with the batch size (``None``
+    for the single argument API) and returns the function to time.
+    """
+
+    name: str
+    setup: typing.Callable
+    size: typing.Optional[int]
+
+
+#: All registered benchmarks, in registration order.
+BENCHMARKS = []
+
+
+def benchmark(sizes: typing.Sequence = (None,), name: str = None) \
+        -> typing.Callable:
+    """
+    Registers a benchmark for every batch size in ``sizes``.
+
+    Args:
+        sizes: Batch sizes to run the benchmark with. ``None`` stands for the
+               single argument API.
+        name: Name of the benchmark. Defaults to the module suffix and the
+              name of the decorated function, e.g. ``num.vec_to_SO3``.
+    """
+    def decorator(setup):
+        prefix = setup.__module__.rsplit('.', 1)[-1].replace('bench_', '')
+        base = name or f'{prefix}.{setup.__name__}'
+        for size in sizes:
+            BENCHMARKS.append(Benchmark(
+                base if size is None else f'{base}[{size}]', setup, size))
+        return setup
+
+    return decorator
@@ -0,0 +1,216 @@
+"""
+Command line entry point, see :py:mod:`benchmarks`.
+"""
+
+import argparse
+import datetime
+import fnmatch
+import importlib
+import json
+import os
+import pkgutil
+import platform
+import subprocess
+import sys
+import timeit
+import tracemalloc
+
+import numpy as np
+
+from . import BENCHMARKS
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), '.benchmarks')
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Runs the modern_robotics benchmarks, stores the results '
+                    'for the current commit and flags regressions against '
+                    'an earlier run.')
+    parser.add_argument('patterns', nargs='*', default=['*'],
+                        help='Only run benchmarks matching these glob '
+                             'patterns, e.g. "num.*" or "*[1000]".')
+    parser.add_argument('--compare', metavar='COMMIT',
+                        help='Commit to compare with. Defaults to the most '
+                             'recent stored run of another commit.')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='Slowdown ratio above which a benchmark is '
+                             'flagged as regression (default 1.25).')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Number of timing repeats, the fastest is '
+                             'reported (default 5).')
+    parser.add_argument('--memory', action='store_true',
+                        help='Also measure the peak memory allocated during '
+                             'one call, with tracemalloc.')
+    parser.add_argument('--no-save', action='store_true',
+                        help='Do not store the results.')
+    parser.add_argument('--list', action='store_true',
+                        help='List the benchmarks and exit.')
+    args = parser.parse_args(argv)
+
+    for module in pkgutil.iter_modules(
+            [os.path.dirname(os.path.abspath(__file__))]):
+        if module.name.startswith('bench_'):
+            importlib.import_module(f'{__package__}.{module.name}')
+
+    selected = [b for b in BENCHMARKS
+                if any(fnmatch.fnmatchcase(b.name, p) for p in args.patterns)]
+
+    if args.list:
+        for b in selected:
+            print(b.name)
+        return 0
+
+    commit = _commit()
+    reference_commit, reference = _load_reference(args.compare, commit)
+
+    width = max((len(b.name) for b in selected), default=0)
+    print(f'commit {commit}' + (f', compared with {reference_commit}'
+                                if reference_commit else ''))
+    print(f'{"benchmark":<{width}}  {"latency":>12}  {"throughput":>14}  '
+          + (f'{"memory":>10}  ' if args.memory else '') + f'{"ratio":>6}')
+
+    results = {}
+    regressions = []
+    for b in selected:
+        function = b.setup(b.size)
+        latency = _time(function, args.repeat)
+        throughput = (b.size or 1) / latency
+        results[b.name] = {'latency': latency, 'throughput': throughput}
+
+        line = (f'{b.name:<{width}}  {_format_time(latency):>12}  '
+                f'{throughput:>12.4g}/s')
+        if args.memory:
+            memory = _peak_memory(function)
+            results[b.name]['memory'] = memory
+            line += f'  {memory / 2**20:>7.2f} MB'
+        if b.name in reference:
+            ratio = latency / reference[b.name]['latency']
+            line += f'  {ratio:>6.2f}'
+            if ratio > args.threshold:
+                line += '  REGRESSION'
+                regressions.append(b.name)
+        print(line, flush=True)
+
+    if not args.no_save:
+        _save(commit, results)
+
+    if regressions:
+        print(f'\n{len(regressions)} regression(s) against '
+              f'{reference_commit}: {", ".join(regressions)}')
+        return 1
+
+    return 0
+
+
+def _time(function, repeat: int) -> float:
+    """
+    Latency of one call in seconds, the fastest of ``repeat`` runs that each
+    take at least 0.2 seconds.
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def _peak_memory(function) -> int:
+    """
+    Peak memory in bytes allocated during one call.
+    """
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.3f} {unit}'
+
+    return f'{seconds / 1e-9:.1f} ns'
+
+
+def _commit() -> str:
+    """
+    Short hash of the checked out commit, with a ``-dirty`` suffix if the
+    working tree has changes.
+    """
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                cwd=cwd, check=True, capture_output=True,
+                                text=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain',
+                                '--untracked-files=no'],
+                               cwd=cwd, check=True, capture_output=True,
+                               text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+    return commit + ('-dirty' if dirty else '')
+
+
+def _save(commit: str, results: dict):
+    """
+    Merges the results into the stored results of this commit, so that
+    partial runs add up.
+    """
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f'{commit}.json')
+
+    stored = {'benchmarks': {}}
+    if os.path.exists(path):
+        with open(path) as f:
+            stored = json.load(f)
+
+    stored.update({
+        'commit': commit,
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+    })
+    stored['benchmarks'].update(results)
+
+    with open(path, 'w') as f:
+        json.dump(stored, f, indent=2)
+
+
+def _load_reference(commit: str, current: str) -> tuple:
+    """
+    Loads the stored results of commit, or of the most recently stored
+    other commit if commit is None.
+
+    Returns:
+        Tuple with the commit and its benchmark results, ``(None, {})`` if
+        there is nothing to compare with.
+    """
+    if not os.path.isdir(RESULTS_DIR):
+        return None, {}
+
+    if commit is None:
+        runs = [f for f in os.listdir(RESULTS_DIR)
+                if f.endswith('.json') and f != f'{current}.json']
+        if not runs:
+            return None, {}
+        path = max((os.path.join(RESULTS_DIR, f) for f in runs),
+                   key=os.path.getmtime)
+    else:
+        path = os.path.join(RESULTS_DIR, f'{commit}.json')
+        if not os.path.exists(path):
+            sys.exit(f'No stored results for commit {commit}')
+
+    with open(path) as f:
+        stored = json.load(f)
+
+    return stored['commit'], stored['benchmarks']
+
+
+if __name__ == '__main__':
+    sys.exit(main())
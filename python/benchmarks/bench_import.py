@@ -0,0 +1,39 @@
+"""
+Import time benchmarks. Every benchmark imports a module in a fresh
+interpreter, so the latency includes the interpreter start-up; compare with
+``import.python`` to see the cost of the import itself.
+"""
+
+import os
+import subprocess
+import sys
+from . import benchmark
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _import(statement):
+    def run():
+        subprocess.run([sys.executable, '-c', statement], cwd=PYTHON_DIR,
+                       check=True)
+    return run
+
+
+@benchmark()
+def python(n):
+    return _import('pass')
+
+
+@benchmark(name='import.modern_robotics')
+def modern_robotics(n):
+    return _import('import modern_robotics')
+
+
+@benchmark(name='import.modern_robotics.num')
+def modern_robotics_num(n):
+    return _import('import modern_robotics.num')
+
+
+@benchmark(name='import.modern_robotics.sym')
+def modern_robotics_sym(n):
+    return _import('import modern_robotics.sym')
@@ -0,0 +1,395 @@
+"""
+Benchmarks of :py:mod:`modern_robotics.num`.
+"""
+
+import functools
+import os
+import numpy as np
+import modern_robotics.num as mr
+from modern_robotics.num import dynamics, jit, kinematics, parallel, \
+    quaternion, trajectory
+from . import benchmark
+
+BATCH = (None, 1000, 100000)
+
+rng = np.random.default_rng(0)
+
+
+def _omega(n):
+    if n is None:
+        return rng.normal(size=(3, 1))
+    return rng.normal(size=(n, 3))
+
+
+def _twist(n):
+    S = rng.normal(size=(6, 1) if n is None else (n, 6))
+    omega = S[:3] if n is None else S[:, :3]
+    omega /= np.linalg.norm(omega, axis=0 if n is None else 1, keepdims=True)
+    return S
+
+
+def _pose(n):
+    return mr.vec_to_SE3(_twist(n),
+                         rng.normal() if n is None else rng.normal(size=n))
+
+
+@benchmark(BATCH)
+def vec_to_SO3(n):
+    omega = _omega(n)
+    return lambda: mr.vec_to_SO3(omega)
+
+
+@benchmark(BATCH)
+def SO3_to_vec(n):
+    R = mr.vec_to_SO3(_omega(n))
+    return lambda: mr.SO3_to_vec(R)
+
+
+@benchmark(BATCH)
+def vec_to_SE3(n):
+    S = _twist(n)
+    theta = rng.normal() if n is None else rng.normal(size=n)
+    return lambda: mr.vec_to_SE3(S, theta)
+
+
+@benchmark(BATCH)
+def SE3_to_vec(n):
+    T = _pose(n)
+    return lambda: mr.SE3_to_vec(T)
+
+
+@benchmark(BATCH)
+def SE3_to_vec_robust(n):
+    T = _pose(n)
+    return lambda: mr.SE3_to_vec(T, robust=True)
+
+
+@benchmark(BATCH)
+def inv_SE3(n):
+    T = _pose(n)
+    return lambda: mr.inv_SE3(T)
+
+
+@benchmark()
+def big_adjoint(n):
+    T = _pose(n)
+    return lambda: mr.big_adjoint(T)
+
+
+@benchmark()
+def little_adjoint(n):
+    V = _twist(n)
+    return lambda: mr.little_adjoint(V)
+
+
+@benchmark(BATCH)
+def exp_jacobian_SE3(n):
+    V = _twist(n)
+    return lambda: mr.exp_jacobian_SE3(V)
+
+
+@benchmark(BATCH)
+def exp_jacobian_inv_SE3(n):
+    V = _twist(n)
+    return lambda: mr.exp_jacobian_inv_SE3(V)
+
+
+@benchmark(BATCH)
+def manipulability(n):
+    J = rng.normal(size=(6, 7) if n is None else (n, 6, 7))
+    return lambda: mr.manipulability(J)
+
+
+def _angle(n):
+    return rng.normal() if n is None else rng.normal(size=n)
+
+
+@benchmark(BATCH)
+def gen_TRx(n):
+    theta = _angle(n)
+    return lambda: mr.gen.TRx(theta)
+
+
+@benchmark(BATCH)
+def gen_TRy(n):
+    theta = _angle(n)
+    return lambda: mr.gen.TRy(theta)
+
+
+@benchmark(BATCH)
+def gen_TRz(n):
+    theta = _angle(n)
+    return lambda: mr.gen.TRz(theta)
+
+
+@benchmark(BATCH)
+def gen_Tt(n):
+    x, y, z = _angle(n), _angle(n), _angle(n)
+    return lambda: mr.gen.Tt(x=x, y=y, z=z)
+
+
+@benchmark(BATCH)
+def gen_TRzyx(n):
+    alpha, beta, gamma = _angle(n), _angle(n), _angle(n)
+    return lambda: mr.gen.TRzyx(alpha, beta, gamma)
+
+
+@benchmark(BATCH)
+def gen_TDH(n):
+    theta, d, a, alpha = _angle(n), _angle(n), _angle(n), _angle(n)
+    return lambda: mr.gen.TDH(theta, d, a, alpha)
+
+
+def _robot():
+    S_list = _twist(6).T
+    M = _pose(None)
+    return M, S_list
+
+
+@benchmark(BATCH)
+def FK_space(n):
+    M, S_list = _robot()
+    theta = rng.normal(size=6 if n is None else (n, 6))
+    return lambda: kinematics.FK_space(M, S_list, theta)
+
+
+@benchmark(BATCH)
+def FK_jacobian_space(n):
+    M, S_list = _robot()
+    theta = rng.normal(size=6 if n is None else (n, 6))
+    return lambda: kinematics.FK_jacobian_space(M, S_list, theta)
+
+
+@benchmark((1000, 100000))
+def manipulability_map_space(n):
+    M, S_list = _robot()
+    theta = rng.normal(size=(n, 6))
+    out = np.empty(n, dtype=kinematics.MANIPULABILITY_DTYPE)
+    return lambda: kinematics.manipulability_map_space(S_list, theta, out=out)
+
+
+@benchmark()
+def vec_to_SE3_out(n):
+    S = _twist(n)
+    out = np.empty((4, 4))
+    return lambda: mr.vec_to_SE3(S, 0.3, out=out)
+
+
+@benchmark()
+def inv_SE3_out(n):
+    T = _pose(n)
+    out = np.empty((4, 4))
+    return lambda: mr.inv_SE3(T, out=out)
+
+
+@benchmark()
+def big_adjoint_out(n):
+    T = _pose(n)
+    out = np.empty((6, 6))
+    return lambda: mr.big_adjoint(T, out=out)
+
+
+@benchmark((1000, 100000))
+def screw_trajectory(n):
+    X_start, X_end = _pose(None), _pose(None)
+    out = np.empty((n, 4, 4))
+    return lambda: trajectory.screw_trajectory(X_start, X_end, 10., n,
+                                               out=out)
+
+
+@benchmark((1000, 100000))
+def cartesian_trajectory(n):
+    X_start, X_end = _pose(None), _pose(None)
+    out = np.empty((n, 4, 4))
+    return lambda: trajectory.cartesian_trajectory(X_start, X_end, 10., n,
+                                                   out=out)
+
+
+@benchmark((1000, 100000))
+def iter_screw_trajectory(n):
+    X_start, X_end = _pose(None), _pose(None)
+    return lambda: sum(1 for _ in trajectory.iter_screw_trajectory(
+        X_start, X_end, 10., n))
+
+
+@benchmark(BATCH)
+def compose_SE3(n):
+    A, B = _pose(n), _pose(n)
+    return lambda: A @ B
+
+
+@benchmark(BATCH)
+def quaternion_dual_mul(n):
+    A = quaternion.dual_from_SE3(_pose(n))
+    B = quaternion.dual_from_SE3(_pose(n))
+    return lambda: quaternion.dual_mul(A, B)
+
+
+@benchmark(BATCH)
+def quaternion_dual_from_SE3(n):
+    T = _pose(n)
+    return lambda: quaternion.dual_from_SE3(T)
+
+
+@benchmark(BATCH)
+def quaternion_dual_to_SE3(n):
+    Q = quaternion.dual_from_SE3(_pose(n))
+    return lambda: quaternion.dual_to_SE3(Q)
+
+
+@benchmark(BATCH)
+def quaternion_dual_log(n):
+    Q = quaternion.dual_from_SE3(_pose(n))
+    return lambda: quaternion.dual_log(Q)
+
+
+@benchmark((1000, 100000))
+def quaternion_sclerp(n):
+    Q_start = quaternion.dual_from_SE3(_pose(None))
+    Q_end = quaternion.dual_from_SE3(_pose(None))
+    s = np.linspace(0, 1, n)
+    return lambda: quaternion.sclerp(Q_start, Q_end, s)
+
+
+def _dynamics_robot():
+    S_list = _twist(6).T
+    M_list = _pose(6)
+    G_list = np.zeros((6, 6, 6))
+    B = rng.normal(size=(6, 3, 3))
+    G_list[:, 0:3, 0:3] = B @ np.swapaxes(B, -1, -2) + 0.1 * np.eye(3)
+    G_list[:, 3:6, 3:6] = rng.uniform(0.5, 5, size=(6, 1, 1)) * np.eye(3)
+    return M_list, G_list, S_list
+
+
+@benchmark(BATCH)
+def inverse_dynamics(n):
+    M_list, G_list, S_list = _dynamics_robot()
+    theta, theta_dot, theta_ddot = rng.normal(
+        size=(3, 6) if n is None else (3, n, 6))
+    return lambda: dynamics.inverse_dynamics(M_list, G_list, S_list, theta,
+                                             theta_dot, theta_ddot)
+
+
+@benchmark(BATCH)
+def mass_matrix(n):
+    M_list, G_list, S_list = _dynamics_robot()
+    theta = rng.normal(size=6 if n is None else (n, 6))
+    return lambda: dynamics.mass_matrix(M_list, G_list, S_list, theta)
+
+
+@benchmark(BATCH)
+def forward_dynamics(n):
+    M_list, G_list, S_list = _dynamics_robot()
+    theta, theta_dot, tau = rng.normal(
+        size=(3, 6) if n is None else (3, n, 6))
+    return lambda: dynamics.forward_dynamics(M_list, G_list, S_list, theta,
+                                             theta_dot, tau)
+
+
+@benchmark((None, 1000))
+def simulate(n):
+    M_list, G_list, S_list = _dynamics_robot()
+    theta, theta_dot = rng.normal(size=(2, 6) if n is None else (2, n, 6))
+    tau = np.zeros((10, 6))
+    return lambda: dynamics.simulate(M_list, G_list, S_list, theta,
+                                     theta_dot, tau, 1e-3)
+
+
+# Scaling of the process pool with the number of processes, from 1 (which
+# evaluates in the calling process) up to the number of cores. The pool is
+# started in the first, untimed, call.
+
+def _processes():
+    cores = os.cpu_count() or 1
+    return sorted({2**k for k in range(cores.bit_length())} | {cores})
+
+
+for _p in _processes():
+    @benchmark((100000, 1000000), name=f'num.parallel_SE3_to_vec_x{_p}')
+    def parallel_SE3_to_vec(n, processes=_p):
+        T = _pose(n)
+        executor = parallel.Executor(processes)
+        executor.map_batch(mr.SE3_to_vec, T)
+        return lambda: executor.map_batch(mr.SE3_to_vec, T)
+
+    @benchmark((10000,), name=f'num.parallel_IK_space_x{_p}')
+    def parallel_IK_space(n, processes=_p):
+        M, S_list = _robot()
+        T_d = kinematics.FK_space(M, S_list, rng.normal(size=(n, 6)))
+        theta0 = rng.normal(size=(n, 6))
+        IK = functools.partial(kinematics.IK_space, S_list, M)
+        executor = parallel.Executor(processes)
+        executor.map_batch(IK, T_d, theta0)
+        return lambda: executor.map_batch(IK, T_d, theta0)
+
+
+# Compiled kernels, to compare with the single argument benchmarks of the
+# numpy implementations above. Only registered if numba is installed; the
+# first call in the setup compiles the kernel (or loads it from the cache).
+
+if jit.COMPILED:
+    @benchmark()
+    def jit_vec_to_SO3(n):
+        omega = _omega(n)
+        jit.vec_to_SO3(omega)
+        return lambda: jit.vec_to_SO3(omega)
+
+    @benchmark()
+    def jit_vec_to_SE3(n):
+        S = _twist(n)
+        theta = rng.normal()
+        jit.vec_to_SE3(S, theta)
+        return lambda: jit.vec_to_SE3(S, theta)
+
+    @benchmark()
+    def jit_SE3_to_vec(n):
+        T = _pose(n)
+        jit.SE3_to_vec(T)
+        return lambda: jit.SE3_to_vec(T)
+
+    @benchmark()
+    def jit_inv_SE3(n):
+        T = _pose(n)
+        jit.inv_SE3(T)
+        return lambda: jit.inv_SE3(T)
+
+    @benchmark()
+    def jit_big_adjoint(n):
+        T = _pose(n)
+        jit.big_adjoint(T)
+        return lambda: jit.big_adjoint(T)
+
+
+# float32 variants of batched benchmarks above, to compare with float64.
+
+@benchmark((1000, 100000))
+def vec_to_SO3_float32(n):
+    omega = _omega(n).astype(np.float32)
+    return lambda: mr.vec_to_SO3(omega)
+
+
+@benchmark((1000, 100000))
+def vec_to_SE3_float32(n):
+    S = _twist(n).astype(np.float32)
+    theta = rng.normal(size=n).astype(np.float32)
+    return lambda: mr.vec_to_SE3(S, theta)
+
+
+@benchmark((1000, 100000))
+def SE3_to_vec_float32(n):
+    T = _pose(n).astype(np.float32)
+    return lambda: mr.SE3_to_vec(T)
+
+
+@benchmark((1000, 100000))
+def inv_SE3_float32(n):
+    T = _pose(n).astype(np.float32)
+    return lambda: mr.inv_SE3(T)
+
+
+@benchmark((1000, 100000))
+def FK_space_float32(n):
+    M, S_list = _robot()
+    M, S_list = M.astype(np.float32), S_list.astype(np.float32)
+    theta = rng.normal(size=(n, 6)).astype(np.float32)
+    return lambda: kinematics.FK_space(M, S_list, theta)
@@ -0,0 +1,140 @@
+"""
+Benchmarks of :py:mod:`modern_robotics.sym`. The symbolic backend has no
+batched API and no ``SE3_to_vec`` or ``manipulability``, so only single calls
+of the remaining functions are timed.
+
+The ``FK_*`` benchmarks compare the product of exponentials of a UR5-like arm
+composed with ``*`` against :py:mod:`modern_robotics.sym.chain`. Run them
+with ``--memory`` to also compare the peak memory.
+"""
+
+import functools
+
+import sympy as sp
+import modern_robotics.sym as mr
+from modern_robotics.sym import chain
+from . import benchmark
+
+theta = sp.Symbol('theta')
+omega = sp.Matrix([1, 2, 3]) / sp.sqrt(14)
+S = sp.Matrix([0, 0, 1, 1, 2, 0])
+
+
+@benchmark()
+def vec_to_SO3(n):
+    return lambda: mr.vec_to_SO3(omega, theta)
+
+
+@benchmark()
+def SO3_to_vec(n):
+    R = mr.vec_to_SO3(omega, sp.pi/3)
+    return lambda: mr.SO3_to_vec(R)
+
+
+@benchmark()
+def SO3_to_vec_uncached(n):
+    R = mr.vec_to_SO3(omega, sp.pi/3)
+
+    def run():
+        mr.cache.default.clear()
+        mr.SO3_to_vec(R)
+
+    return run
+
+
+@benchmark()
+def vec_to_SE3(n):
+    return lambda: mr.vec_to_SE3(S, theta)
+
+
+@benchmark()
+def inv_SE3(n):
+    T = mr.vec_to_SE3(S, theta)
+    return lambda: mr.inv_SE3(T)
+
+
+@benchmark()
+def big_adjoint(n):
+    T = mr.vec_to_SE3(S, theta)
+    return lambda: mr.big_adjoint(T)
+
+
+@benchmark()
+def little_adjoint(n):
+    return lambda: mr.little_adjoint(S * theta)
+
+
+@benchmark()
+def gen_TRx(n):
+    return lambda: mr.gen.TRx(theta)
+
+
+@benchmark()
+def gen_TRy(n):
+    return lambda: mr.gen.TRy(theta)
+
+
+@benchmark()
+def gen_TRz(n):
+    return lambda: mr.gen.TRz(theta)
+
+
+@benchmark()
+def gen_Tt(n):
+    return lambda: mr.gen.Tt(x=theta, y=2, z=3)
+
+
+def _arm(n):
+    """
+    Links of the first n joints of a UR5-like arm, as exponentials of its
+    space frame screw axes.
+    """
+    W1, L1, L2, H1, H2 = (sp.Rational(x, 1000) for x in (109, 425, 392, 89,
+                                                         95))
+    S_list = [[0, 0, 1, 0, 0, 0],
+              [0, 1, 0, -H1, 0, 0],
+              [0, 1, 0, -H1, 0, L1],
+              [0, 1, 0, -H1, 0, L1 + L2],
+              [0, 0, -1, -W1, L1 + L2, 0],
+              [0, 1, 0, H2 - H1, 0, L1 + L2]]
+    q = sp.symbols(f'q1:{n + 1}')
+
+    return [mr.vec_to_SE3(sp.Matrix(S), q_i) for S, q_i in zip(S_list, q)]
+
+
+def _uncached(function):
+    """
+    Clears the sympy and simplification caches before every call, so that
+    repeated runs do not just look up the first result.
+    """
+    def run():
+        sp.core.cache.clear_cache()
+        mr.cache.default.clear()
+        function()
+
+    return run
+
+
+@benchmark()
+def FK_product(n):
+    links = _arm(6)
+    return _uncached(lambda: functools.reduce(lambda A, B: A * B, links))
+
+
+@benchmark()
+def FK_chain(n):
+    links = _arm(6)
+    return _uncached(lambda: chain.compose(*links).cse())
+
+
+@benchmark()
+def FK_product_simplified(n):
+    links = _arm(3)
+    return _uncached(
+        lambda: sp.simplify(functools.reduce(lambda A, B: A * B, links)))
+
+
+@benchmark()
+def FK_chain_simplified(n):
+    links = _arm(3)
+    return _uncached(lambda: chain.compose(*links).expand(simplify=True))
@@ -1,5 +1,52 @@
-from .num import *
+"""
+The numerical implementations of :py:mod:`modern_robotics.num` are available
+directly on this package, e.g. ``modern_robotics.vec_to_SO3``. Nothing is
+imported until it is first used: accessing a function loads
+:py:mod:`modern_robotics.num` (and numpy), and :py:mod:`modern_robotics.sym`
+(and sympy) is only loaded when it is accessed itself.
+
+Setting the ``MODERN_ROBOTICS_PROFILE`` environment variable profiles the
+whole program, see :py:mod:`modern_robotics.profiling`.
+
+"""
+
+import importlib
+import os
 
 
 __version__ = '0.1.1'
 __version_info__ = (0, 1, 1)
+
+_SUBMODULES = ('num', 'profiling', 'sym')
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+
+    num = importlib.import_module('.num', __name__)
+    if name == '__all__':
+        # Only the functions, a star import should not load the submodules
+        # of num.
+        return [name for name in num.__all__ if name not in num._SUBMODULES]
+
+    try:
+        value = getattr(num, name)
+    except AttributeError:
+        raise AttributeError(f'module {__name__!r} has no attribute '
+                             f'{name!r}') from None
+
+    # Cache the attribute, so that later lookups skip this function.
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES)
+                  | set(importlib.import_module('.num', __name__).__all__))
+
+
+if os.environ.get('MODERN_ROBOTICS_PROFILE'):
+    from . import profiling
+    profiling._profile_to(os.environ['MODERN_ROBOTICS_PROFILE'])
@@ -6,55 +6,117 @@ This module contains numerical implementations, using
 ``import modern_robotics``. They can be loaded specifically by using
 ``import modern_robotics.num as mr``.
 
+For single inputs, the most frequently called functions can use compiled
+kernels instead, see :py:func:`set_backend` and
+:py:mod:`modern_robotics.num.jit`.
+
 """
 
+import importlib
+import math
+import os
+import warnings
 import numpy as np
-from . import gen
-
 
-def SO3_to_vec(R: np.array) -> np.array:
+from modern_robotics import profiling
+
+__all__ = [
+    'SO3_to_vec',
+    'vec_to_SO3',
+    'vec_to_so3',
+    'so3_to_vec',
+    'SE3_to_vec',
+    'vec_to_SE3',
+    'big_adjoint',
+    'little_adjoint',
+    'exp_jacobian_SO3',
+    'exp_jacobian_inv_SO3',
+    'exp_jacobian_SE3',
+    'exp_jacobian_inv_SE3',
+    'inv_SE3',
+    'R_p_to_SE3',
+    'manipulability',
+    'set_backend',
+    'get_backend',
+    'dynamics',
+    'gen',
+    'jit',
+    'kinematics',
+    'parallel',
+    'pose',
+    'quaternion',
+    'trajectory',
+]
+
+_SUBMODULES = ('dynamics', 'gen', 'jit', 'kinematics', 'parallel', 'pose',
+               'quaternion', 'trajectory')
+
+#: Names accepted by :py:func:`set_backend`.
+BACKENDS = ('numpy', 'numba')
+
+# The jit submodule while the numba backend is selected, None otherwise.
+_jit = None
+
+
+def __getattr__(name: str):
+    # Submodules are imported on first use, to keep importing the package
+    # itself cheap.
+    if name in _SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
+
+
+def SO3_to_vec(R: np.array, robust: bool = False) -> np.array:
     """
     'Differentiation' of a rotation matrix by using the matrix log to
     determine the angular velocity that reaches that orientation in unit time.
 
+    A stack of rotation matrices is handled in a single pass. The special
+    cases (identity and :math:`\\theta = \\pi`) are resolved per matrix with
+    masks, instead of branching on the whole input.
+
+    In robust mode there are no special cases, and the result is finite and
+    continuous for all rotations: the identity gives a zero vector, small
+    angles use the Taylor series of :math:`\\theta / \\sin\\theta`, and angles
+    near :math:`\\pi` take the axis from the symmetric part of
+    :math:`\\RotationMatrix`. Only at :math:`\\theta = \\pi` itself the
+    direction of the axis is arbitrary.
+
     Args:
-        R: 3 by 3 rotation matrix :math:`\\RotationMatrix \\in \\SOthree`.
+        R: 3 by 3 rotation matrix :math:`\\RotationMatrix \\in \\SOthree`, or
+           N by 3 by 3 array of rotation matrices.
+        robust: Whether to use the robust mode, instead of returning a NaN
+                axis for the identity.
 
     Returns:
         Angular velocity vector :math:`\\omega` with length
-        :math:`\\theta`.
+        :math:`\\theta`, or N by 3 array with one angular velocity per row if
+        a stack was given.
 
     See Also:
         :py:func:`so3_to_vec`
         :py:func:`vec_to_SO3`
     """
-    if np.allclose(R, np.eye(3)):
-        # If R is equal to identity (to precision), angular velocity magnitude
-        # is 0 and direction is undefined.
-        theta = 0
-        omega = np.full((3, 1), np.nan)
-    elif np.allclose(R.trace(), -1):
-        # If trace of R is -1, angular velocity magnitude is pi, and direction
-        # is either x, y, or z, depending on values of R.
-        theta = np.pi
-        if not np.allclose(R[2, 2], -1):
-            omega = 1/(np.sqrt(2 * (1 + R[2, 2]))) * \
-                (R[:, 2:3] + np.array([[0], [0], [1]]))
-        elif not np.allclose(R[1, 1], -1):
-            omega = 1/(np.sqrt(2 * (1 + R[1, 1]))) * \
-                (R[:, 1:2] + np.array([[0], [1], [0]]))
-        elif not np.allclose(R[0, 0], -1):
-            omega = 1/(np.sqrt(2 * (1 + R[0, 0]))) * \
-                (R[:, 0:1] + np.array([[1], [0], [0]]))
+    R = np.asarray(R)
+    if robust:
+        omega, _ = _SO3_log(R, 'num.SO3_to_vec')
     else:
-        theta = np.arccos(1/2 * (R.trace() - 1))
-        omega_tilde = 1/(2 * np.sin(theta)) * (R - R.T)
-        omega = so3_to_vec(omega_tilde)
+        omega_hat, theta = _SO3_to_axis_angle(R, 'num.SO3_to_vec')
+        omega = omega_hat * theta[..., np.newaxis]
+
+    if R.ndim == 2:
+        return omega[:, np.newaxis]
 
-    return omega * theta
+    return omega
 
 
-def vec_to_SO3(omega: np.array, theta: float = None) -> np.array:
+def vec_to_SO3(omega: np.array, theta: float = None,
+               robust: bool = False) -> np.array:
     """
     'Integration' of an angular velocity to determine the orientation
     (expressed as rotation matrix) that this angular velocity reaches in unit
@@ -70,47 +132,115 @@ def vec_to_SO3(omega: np.array, theta: float = None) -> np.array:
         I + \\TildeSkew{\\UnitLength{\\omega}}\\sin\\theta +
         \\TildeSkew{\\UnitLength{\\omega}}^2(1-\\cos\\theta) \\in \\SOthree
 
+    Both arguments can also be given as stacks, in which case all rotations
+    are evaluated at once. ``omega`` and ``theta`` are broadcast against each
+    other, so a single axis can be combined with an array of angles and vice
+    versa.
+
     Args:
-        omega: 3 vector angular velocity. Can be unit length, in that case
-               theta should also be provided.
+        omega: 3 vector angular velocity, or N by 3 array with one angular
+               velocity per row. Can be unit length, in that case theta
+               should also be provided.
         theta: If omitted, the Euclidean norm of omega is assumed to be theta.
+               Can be an array of N angles.
+        robust: Whether to evaluate an omitted theta without dividing by it,
+                with :math:`\\sin\\theta / \\theta` and
+                :math:`(1 - \\cos\\theta) / \\theta^2` as coefficients of the
+                unnormalized omega, so that a zero omega gives the identity
+                instead of NaN.
 
     Returns:
-        3 by 3 rotation matrix :math:`\\RotationMatrix \\in \\SOthree`.
+        3 by 3 rotation matrix :math:`\\RotationMatrix \\in \\SOthree`, or N by
+        3 by 3 array of rotation matrices if a stack was given.
+
+    Example:
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> import modern_robotics.num as mr
+            >>> omega = np.array([[0, 0, 1], [1, 0, 0]])
+            >>> mr.vec_to_SO3(omega, np.array([np.pi/2, np.pi])).round(3)
+            array([[[ 0., -1.,  0.],
+                    [ 1.,  0.,  0.],
+                    [ 0.,  0.,  1.]],
+            <BLANKLINE>
+                   [[ 1.,  0.,  0.],
+                    [ 0., -1., -0.],
+                    [ 0.,  0., -1.]]])
 
     See Also:
         :py:func:`vec_to_so3`
         :py:func:`SO3_to_vec`
     """
+    omega = _as_vectors(omega, 3)
+    if _jit is not None and omega.shape == (3,) \
+            and omega.dtype == _FLOAT64 and not robust \
+            and (theta is None or isinstance(theta, (int, float))):
+        return _jit.vec_to_SO3(omega, theta)
+
+    dtype = _float_dtype(omega, theta)
+    omega = omega.astype(dtype, copy=False)
+
+    if theta is None and robust:
+        theta = np.linalg.norm(omega, axis=-1)
+        a, _ = _exp_coefficients(theta)
+        sinc = np.sinc(theta / np.pi)[..., np.newaxis, np.newaxis]
+        return np.eye(3, dtype=dtype) + sinc * vec_to_so3(omega) \
+            + a * _so3_squared(omega, theta)
+
     if theta is None:
         # If no theta, take length of omega and make omega unit length.
-        theta = np.linalg.norm(omega)
-        omega = omega / theta
+        theta = np.linalg.norm(omega, axis=-1)
+        omega = omega / theta[..., np.newaxis]
+
+    theta = np.asarray(theta, dtype=dtype)[..., np.newaxis, np.newaxis]
+    eye = np.eye(3, dtype=dtype)
 
-    # Skew-symmetric form of omega
+    # Skew-symmetric form of omega, and its square written out as
+    # omega omega^T - |omega|^2 I to avoid a second matrix product.
     omega_tilde = vec_to_so3(omega)
+    omega_tilde_sq = omega[..., :, np.newaxis] * omega[..., np.newaxis, :] \
+        - np.sum(omega**2, axis=-1)[..., np.newaxis, np.newaxis] * eye
 
     # Rodrigues' formula
-    return np.eye(3) + np.sin(theta) * omega_tilde + \
-        (1 - np.cos(theta)) * np.linalg.matrix_power(omega_tilde, 2)
+    return eye + np.sin(theta) * omega_tilde + \
+        (1 - np.cos(theta)) * omega_tilde_sq
 
 
-def vec_to_so3(v: np.array) -> np.array:
+def vec_to_so3(v: np.array, out: np.array = None) -> np.array:
     """
     Build a skew-symmetric matrix from a 3 vector.
 
     Args:
-        v: 3 vector.
+        v: 3 vector, or N by 3 array with one vector per row.
+        out: 3 by 3 (or N by 3 by 3) array to write the result into.
+             Optional, if omitted a new array is allocated.
 
     Returns:
-        3 by 3 skew-symmetric matrix form of v, :math:`\\TildeSkew{v}`.
+        3 by 3 skew-symmetric matrix form of v, :math:`\\TildeSkew{v}`, or N
+        by 3 by 3 array of skew-symmetric matrices if a stack was given.
 
     See Also:
         :py:func:`so3_to_vec`
     """
-    return np.array([[0, -v.item(2), v.item(1)],
-                     [v.item(2), 0, -v.item(0)],
-                     [-v.item(1), v.item(0), 0]])
+    v = _as_vectors(v, 3)
+
+    if out is None:
+        out = np.empty(v.shape[:-1] + (3, 3), dtype=v.dtype)
+
+    # np.negative(..., out=...) is avoided, it gives wrong results for short
+    # strided float32 views in some numpy releases.
+    out[..., 0, 0] = 0
+    out[..., 1, 1] = 0
+    out[..., 2, 2] = 0
+    out[..., 0, 1] = -v[..., 2]
+    out[..., 0, 2] = v[..., 1]
+    out[..., 1, 0] = v[..., 2]
+    out[..., 1, 2] = -v[..., 0]
+    out[..., 2, 0] = -v[..., 1]
+    out[..., 2, 1] = v[..., 0]
+
+    return out
 
 
 def so3_to_vec(v_tilde: np.array) -> np.array:
@@ -120,104 +250,206 @@ def so3_to_vec(v_tilde: np.array) -> np.array:
 
     Args:
         v_tilde: 3 by 3 skew-symmetric matrix form of v,
-                 :math:`\\TildeSkew{v}`.
+                 :math:`\\TildeSkew{v}`, or N by 3 by 3 array of
+                 skew-symmetric matrices.
 
     Returns:
-        3 vector.
+        3 vector, or N by 3 array with one vector per row if a stack was
+        given.
 
     See Also:
         :py:func:`vec_to_so3`
     """
-    return np.array([[v_tilde.item(2, 1)],
-                     [v_tilde.item(0, 2)],
-                     [v_tilde.item(1, 0)]])
+    v_tilde = np.asarray(v_tilde)
+    v = np.stack((v_tilde[..., 2, 1],
+                  v_tilde[..., 0, 2],
+                  v_tilde[..., 1, 0]), axis=-1)
+
+    if v_tilde.ndim == 2:
+        return v[:, np.newaxis]
 
+    return v
 
-def SE3_to_vec(T: np.array) -> np.array:
+
+def SE3_to_vec(T: np.array, robust: bool = False) -> np.array:
     """
     'Differentiation' of a transformation matrix by using the matrix log of its
     rotation matrix to determine the screw velocity vector (twist) that reaches
     this transformation in unit time.
 
+    A stack of transformation matrices is handled in a single pass. The
+    special cases (identity, pure translation) are resolved per matrix with
+    masks, instead of branching on the whole input.
+
+    In robust mode there are no special cases, and the result is finite and
+    continuous for all transformations: the rotation is handled as in
+    :py:func:`SO3_to_vec`, and the linear part is
+    :math:`\\Jacobian_l^{-1}(\\omega\\theta) p` (see
+    :py:func:`exp_jacobian_inv_SO3`), which uses a Taylor series for small
+    angles. The identity gives a zero twist, and a pure translation
+    :math:`(0, p)`.
+
     Args:
-        T: Homogeneous transformation matrix
+        T: Homogeneous transformation matrix, or N by 4 by 4 array of
+           homogeneous transformation matrices.
+        robust: Whether to use the robust mode, instead of returning NaN for
+                the identity.
 
     Returns:
         Velocity twist vector :math:`\\Twist` with length
-        :math:`\\theta`
+        :math:`\\theta`, or N by 6 array with one twist per row if a stack was
+        given.
 
     See Also:
         :py:func:`vec_to_SE3`
     """
-    R = T[0:3, 0:3]
-    p = T[0:3, 3:4]
-
-    if np.allclose(T, np.eye(4)):
-        # If T is equal to identity (to precision), the screw axis is
-        # undefined and the distance travelled along the screw axis is 0.
-        omega_hat = np.full((3, 1), np.nan)
-        v = np.full((3, 1), np.nan)
-        theta = 0
-    else:
-        if np.allclose(R, np.eye(3)):
-            # If the rotational part of T (the rotation matrix) is equal to
-            # identity (to precision), the screw axis is purely translational,
-            # i.e. the pitch is infinite.
-            omega_hat = np.zeros((3, 1))
-            theta = np.linalg.norm(p)
-            v = p / theta
-        else:
-            omega = SO3_to_vec(R)
-            theta = np.linalg.norm(omega)
-            omega_hat = omega / theta
-            if np.allclose(p, np.zeros((3, 1))):
-                # If the translational part is zero, the screw axis is purely
-                # angular, i.e. the pitch is zero.
-                v = np.zeros((3, 1))
-            else:
-                omega_tilde = vec_to_so3(omega_hat)
-                v = (1/theta * np.eye(3) - 1/2 * omega_tilde
-                     + (1/theta - 1/2 / np.tan(theta/2))
-                     * np.linalg.matrix_power(omega_tilde, 2)).dot(p)
+    T = np.asarray(T)
+    if _jit is not None and T.shape == (4, 4) and T.dtype == _FLOAT64 \
+            and not robust:
+        return _jit.SE3_to_vec(T)
+
+    T = T.astype(_float_dtype(T), copy=False)
+    R = T[..., 0:3, 0:3]
+    p = T[..., 0:3, 3]
+
+    if robust:
+        omega, theta = _SO3_log(R, 'num.SE3_to_vec.R')
+        omega_cross_p = np.cross(omega, p)
+        v = p - 1/2 * omega_cross_p \
+            + _log_coefficient(theta)[..., 0] * np.cross(omega, omega_cross_p)
+        S = np.concatenate((omega, v), axis=-1)
+        return S[:, np.newaxis] if T.ndim == 2 else S
+
+    eye = np.eye(3, dtype=T.dtype)
+
+    # If T is equal to identity (to precision), the screw axis is undefined
+    # and the distance travelled along the screw axis is 0.
+    identity = np.all(np.isclose(T, np.eye(4)), axis=(-2, -1))
+    # If the rotational part of T (the rotation matrix) is equal to identity
+    # (to precision), the screw axis is purely translational, i.e. the pitch
+    # is infinite.
+    translation = np.all(np.isclose(R, np.eye(3)), axis=(-2, -1))
+    if profiling.active is not None:
+        profiling.active.count('num.SE3_to_vec.identity', identity)
+        profiling.active.count('num.SE3_to_vec.translation',
+                               translation & ~identity)
+
+    omega_hat, theta = _SO3_to_axis_angle(R, 'num.SE3_to_vec.R')
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        omega_tilde = vec_to_so3(omega_hat)
+        omega_tilde_sq = omega_hat[..., :, np.newaxis] \
+            * omega_hat[..., np.newaxis, :] - eye
+        theta_ = theta[..., np.newaxis, np.newaxis]
+        G_inv = 1/theta_ * eye - 1/2 * omega_tilde \
+            + (1/theta_ - 1/2 / np.tan(theta_/2)) * omega_tilde_sq
+        v = (G_inv @ p[..., np.newaxis])[..., 0]
+
+        norm_p = np.linalg.norm(p, axis=-1)
+        omega_hat = np.where(translation[..., np.newaxis], 0., omega_hat)
+        v = np.where(translation[..., np.newaxis],
+                     p / norm_p[..., np.newaxis], v)
+        theta = np.where(translation, norm_p, theta)
 
     # Screw axis
-    S = np.vstack((omega_hat, v))
+    S = np.concatenate((omega_hat, v), axis=-1)
+    S = np.where(identity[..., np.newaxis], np.nan, S)
+    S = S * np.where(identity, 0., theta)[..., np.newaxis]
 
-    return S * theta
+    if T.ndim == 2:
+        return S[:, np.newaxis]
 
+    return S
 
-def vec_to_SE3(S: np.array, theta: float) -> np.array:
+
+def vec_to_SE3(S: np.array, theta: float, out: np.array = None) \
+        -> np.array:
     """
     'Integration' of a velocity twist to determine the configuration (expressed
     as transformation matrix) that this velocity twist reaches in unit time.
 
+    Both arguments can also be given as stacks. ``S`` and ``theta`` are
+    broadcast against each other, so a single screw axis can be evaluated at
+    many values of ``theta``, or many screw axes at once. The result is
+    written into a single preallocated array.
+
+    A single twist and distance are evaluated element by element with scalar
+    arithmetic, which avoids all temporary arrays; together with ``out`` this
+    makes the call allocation free.
+
     Args:
-        S: 6 vector velocity twist
-        theta: Distance travelled along the velocity twist screw axis
+        S: 6 vector velocity twist, or N by 6 array with one twist per row.
+        theta: Distance travelled along the velocity twist screw axis, or an
+               array of N distances.
+        out: 4 by 4 (or N by 4 by 4) array to write the result into.
+             Optional, if omitted a new array is allocated.
 
     Returns:
         4 by 4 homogeneous transformation matrix
-        :math:`\\HomogeneousTransformationMatrix \\in \\SEthree`
+        :math:`\\HomogeneousTransformationMatrix \\in \\SEthree`, or N by 4 by
+        4 array of transformation matrices if a stack was given.
+
+    Example:
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> import modern_robotics.num as mr
+            >>> S = np.array([[0], [0], [1], [0], [0], [1]])
+            >>> mr.vec_to_SE3(S, np.linspace(0, np.pi, 3)).round(3)
+            array([[[ 1.   ,  0.   ,  0.   ,  0.   ],
+                    [ 0.   ,  1.   ,  0.   ,  0.   ],
+                    [ 0.   ,  0.   ,  1.   ,  0.   ],
+                    [ 0.   ,  0.   ,  0.   ,  1.   ]],
+            <BLANKLINE>
+                   [[ 0.   , -1.   ,  0.   ,  0.   ],
+                    [ 1.   ,  0.   ,  0.   ,  0.   ],
+                    [ 0.   ,  0.   ,  1.   ,  1.571],
+                    [ 0.   ,  0.   ,  0.   ,  1.   ]],
+            <BLANKLINE>
+                   [[-1.   , -0.   ,  0.   ,  0.   ],
+                    [ 0.   , -1.   ,  0.   ,  0.   ],
+                    [ 0.   ,  0.   ,  1.   ,  3.142],
+                    [ 0.   ,  0.   ,  0.   ,  1.   ]]])
 
     See Also:
         :py:func:`SE3_to_vec`
     """
-    omega = S[:3]
-    v = S[3:]
-    if np.allclose(omega, np.zeros((3, 1))):
-        R = np.eye(3)
-        p = v * theta
-    else:
-        R = vec_to_SO3(omega, theta)
-        omega_tilde = vec_to_so3(omega)
-        p = (np.eye(3) * theta + (1 - np.cos(theta)) * omega_tilde
-             + (theta - np.sin(theta))
-             * np.linalg.matrix_power(omega_tilde, 2)).dot(v)
+    S = _as_vectors(S, 6)
+
+    if S.ndim == 1 and np.ndim(theta) == 0:
+        if _jit is not None and S.dtype == _FLOAT64 \
+                and isinstance(theta, (int, float)):
+            return _jit.vec_to_SE3(S, theta, out)
+        if out is None:
+            out = np.empty((4, 4), dtype=_float_dtype(S, theta))
+        return _vec_to_SE3_single(S, float(theta), out)
+
+    dtype = _float_dtype(S, theta)
+    S = S.astype(dtype, copy=False)
+    theta = np.asarray(theta, dtype=dtype)
 
-    return R_p_to_SE3(R, p)
+    if out is None:
+        shape = np.broadcast(S[..., 0], theta).shape
+        out = np.empty(shape + (4, 4), dtype=dtype)
 
+    omega = S[..., :3]
+    v = S[..., 3:]
 
-def big_adjoint(T: np.array) -> np.array:
+    # For a zero omega both expressions below reduce to R = I and
+    # p = v * theta, so pure translations need no separate branch.
+    out[..., 0:3, 0:3] = vec_to_SO3(omega, theta)
+
+    theta = theta[..., np.newaxis]
+    omega_cross_v = np.cross(omega, v)
+    out[..., 0:3, 3] = theta * v + (1 - np.cos(theta)) * omega_cross_v \
+        + (theta - np.sin(theta)) * np.cross(omega, omega_cross_v)
+    out[..., 3, 0:3] = 0
+    out[..., 3, 3] = 1
+
+    return out
+
+
+def big_adjoint(T: np.array, out: np.array = None) -> np.array:
     """
     Constructs the 'big adjoint' form of the transformation matrix T.
 
@@ -237,19 +469,36 @@ def big_adjoint(T: np.array) -> np.array:
 
     Args:
         T: 4 by 4 homogeneous transformation matrix
-           :math:`\\HomogeneousTransformationMatrix \\in \\SEthree`
+           :math:`\\HomogeneousTransformationMatrix \\in \\SEthree`, or N by
+           4 by 4 array of transformation matrices.
+        out: 6 by 6 (or N by 6 by 6) array to write the result into.
+             Optional, if omitted a new array is allocated.
 
     Returns:
-        6 by 6 'big adjoint' form of the transformation matrix T
+        6 by 6 'big adjoint' form of the transformation matrix T, or N by 6
+        by 6 array if a stack was given.
     """
-    R = T[0:3, 0:3]
-    p_tilde = vec_to_so3(T[0:3, 3:4])
+    T = np.asarray(T)
+    if _jit is not None and T.shape == (4, 4) and T.dtype == _FLOAT64:
+        return _jit.big_adjoint(T, out)
+
+    R = T[..., 0:3, 0:3]
+
+    if out is None:
+        out = np.empty(T.shape[:-2] + (6, 6), dtype=_float_dtype(T))
 
-    return np.vstack((np.hstack((R, np.zeros((3, 3)))),
-                      np.hstack((p_tilde.dot(R), R))))
+    # The lower right block temporarily holds the skew-symmetric form of p,
+    # so that its product with R needs no temporary array.
+    p_tilde = vec_to_so3(T[..., 0:3, 3], out=out[..., 3:6, 3:6])
+    np.matmul(p_tilde, R, out=out[..., 3:6, 0:3])
+    out[..., 0:3, 0:3] = R
+    out[..., 0:3, 3:6] = 0
+    out[..., 3:6, 3:6] = R
 
+    return out
 
-def little_adjoint(V: np.array) -> np.array:
+
+def little_adjoint(V: np.array, out: np.array = None) -> np.array:
     """
     Constructs the 'little adjoint' form of the velocity twist V.
 
@@ -267,19 +516,212 @@ def little_adjoint(V: np.array) -> np.array:
         \\end{bmatrix}
 
     Args:
-        V: 6 by 1 velocity twist
+        V: 6 by 1 velocity twist, or N by 6 array with one twist per row.
+        out: 6 by 6 (or N by 6 by 6) array to write the result into.
+             Optional, if omitted a new array is allocated.
+
+    Returns:
+        6 by 6 'little adjoint' form of the twist V, or N by 6 by 6 array if
+        a stack was given.
+    """
+    V = _as_vectors(V, 6)
+
+    if out is None:
+        out = np.empty(V.shape[:-1] + (6, 6), dtype=_float_dtype(V))
+
+    vec_to_so3(V[..., 0:3], out=out[..., 0:3, 0:3])
+    vec_to_so3(V[..., 3:6], out=out[..., 3:6, 0:3])
+    out[..., 0:3, 3:6] = 0
+    out[..., 3:6, 3:6] = out[..., 0:3, 0:3]
+
+    return out
+
+
+def exp_jacobian_SO3(omega: np.array, side: str = 'left') -> np.array:
+    """
+    Left or right Jacobian of the exponential map of :math:`\\SOthree`, which
+    maps a change of the angular velocity to the corresponding change of
+    orientation, applied from the left (space frame) or from the right (body
+    frame).
+
+    .. math::
+
+        \\exp(\\TildeSkew{\\omega + \\delta}) \\approx
+        \\exp(\\TildeSkew{\\Jacobian_l\\delta})\\exp(\\TildeSkew{\\omega}) =
+        \\exp(\\TildeSkew{\\omega})\\exp(\\TildeSkew{\\Jacobian_r\\delta})
+
+    .. math::
+
+        \\Jacobian_l(\\omega) = I +
+        \\frac{1 - \\cos\\theta}{\\theta^2}\\TildeSkew{\\omega} +
+        \\frac{\\theta - \\sin\\theta}{\\theta^3}\\TildeSkew{\\omega}^2,
+        \\quad \\Jacobian_r(\\omega) = \\Jacobian_l(-\\omega)
+
+    with :math:`\\theta = \\Norm{\\omega}`. Small angles use the Taylor
+    series of the coefficients, so :math:`\\omega = 0` gives the identity.
+
+    Args:
+        omega: 3 vector angular velocity with length :math:`\\theta`, or N by
+               3 array with one angular velocity per row.
+        side: ``'left'`` or ``'right'``.
+
+    Returns:
+        3 by 3 Jacobian, or N by 3 by 3 array of Jacobians if a stack was
+        given.
+
+    Raises:
+        ValueError: If side is unknown.
+
+    See Also:
+        :py:func:`exp_jacobian_inv_SO3`
+        :py:func:`exp_jacobian_SE3`
+    """
+    omega = _exp_coordinates(omega, 3, side)
+    theta = np.linalg.norm(omega, axis=-1)
+    a, b = _exp_coefficients(theta)
+
+    return np.eye(3, dtype=omega.dtype) + a * vec_to_so3(omega) \
+        + b * _so3_squared(omega, theta)
+
+
+def exp_jacobian_inv_SO3(omega: np.array, side: str = 'left') -> np.array:
+    """
+    Inverse of the left or right Jacobian of the exponential map of
+    :math:`\\SOthree`, see :py:func:`exp_jacobian_SO3`. It maps a change of
+    orientation to the corresponding change of the matrix log.
+
+    .. math::
+
+        \\Jacobian_l^{-1}(\\omega) = I - \\frac{1}{2}\\TildeSkew{\\omega} +
+        \\left(\\frac{1}{\\theta^2} -
+        \\frac{1}{2\\theta\\tan(\\theta/2)}\\right)\\TildeSkew{\\omega}^2,
+        \\quad \\Jacobian_r^{-1}(\\omega) = \\Jacobian_l^{-1}(-\\omega)
+
+    The inverse is singular at :math:`\\theta = 2\\pi`.
+
+    Args:
+        omega: 3 vector angular velocity with length :math:`\\theta`, or N by
+               3 array with one angular velocity per row.
+        side: ``'left'`` or ``'right'``.
+
+    Returns:
+        3 by 3 inverse Jacobian, or N by 3 by 3 array of inverse Jacobians if
+        a stack was given.
+
+    Raises:
+        ValueError: If side is unknown.
+
+    See Also:
+        :py:func:`exp_jacobian_SO3`
+        :py:func:`exp_jacobian_inv_SE3`
+    """
+    omega = _exp_coordinates(omega, 3, side)
+    theta = np.linalg.norm(omega, axis=-1)
+    e = _log_coefficient(theta)
+
+    return np.eye(3, dtype=omega.dtype) - 1/2 * vec_to_so3(omega) \
+        + e * _so3_squared(omega, theta)
+
+
+def exp_jacobian_SE3(V: np.array, side: str = 'left') -> np.array:
+    """
+    Left or right Jacobian of the exponential map of :math:`\\SEthree`, which
+    maps a change of the twist to the corresponding change of configuration,
+    applied from the left (space frame) or from the right (body frame).
+
+    .. math::
+
+        \\exp(\\TildeSkew{\\Twist + \\delta}) \\approx
+        \\exp(\\TildeSkew{\\Jacobian_l\\delta})\\exp(\\TildeSkew{\\Twist}) =
+        \\exp(\\TildeSkew{\\Twist})\\exp(\\TildeSkew{\\Jacobian_r\\delta})
+
+    .. math::
+
+        \\Jacobian_l(\\Twist) =
+        \\begin{bmatrix}
+        \\Jacobian_l(\\omega) & 0 \\\\
+        Q(\\omega, v) & \\Jacobian_l(\\omega)
+        \\end{bmatrix},
+        \\quad \\Jacobian_r(\\Twist) = \\Jacobian_l(-\\Twist)
+
+    where :math:`\\Jacobian_l(\\omega)` is the left Jacobian of
+    :math:`\\SOthree` (see :py:func:`exp_jacobian_SO3`) and :math:`Q` is
+    the closed form of :math:`\\sum_{n, m}
+    \\frac{\\TildeSkew{\\omega}^n\\TildeSkew{v}
+    \\TildeSkew{\\omega}^m}{(n + m + 2)!}`.
+
+    Args:
+        V: 6 vector velocity twist with length :math:`\\theta`, i.e. screw
+           axis times distance, or N by 6 array with one twist per row.
+        side: ``'left'`` or ``'right'``.
+
+    Returns:
+        6 by 6 Jacobian, or N by 6 by 6 array of Jacobians if a stack was
+        given.
+
+    Raises:
+        ValueError: If side is unknown.
+
+    See Also:
+        :py:func:`exp_jacobian_inv_SE3`
+        :py:func:`little_adjoint`
+    """
+    V = _exp_coordinates(V, 6, side)
+    J = exp_jacobian_SO3(V[..., 0:3])
+
+    out = np.zeros(V.shape[:-1] + (6, 6), dtype=V.dtype)
+    out[..., 0:3, 0:3] = J
+    out[..., 3:6, 3:6] = J
+    out[..., 3:6, 0:3] = _exp_jacobian_Q(V[..., 0:3], V[..., 3:6])
+
+    return out
+
+
+def exp_jacobian_inv_SE3(V: np.array, side: str = 'left') -> np.array:
+    """
+    Inverse of the left or right Jacobian of the exponential map of
+    :math:`\\SEthree`, see :py:func:`exp_jacobian_SE3`. It maps a change of
+    configuration to the corresponding change of the matrix log.
+
+    .. math::
+
+        \\Jacobian_l^{-1}(\\Twist) =
+        \\begin{bmatrix}
+        \\Jacobian_l^{-1}(\\omega) & 0 \\\\
+        -\\Jacobian_l^{-1}(\\omega)Q(\\omega, v)\\Jacobian_l^{-1}(\\omega) &
+        \\Jacobian_l^{-1}(\\omega)
+        \\end{bmatrix},
+        \\quad \\Jacobian_r^{-1}(\\Twist) = \\Jacobian_l^{-1}(-\\Twist)
+
+    Args:
+        V: 6 vector velocity twist with length :math:`\\theta`, i.e. screw
+           axis times distance, or N by 6 array with one twist per row.
+        side: ``'left'`` or ``'right'``.
 
     Returns:
-        6 by 6 'little adjoint' form of the twist V
+        6 by 6 inverse Jacobian, or N by 6 by 6 array of inverse Jacobians if
+        a stack was given.
+
+    Raises:
+        ValueError: If side is unknown.
+
+    See Also:
+        :py:func:`exp_jacobian_SE3`
+        :py:func:`exp_jacobian_inv_SO3`
     """
-    w = V[:3]
-    v = V[3:]
+    V = _exp_coordinates(V, 6, side)
+    J_inv = exp_jacobian_inv_SO3(V[..., 0:3])
+
+    out = np.zeros(V.shape[:-1] + (6, 6), dtype=V.dtype)
+    out[..., 0:3, 0:3] = J_inv
+    out[..., 3:6, 3:6] = J_inv
+    out[..., 3:6, 0:3] = -J_inv @ _exp_jacobian_Q(V[..., 0:3], V[..., 3:6]) \
+        @ J_inv
 
-    return np.vstack((np.hstack((vec_to_so3(w), np.zeros((3, 3)))),
-                      np.hstack((vec_to_so3(v), vec_to_so3(w)))))
+    return out
 
 
-def inv_SE3(T: np.array) -> np.array:
+def inv_SE3(T: np.array, out: np.array = None) -> np.array:
     """
     Inverts the transformation matrix T.
 
@@ -299,33 +741,70 @@ def inv_SE3(T: np.array) -> np.array:
 
     Args:
         T: 4 by 4 homogeneous transformation matrix
-           :math:`\\HomogeneousTransformationMatrix \\in \\SEthree`
+           :math:`\\HomogeneousTransformationMatrix \\in \\SEthree`, or N by
+           4 by 4 array of transformation matrices.
+        out: 4 by 4 (or N by 4 by 4) array to write the result into.
+             Optional, if omitted a new array is allocated. Can be T itself
+             to invert in place.
 
     Returns:
         4 by 4 inverse of the homogeneous transformation matrix
-        :math:`\\HomogeneousTransformationMatrix^{-1} \\in \\SEthree`
+        :math:`\\HomogeneousTransformationMatrix^{-1} \\in \\SEthree`, or N
+        by 4 by 4 array of inverses if a stack was given.
     """
-    R = T[0:3, 0:3]
-    p = T[0:3, 3:4]
+    T = np.asarray(T)
+    if _jit is not None and T.shape == (4, 4) and T.dtype == _FLOAT64:
+        return _jit.inv_SE3(T, out)
+
+    if out is None:
+        out = np.empty(T.shape, dtype=T.dtype)
 
-    return R_p_to_SE3(R.T, np.dot(-R.T, p))
+    # Once R is transposed, -R p is the new displacement, which also holds
+    # when inverting in place.
+    R_T = out[..., 0:3, 0:3]
+    R_T[...] = np.swapaxes(T[..., 0:3, 0:3], -1, -2)
+    np.matmul(R_T, T[..., 0:3, 3:4], out=out[..., 0:3, 3:4])
+    out[..., 0:3, 3:4] *= -1
+    out[..., 3, 0:3] = 0
+    out[..., 3, 3] = 1
 
+    return out
 
-def R_p_to_SE3(R: np.array, p: np.array) -> np.array:
+
+def R_p_to_SE3(R: np.array, p: np.array, out: np.array = None) \
+        -> np.array:
     """
     Constructs a homogeneous transformation matrix from a rotation matrix and
     displacement vector.
 
     Args:
-        R: 3 by 3 rotation matrix :math:`\\RotationMatrix\\in\\SOthree`
-        p: 3 by 1 displacement vector
+        R: 3 by 3 rotation matrix :math:`\\RotationMatrix\\in\\SOthree`, or
+           N by 3 by 3 array of rotation matrices.
+        p: 3 by 1 displacement vector, or N by 3 array with one displacement
+           per row.
+        out: 4 by 4 (or N by 4 by 4) array to write the result into.
+             Optional, if omitted a new array is allocated.
 
     Returns:
         4 by 4 homogeneous transformation matrix
-        :math:`\\HomogeneousTransformationMatrix \\in \\SEthree`
+        :math:`\\HomogeneousTransformationMatrix \\in \\SEthree`, or N by 4 by
+        4 array of transformation matrices if stacks were given.
     """
-    return np.vstack((np.hstack((R, p)),
-                      np.array([0, 0, 0, 1])))
+    R = np.asarray(R)
+    p = np.asarray(p)
+    if p.shape[-2:] == (3, 1):
+        p = p[..., 0]
+
+    if out is None:
+        out = np.empty(np.broadcast(R[..., 0, 0], p[..., 0]).shape + (4, 4),
+                       dtype=np.result_type(R, p))
+
+    out[..., 0:3, 0:3] = R
+    out[..., 0:3, 3] = p
+    out[..., 3, 0:3] = 0
+    out[..., 3, 3] = 1
+
+    return out
 
 
 def manipulability(J: np.array) -> np.array:
@@ -334,22 +813,371 @@ def manipulability(J: np.array) -> np.array:
     manipulability ellipsoid, and the ratio between largest and smallest
     eigenvalue of :math:`\\Jacobian\\Jacobian\\Transposed`.
 
+    A stack of Jacobians is handled in a single pass. Singular Jacobians in a
+    stack do not raise, their axes and condition number are NaN instead.
+
     Args:
-        J: Jacobian matrix
+        J: Jacobian matrix, or N by 6 by n array of Jacobian matrices.
 
     Returns:
         Tuple with 2D array containing the principal axes of the manipulability
-        ellipsoid, and the condition number.
+        ellipsoid, and the condition number. For a stack, N by 6 by 6 array of
+        principal axes and N condition numbers.
+
+    Raises:
+        numpy.linalg.LinAlgError: If a single Jacobian is singular.
+
+    See Also:
+        :py:func:`modern_robotics.num.kinematics.manipulability_map_space`
     """
-    A = J @ J.T
+    J = np.asarray(J)
+    A = J @ np.swapaxes(J, -1, -2)
+
+    # Eigenvalues are in ascending order, their product is the determinant.
+    w, v = np.linalg.eigh(A)
+    singular = np.isclose(np.prod(w, axis=-1), 0)
+    if profiling.active is not None:
+        profiling.active.count('num.manipulability.singular', singular)
 
-    if np.allclose(np.linalg.det(A), 0):
+    if J.ndim == 2 and singular:
         raise np.linalg.LinAlgError('Singular matrix')
 
-    w, v = np.linalg.eigh(A)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cond = np.where(singular, np.nan, w[..., -1] / w[..., 0])
+        H = np.sqrt(w)[..., np.newaxis, :] * v
+    H[singular] = np.nan
+
+    return H, cond[()]
+
+
+def set_backend(name: str) -> str:
+    """
+    Selects the implementation used for single inputs of
+    :py:func:`vec_to_SO3`, :py:func:`vec_to_SE3`, :py:func:`SE3_to_vec`,
+    :py:func:`big_adjoint` and :py:func:`inv_SE3`.
+
+    ``'numpy'`` (the default) uses the vectorized implementations for all
+    inputs. ``'numba'`` uses the compiled kernels of
+    :py:mod:`modern_robotics.num.jit` for single float64 inputs, stacks and
+    other dtypes still use the numpy implementations. If numba is not
+    installed, a warning is issued and the numpy backend stays selected.
+
+    The backend can also be selected before the import, with the
+    ``MODERN_ROBOTICS_BACKEND`` environment variable.
+
+    Args:
+        name: Name of the backend, one of :py:data:`BACKENDS`.
+
+    Returns:
+        Name of the backend that is in use.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    global _jit
+
+    if name not in BACKENDS:
+        raise ValueError(f'Unknown backend {name!r}')
+
+    _jit = None
+    if name == 'numba':
+        jit = importlib.import_module('.jit', __name__)
+        if jit.COMPILED:
+            _jit = jit
+        else:
+            warnings.warn('numba is not installed, using the numpy backend',
+                          RuntimeWarning, stacklevel=2)
+
+    return get_backend()
+
+
+def get_backend() -> str:
+    """
+    Name of the backend that is in use, see :py:func:`set_backend`.
+    """
+    return 'numpy' if _jit is None else 'numba'
+
+
+def _as_vectors(a: np.array, n: int) -> np.array:
+    """
+    Interprets a as either a single n vector or a stack of n vectors along the
+    last axis. A single column vector is flattened, so that single vectors
+    and stacks can be broadcast against each other.
+    """
+    a = np.asarray(a)
+    if a.ndim == 2 and a.shape == (n, 1):
+        return a[:, 0]
+
+    return a
 
-    cond = np.max(w) / np.min(w)
 
-    H = np.hstack(tuple(np.sqrt(w[i]) * v[:, i:i+1] for i in range(len(w))))
+_FLOAT64 = np.dtype(float)
 
-    return H, cond
+
+def _float_dtype(*values) -> np.dtype:
+    """
+    Floating point dtype of results computed from values. Arrays keep their
+    precision, so float32 stays float32, while integer arrays give float64.
+    Plain Python numbers do not upcast arrays, and give float64 on their
+    own.
+    """
+    dtypes = [v.dtype if isinstance(v, np.ndarray) else np.asarray(v).dtype
+              for v in values
+              if v is not None and not isinstance(v, (int, float))]
+    if not dtypes:
+        return _FLOAT64
+    if all(dtype == _FLOAT64 for dtype in dtypes):
+        return _FLOAT64
+
+    return np.result_type(*dtypes, np.float32)
+
+
+def _adjoint_apply(R: np.array, p: np.array, V: np.array) -> np.array:
+    """
+    Computes :math:`\\Adjoint{T} V` for stacks of transformation matrices,
+    given by their rotations R and displacements p, and twists (stacked along
+    the last axis), without building the 6 by 6 big adjoint matrices.
+    """
+    omega = (R @ V[..., 0:3, np.newaxis])[..., 0]
+    v = np.cross(p, omega) + (R @ V[..., 3:6, np.newaxis])[..., 0]
+
+    return np.concatenate((omega, v), axis=-1)
+
+
+# Below this angle, coefficients that cancel catastrophically are evaluated
+# with their Taylor series, which are exact to rounding there.
+_SERIES_ANGLE = 0.1
+
+
+def _coefficient(angle: np.array, function: callable, series: tuple,
+                 limit: float = _SERIES_ANGLE) -> np.array:
+    """
+    Evaluates function of the angle, or its Taylor series in the squared
+    angle for small angles (below limit) where function cancels
+    catastrophically.
+    """
+    small = angle < limit
+    with np.errstate(divide='ignore', invalid='ignore'):
+        direct = function(angle)
+
+    series = np.polyval(np.asarray(series[::-1], dtype=angle.dtype),
+                        angle**2)
+
+    return np.where(small, series, direct)
+
+
+def _exp_coordinates(x: np.array, n: int, side: str) -> np.array:
+    """
+    Exponential coordinates as floating point n vectors, negated for the
+    right Jacobians, which are the left Jacobians of the inverse.
+    """
+    x = _as_vectors(x, n)
+    x = x.astype(_float_dtype(x), copy=False)
+
+    if side == 'right':
+        return -x
+    if side != 'left':
+        raise ValueError(f'Unknown side {side!r}')
+
+    return x
+
+
+def _exp_coefficients(theta: np.array) -> tuple:
+    """
+    Coefficients (1 - cos(theta)) / theta^2 and (theta - sin(theta)) /
+    theta^3 of the left Jacobian of SO(3), as (..., 1, 1) arrays.
+    """
+    a = np.sinc(theta / (2 * np.pi))**2 / 2
+    b = _coefficient(theta, lambda x: (x - np.sin(x)) / x**3,
+                     (1/6, -1/120, 1/5040, -1/362880))
+
+    return a[..., np.newaxis, np.newaxis], b[..., np.newaxis, np.newaxis]
+
+
+def _log_coefficient(theta: np.array) -> np.array:
+    """
+    Coefficient 1 / theta^2 - 1 / (2 theta tan(theta / 2)) of the inverse
+    left Jacobian of SO(3), as (..., 1, 1) array.
+    """
+    e = _coefficient(theta, lambda x: 1 / x**2 - 1 / (2 * x * np.tan(x / 2)),
+                     (1/12, 1/720, 1/30240, 1/1209600))
+
+    return e[..., np.newaxis, np.newaxis]
+
+
+def _so3_squared(omega: np.array, theta: np.array) -> np.array:
+    """
+    Square of the skew-symmetric form of omega, omega omega^T - theta^2 I.
+    """
+    return omega[..., :, np.newaxis] * omega[..., np.newaxis, :] \
+        - (theta**2)[..., np.newaxis, np.newaxis] \
+        * np.eye(3, dtype=omega.dtype)
+
+
+def _exp_jacobian_Q(omega: np.array, v: np.array) -> np.array:
+    """
+    Lower left block Q(omega, v) of the left Jacobian of SE(3).
+    """
+    theta = np.linalg.norm(omega, axis=-1)
+    _, b = _exp_coefficients(theta)
+    # These cancel to order theta^4 and theta^5, so their series are used up
+    # to larger angles.
+    c = _coefficient(theta, lambda x: (x**2 + 2 * np.cos(x) - 2) / (2 * x**4),
+                     (1/24, -1/720, 1/40320, -1/3628800, 1/479001600,
+                      -1/87178291200), 0.5)
+    d = _coefficient(theta,
+                     lambda x: (2 * x - 3 * np.sin(x) + x * np.cos(x))
+                     / (2 * x**5),
+                     (1/120, -1/2520, 1/120960, -1/9979200, 1/1245404160,
+                      -1/217945728000), 0.5)
+    c = c[..., np.newaxis, np.newaxis]
+    d = d[..., np.newaxis, np.newaxis]
+
+    W = vec_to_so3(omega)
+    U = vec_to_so3(v)
+    WU = W @ U
+    UW = U @ W
+    WUW = WU @ W
+    WWU = W @ WU
+    UWW = UW @ W
+
+    return 1/2 * U + b * (WU + UW + WUW) + c * (WWU + UWW - 3 * WUW) \
+        + d * (WUW @ W + W @ WUW)
+
+
+def _SO3_log(R: np.array, branch: str) -> tuple:
+    """
+    Matrix log of a (stack of) rotation matrices as angular velocities with
+    length theta (stacked along the last axis), and the angles theta. Unlike
+    :py:func:`_SO3_to_axis_angle` this has no special cases, the result is
+    finite and continuous for all rotations. The small and large angle
+    regimes are counted under the branch prefix while profiling.
+    """
+    R = R.astype(_float_dtype(R), copy=False)
+
+    # The skew-symmetric part of R is sin(theta) omega_hat, the symmetric
+    # part cos(theta) I + (1 - cos(theta)) omega_hat omega_hat^T.
+    sin_omega = np.stack((R[..., 2, 1] - R[..., 1, 2],
+                          R[..., 0, 2] - R[..., 2, 0],
+                          R[..., 1, 0] - R[..., 0, 1]), axis=-1) / 2
+    cos = (np.trace(R, axis1=-2, axis2=-1) - 1) / 2
+    theta = np.arctan2(np.linalg.norm(sin_omega, axis=-1), cos)
+
+    omega = sin_omega * _coefficient(
+        theta, lambda x: x / np.sin(x),
+        (1, 1/6, 7/360, 31/15120, 127/604800))[..., np.newaxis]
+
+    # Near pi sin(theta) vanishes, so the axis is taken from the column of
+    # the symmetric part with the largest diagonal, with the sign of the
+    # skew-symmetric part.
+    large = cos < 0
+    B = (R + np.swapaxes(R, -1, -2)) / 2 \
+        - cos[..., np.newaxis, np.newaxis] * np.eye(3, dtype=R.dtype)
+    k = np.argmax(np.diagonal(B, axis1=-2, axis2=-1), axis=-1)
+    column = np.take_along_axis(B, k[..., np.newaxis, np.newaxis],
+                                axis=-1)[..., 0]
+    column = np.where((np.sum(column * sin_omega, axis=-1) < 0)
+                      [..., np.newaxis], -column, column)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        omega_pi = column * (theta / np.linalg.norm(column, axis=-1)
+                             )[..., np.newaxis]
+    omega = np.where(large[..., np.newaxis], omega_pi, omega)
+
+    if profiling.active is not None:
+        profiling.active.count(f'{branch}.small_angle',
+                               theta < _SERIES_ANGLE)
+        profiling.active.count(f'{branch}.large_angle', large)
+
+    return omega, theta
+
+
+def _SO3_to_axis_angle(R: np.array, branch: str) -> tuple:
+    """
+    Matrix log of a (stack of) rotation matrices, split into the unit axes
+    (stacked along the last axis) and the angles. The axis of an identity
+    rotation is undefined and returned as NaN. The special cases are counted
+    under the branch prefix while profiling.
+    """
+    R = R.astype(_float_dtype(R), copy=False)
+    trace = np.trace(R, axis1=-2, axis2=-1)
+    diagonal = np.diagonal(R, axis1=-2, axis2=-1)
+
+    # If R is equal to identity (to precision), angular velocity magnitude is
+    # 0 and direction is undefined.
+    identity = np.all(np.isclose(R, np.eye(3)), axis=(-2, -1))
+    # If trace of R is -1, angular velocity magnitude is pi.
+    half_turn = np.isclose(trace, -1) & ~identity
+    if profiling.active is not None:
+        profiling.active.count(f'{branch}.identity', identity)
+        profiling.active.count(f'{branch}.half_turn', half_turn)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # The skew-symmetric part of R is 2 sin(theta) omega_hat, its length
+        # and the trace give theta with atan2. Unlike arccos of the trace
+        # alone this stays accurate for small angles, also in float32.
+        omega_sin = np.stack((R[..., 2, 1] - R[..., 1, 2],
+                              R[..., 0, 2] - R[..., 2, 0],
+                              R[..., 1, 0] - R[..., 0, 1]), axis=-1)
+        sin = np.linalg.norm(omega_sin, axis=-1)
+        theta = np.arctan2(sin, trace - 1)
+        omega_hat = omega_sin / sin[..., np.newaxis]
+
+        # For a half turn the direction is obtained from the z, y or x column
+        # of R, whichever is the first with a diagonal element unequal to -1.
+        k = np.where(~np.isclose(diagonal[..., 2], -1), 2,
+                     np.where(~np.isclose(diagonal[..., 1], -1), 1, 0))
+        column = np.take_along_axis(
+            R, k[..., np.newaxis, np.newaxis], axis=-1)[..., 0]
+        r_kk = np.take_along_axis(diagonal, k[..., np.newaxis], axis=-1)
+        omega_hat_pi = (column + np.eye(3, dtype=R.dtype)[k]) \
+            / np.sqrt(2 * (1 + r_kk))
+
+    omega_hat = np.where(half_turn[..., np.newaxis], omega_hat_pi, omega_hat)
+    theta = np.where(half_turn, np.pi, theta)
+
+    omega_hat = np.where(identity[..., np.newaxis], np.nan, omega_hat)
+    theta = np.where(identity, 0., theta)
+
+    return omega_hat, theta
+
+
+def _vec_to_SE3_single(S: np.array, theta: float, out: np.array) -> np.array:
+    """
+    :py:func:`vec_to_SE3` for a single twist and distance, written out with
+    Python floats so that no temporary arrays are created.
+    """
+    wx, wy, wz, vx, vy, vz = S.tolist()
+    s = math.sin(theta)
+    c = 1 - math.cos(theta)
+    t = theta - s
+    ww = wx * wx + wy * wy + wz * wz
+
+    # Rodrigues' formula, I + sin(theta) w~ + (1 - cos(theta)) w~^2
+    out[0, 0] = 1 + c * (wx * wx - ww)
+    out[0, 1] = -s * wz + c * wx * wy
+    out[0, 2] = s * wy + c * wx * wz
+    out[1, 0] = s * wz + c * wx * wy
+    out[1, 1] = 1 + c * (wy * wy - ww)
+    out[1, 2] = -s * wx + c * wy * wz
+    out[2, 0] = -s * wy + c * wx * wz
+    out[2, 1] = s * wx + c * wy * wz
+    out[2, 2] = 1 + c * (wz * wz - ww)
+
+    # p = theta v + (1 - cos(theta)) w x v + (theta - sin(theta)) w x (w x v)
+    ux = wy * vz - wz * vy
+    uy = wz * vx - wx * vz
+    uz = wx * vy - wy * vx
+    out[0, 3] = theta * vx + c * ux + t * (wy * uz - wz * uy)
+    out[1, 3] = theta * vy + c * uy + t * (wz * ux - wx * uz)
+    out[2, 3] = theta * vz + c * uz + t * (wx * uy - wy * ux)
+
+    out[3, 0] = 0
+    out[3, 1] = 0
+    out[3, 2] = 0
+    out[3, 3] = 1
+
+    return out
+
+
+if os.environ.get('MODERN_ROBOTICS_BACKEND'):
+    set_backend(os.environ['MODERN_ROBOTICS_BACKEND'])
@@ -0,0 +1,618 @@
+"""
+.. rubric:: ``modern_robotics.num.dynamics``
+
+This submodule contains the dynamics of open chains, computed with the
+recursive Newton-Euler algorithm on twists and wrenches.
+
+A robot is described by the home poses of its link frames, ``M_list``, as
+an n by 4 by 4 array like for
+:py:func:`modern_robotics.num.kinematics.link_poses`, the spatial inertia
+matrices of the links, ``G_list``, as an n by 6 by 6 array, and the space
+frame screw axes of its joints, ``S_list``, as a 6 by n array. The frame of
+link :math:`i` should be at its center of mass, with its spatial inertia
+matrix :math:`\\mathcal{G}_i` expressed in that frame.
+
+Joint positions, velocities and accelerations can be given as n vectors or
+as arrays with one configuration per row along any number of leading axes,
+e.g. K by N by n for K candidate trajectories of N samples. All of them are
+evaluated at once; the recursion only loops over the joints. ``G_list`` can
+have leading axes as well, e.g. K by n by 6 by 6 to evaluate K variants of
+the robot with different payloads, which are broadcast against the
+configurations.
+
+Besides inverse dynamics, the mass matrix and the terms of the equations of
+motion
+
+.. math::
+
+    \\tau = M(\\theta) \\ddot\\theta + c(\\theta, \\dot\\theta) + g(\\theta)
+    + J^\\Transposed(\\theta) \\mathcal{F}_{tip}
+
+are available separately, and :py:func:`forward_dynamics` solves them for the
+joint accelerations. :py:func:`simulate` integrates the forward dynamics with
+fixed time steps, for many instances in lockstep.
+
+"""
+
+import typing
+import numpy as np
+import modern_robotics.num as mr
+
+
+def inverse_dynamics(M_list: np.array, G_list: np.array, S_list: np.array,
+                     theta: np.array, theta_dot: np.array,
+                     theta_ddot: np.array, g: np.array = (0, 0, -9.81),
+                     F_tip: np.array = None) -> np.array:
+    """
+    Computes the joint forces and torques that realize the given joint
+    accelerations, with the recursive Newton-Euler algorithm.
+
+    The forward pass propagates the twists and their derivatives from the
+    base to the tip, where :math:`\\mathcal{A}_i` is the screw axis of joint
+    :math:`i` in the frame of link :math:`i` and :math:`T_{i,i-1}` the pose
+    of link :math:`i - 1` relative to link :math:`i`:
+
+    .. math::
+
+        \\mathcal{V}_i = \\Adjoint{T_{i,i-1}} \\mathcal{V}_{i-1} +
+        \\mathcal{A}_i \\dot\\theta_i
+
+        \\dot{\\mathcal{V}}_i = \\Adjoint{T_{i,i-1}} \\dot{\\mathcal{V}}_{i-1}
+        + \\LittleAdjoint{\\mathcal{V}_i} \\mathcal{A}_i \\dot\\theta_i
+        + \\mathcal{A}_i \\ddot\\theta_i
+
+    The backward pass propagates the wrenches from the tip to the base:
+
+    .. math::
+
+        \\mathcal{F}_i = \\Adjoint{T_{i+1,i}}^\\Transposed \\mathcal{F}_{i+1}
+        + \\mathcal{G}_i \\dot{\\mathcal{V}}_i
+        - \\LittleAdjoint{\\mathcal{V}_i}^\\Transposed
+        \\mathcal{G}_i \\mathcal{V}_i
+
+        \\tau_i = \\mathcal{F}_i^\\Transposed \\mathcal{A}_i
+
+    Args:
+        M_list: n by 4 by 4 array with the home poses of the link frames,
+                expressed in the space frame.
+        G_list: n by 6 by 6 array with the spatial inertia matrices of the
+                links, expressed in their link frames.
+        S_list: 6 by n array with the space frame screw axes of the joints as
+                columns.
+        theta: n vector of joint positions, or array with one joint
+               configuration per row, e.g. K by n.
+        theta_dot: Joint velocities, broadcast against theta.
+        theta_ddot: Joint accelerations, broadcast against theta.
+        g: Gravity 3 vector in the space frame. Optional, defaults to
+           :math:`9.81` in the negative :math:`z`-direction.
+        F_tip: Wrench 6 vector that the last link applies to the
+               environment, expressed in the frame of the last link, or
+               array of them broadcast against the configurations. Optional,
+               defaults to zero.
+
+    Returns:
+        n vector of joint forces and torques, or array with one per row if
+        several configurations were given.
+
+    Example:
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> import modern_robotics.num as mr
+            >>> M_list = mr.gen.Tt(x=np.array([0.5, 1.5]))
+            >>> G_list = np.array([np.diag([0, 0.1, 0.1, 1, 1, 1])] * 2)
+            >>> S_list = np.array([[0, 0, 1, 0, 0, 0],
+            ...                    [0, 0, 1, 0, -1, 0]]).T
+            >>> mr.dynamics.inverse_dynamics(M_list, G_list, S_list,
+            ...                              [0, 0], [0, 0], [1, 0],
+            ...                              g=[0, 0, 0]).round(3)
+            array([2.7 , 0.85])
+
+        Torque feasibility of K candidate trajectories of N samples each,
+        with theta, theta_dot and theta_ddot as K by N by n arrays:
+
+        .. code-block:: python
+
+            tau = mr.dynamics.inverse_dynamics(M_list, G_list, S_list,
+                                               theta, theta_dot, theta_ddot)
+            feasible = np.all(np.abs(tau) <= tau_max, axis=(-2, -1))
+    """
+    A, R, p, G, theta_dot, theta_ddot = _model(
+        M_list, G_list, S_list, theta, theta_dot, theta_ddot, F_tip=F_tip)
+
+    return _newton_euler(A, R, p, G, theta_dot, theta_ddot, g, F_tip)
+
+
+def mass_matrix(M_list: np.array, G_list: np.array, S_list: np.array,
+                theta: np.array) -> np.array:
+    """
+    Computes the mass matrix :math:`M(\\theta)` with the composite rigid body
+    algorithm. The composite inertias of the subchains from link :math:`i` to
+    the tip are accumulated from the tip to the base,
+
+    .. math::
+
+        \\mathcal{G}^c_i = \\mathcal{G}_i + \\Adjoint{T_{i+1,i}}^\\Transposed
+        \\mathcal{G}^c_{i+1} \\Adjoint{T_{i+1,i}}
+
+    and :math:`M_{ji}` is the force on joint :math:`j` of the wrench
+    :math:`\\mathcal{G}^c_i \\mathcal{A}_i`, for :math:`j \\le i`.
+
+    Args:
+        M_list: n by 4 by 4 array with the home poses of the link frames,
+                expressed in the space frame.
+        G_list: n by 6 by 6 array with the spatial inertia matrices of the
+                links, expressed in their link frames.
+        S_list: 6 by n array with the space frame screw axes of the joints as
+                columns.
+        theta: n vector of joint positions, or array with one joint
+               configuration per row, e.g. K by n.
+
+    Returns:
+        n by n mass matrix, or array of them if several configurations were
+        given.
+    """
+    A, R, p, G = _model(M_list, G_list, S_list, theta)
+
+    return _composite_rigid_body(A, R, p, G)
+
+
+def velocity_quadratic_forces(M_list: np.array, G_list: np.array,
+                              S_list: np.array, theta: np.array,
+                              theta_dot: np.array) -> np.array:
+    """
+    Computes the Coriolis and centripetal terms
+    :math:`c(\\theta, \\dot\\theta)` of the equations of motion.
+
+    Args:
+        M_list: n by 4 by 4 array with the home poses of the link frames,
+                expressed in the space frame.
+        G_list: n by 6 by 6 array with the spatial inertia matrices of the
+                links, expressed in their link frames.
+        S_list: 6 by n array with the space frame screw axes of the joints as
+                columns.
+        theta: n vector of joint positions, or array with one joint
+               configuration per row, e.g. K by n.
+        theta_dot: Joint velocities, broadcast against theta.
+
+    Returns:
+        n vector of joint forces and torques, or array with one per row if
+        several configurations were given.
+    """
+    A, R, p, G, theta_dot = _model(M_list, G_list, S_list, theta, theta_dot)
+
+    return _newton_euler(A, R, p, G, theta_dot, 0, (0, 0, 0), None)
+
+
+def gravity_forces(M_list: np.array, G_list: np.array, S_list: np.array,
+                   theta: np.array, g: np.array = (0, 0, -9.81)) \
+        -> np.array:
+    """
+    Computes the joint forces and torques :math:`g(\\theta)` needed to
+    compensate gravity.
+
+    Args:
+        M_list: n by 4 by 4 array with the home poses of the link frames,
+                expressed in the space frame.
+        G_list: n by 6 by 6 array with the spatial inertia matrices of the
+                links, expressed in their link frames.
+        S_list: 6 by n array with the space frame screw axes of the joints as
+                columns.
+        theta: n vector of joint positions, or array with one joint
+               configuration per row, e.g. K by n.
+        g: Gravity 3 vector in the space frame. Optional, defaults to
+           :math:`9.81` in the negative :math:`z`-direction.
+
+    Returns:
+        n vector of joint forces and torques, or array with one per row if
+        several configurations were given.
+    """
+    A, R, p, G = _model(M_list, G_list, S_list, theta)
+
+    return _newton_euler(A, R, p, G, 0, 0, g, None)
+
+
+def end_effector_forces(M_list: np.array, G_list: np.array,
+                        S_list: np.array, theta: np.array,
+                        F_tip: np.array) -> np.array:
+    """
+    Computes the joint forces and torques :math:`J^\\Transposed(\\theta)
+    \\mathcal{F}_{tip}` needed to apply a wrench with the last link.
+
+    Args:
+        M_list: n by 4 by 4 array with the home poses of the link frames,
+                expressed in the space frame.
+        G_list: n by 6 by 6 array with the spatial inertia matrices of the
+                links, expressed in their link frames.
+        S_list: 6 by n array with the space frame screw axes of the joints as
+                columns.
+        theta: n vector of joint positions, or array with one joint
+               configuration per row, e.g. K by n.
+        F_tip: Wrench 6 vector that the last link applies to the
+               environment, expressed in the frame of the last link, or
+               array of them broadcast against the configurations.
+
+    Returns:
+        n vector of joint forces and torques, or array with one per row if
+        several configurations were given.
+    """
+    A, R, p, G = _model(M_list, G_list, S_list, theta, F_tip=F_tip)
+
+    return _newton_euler(A, R, p, G, 0, 0, (0, 0, 0), F_tip)
+
+
+def forward_dynamics(M_list: np.array, G_list: np.array, S_list: np.array,
+                     theta: np.array, theta_dot: np.array, tau: np.array,
+                     g: np.array = (0, 0, -9.81), F_tip: np.array = None) \
+        -> np.array:
+    """
+    Computes the joint accelerations that result from the given joint forces
+    and torques.
+
+    .. math::
+
+        \\ddot\\theta = M(\\theta)^{-1} (\\tau - h(\\theta, \\dot\\theta))
+
+    The mass matrix :math:`M(\\theta)` is computed as in
+    :py:func:`mass_matrix` and the remaining terms :math:`h(\\theta,
+    \\dot\\theta)` with a single Newton-Euler pass at zero acceleration. Both
+    share the link poses.
+
+    Args:
+        M_list: n by 4 by 4 array with the home poses of the link frames,
+                expressed in the space frame.
+        G_list: n by 6 by 6 array with the spatial inertia matrices of the
+                links, expressed in their link frames.
+        S_list: 6 by n array with the space frame screw axes of the joints as
+                columns.
+        theta: n vector of joint positions, or array with one joint
+               configuration per row, e.g. K by n.
+        theta_dot: Joint velocities, broadcast against theta.
+        tau: Joint forces and torques, broadcast against theta.
+        g: Gravity 3 vector in the space frame. Optional, defaults to
+           :math:`9.81` in the negative :math:`z`-direction.
+        F_tip: Wrench 6 vector that the last link applies to the
+               environment, expressed in the frame of the last link, or
+               array of them broadcast against the configurations. Optional,
+               defaults to zero.
+
+    Returns:
+        n vector of joint accelerations, or array with one per row if
+        several configurations were given.
+    """
+    A, R, p, G, theta_dot, tau = _model(
+        M_list, G_list, S_list, theta, theta_dot, tau, F_tip=F_tip)
+
+    h = _newton_euler(A, R, p, G, theta_dot, 0, g, F_tip)
+    M = _composite_rigid_body(A, R, p, G)
+
+    return np.linalg.solve(M, (tau - h)[..., np.newaxis])[..., 0]
+
+
+def euler_step(acceleration: typing.Callable, t: float, theta: np.array,
+               theta_dot: np.array, dt: float) -> tuple:
+    """
+    Integrates the joint state over one time step with the explicit Euler
+    method.
+
+    Args:
+        acceleration: Function ``acceleration(t, theta, theta_dot)`` that
+                      returns the joint accelerations.
+        t: Time at the start of the step.
+        theta: Joint positions at the start of the step.
+        theta_dot: Joint velocities at the start of the step.
+        dt: Length of the step.
+
+    Returns:
+        Tuple with the joint positions and velocities at the end of the
+        step.
+    """
+    theta_ddot = acceleration(t, theta, theta_dot)
+
+    return theta + dt * theta_dot, theta_dot + dt * theta_ddot
+
+
+def rk4_step(acceleration: typing.Callable, t: float, theta: np.array,
+             theta_dot: np.array, dt: float) -> tuple:
+    """
+    Integrates the joint state over one time step with the classical fourth
+    order Runge-Kutta method.
+
+    Args:
+        acceleration: Function ``acceleration(t, theta, theta_dot)`` that
+                      returns the joint accelerations.
+        t: Time at the start of the step.
+        theta: Joint positions at the start of the step.
+        theta_dot: Joint velocities at the start of the step.
+        dt: Length of the step.
+
+    Returns:
+        Tuple with the joint positions and velocities at the end of the
+        step.
+    """
+    k1 = theta_dot
+    l1 = acceleration(t, theta, theta_dot)
+    k2 = theta_dot + dt/2 * l1
+    l2 = acceleration(t + dt/2, theta + dt/2 * k1, k2)
+    k3 = theta_dot + dt/2 * l2
+    l3 = acceleration(t + dt/2, theta + dt/2 * k2, k3)
+    k4 = theta_dot + dt * l3
+    l4 = acceleration(t + dt, theta + dt * k3, k4)
+
+    return theta + dt/6 * (k1 + 2 * k2 + 2 * k3 + k4), \
+        theta_dot + dt/6 * (l1 + 2 * l2 + 2 * l3 + l4)
+
+
+def simulate(M_list: np.array, G_list: np.array, S_list: np.array,
+             theta: np.array, theta_dot: np.array,
+             tau: typing.Union[np.array, typing.Callable], dt: float,
+             steps: int = None, g: np.array = (0, 0, -9.81),
+             F_tip: np.array = None, method: str = 'rk4') -> tuple:
+    """
+    Simulates the robot with fixed time steps, from the given initial joint
+    state.
+
+    Many independent instances are simulated in lockstep: initial states,
+    torques and the spatial inertias in ``G_list`` can all have leading axes,
+    e.g. K by n initial states for K instances, or K by n by 6 by 6 inertias
+    for a sweep over K payloads. Every time step is a single vectorized
+    evaluation of :py:func:`forward_dynamics` (four for ``'rk4'``) for all
+    instances.
+
+    Args:
+        M_list: n by 4 by 4 array with the home poses of the link frames,
+                expressed in the space frame.
+        G_list: n by 6 by 6 array with the spatial inertia matrices of the
+                links, expressed in their link frames.
+        S_list: 6 by n array with the space frame screw axes of the joints as
+                columns.
+        theta: Initial joint positions, n vector or array with one joint
+               configuration per row.
+        theta_dot: Initial joint velocities, broadcast against theta.
+        tau: Joint forces and torques, either as n vector that is held
+             constant during all steps, as array with the torques of step
+             :math:`k` in row :math:`k` of its second to last axis (e.g. N by
+             n, or K by N by n), held constant during the step, or as
+             function ``tau(t, theta, theta_dot)``, e.g. a feedback
+             controller. A 2-D array is always a sequence of N steps, never
+             a constant torque per instance; for K instances with constant
+             torques of their own, tile them to K by N by n, or return them
+             from a function.
+        dt: Length of a time step.
+        steps: Number of time steps. Optional if ``tau`` is an array with a
+               row per step, then it defaults to its number of rows, and
+               must equal it if given.
+        g: Gravity 3 vector in the space frame. Optional, defaults to
+           :math:`9.81` in the negative :math:`z`-direction.
+        F_tip: Wrench 6 vector that the last link applies to the
+               environment, expressed in the frame of the last link, or
+               array of them broadcast against the instances. Optional,
+               defaults to zero.
+        method: Integration method, ``'rk4'`` (default) or ``'euler'``.
+
+    Returns:
+        Tuple with the joint positions and velocities at the times
+        :math:`0, \\Delta t, \\ldots, N \\Delta t`, as arrays with the
+        :math:`N + 1` time steps along the second to last axis (e.g. K by
+        N + 1 by n).
+
+    Raises:
+        ValueError: If the integration method is unknown, ``steps`` is
+                    omitted while ``tau`` is constant or a function, or
+                    ``steps`` differs from the number of rows of ``tau``.
+
+    See Also:
+        :py:func:`euler_step`
+        :py:func:`rk4_step`
+    """
+    try:
+        step = {'euler': euler_step, 'rk4': rk4_step}[method]
+    except KeyError:
+        raise ValueError(f'Unknown integration method {method!r}') from None
+
+    if not callable(tau):
+        tau = np.asarray(tau)
+        if tau.ndim == 1:
+            if steps is None:
+                raise ValueError('Number of steps needed if tau is constant')
+            tau = np.broadcast_to(tau, (steps,) + tau.shape)
+        elif steps is None:
+            steps = tau.shape[-2]
+        elif steps != tau.shape[-2]:
+            raise ValueError(f'Number of steps {steps} does not match the '
+                             f'{tau.shape[-2]} rows of tau')
+    elif steps is None:
+        raise ValueError('Number of steps needed if tau is a function')
+
+    thetas = [np.asarray(theta)]
+    theta_dots = [np.asarray(theta_dot)]
+
+    for k in range(steps):
+        def acceleration(t, theta, theta_dot):
+            torque = tau(t, theta, theta_dot) if callable(tau) \
+                else tau[..., k, :]
+            return forward_dynamics(M_list, G_list, S_list, theta,
+                                    theta_dot, torque, g, F_tip)
+
+        theta, theta_dot = step(acceleration, k * dt, thetas[-1],
+                                theta_dots[-1], dt)
+        thetas.append(theta)
+        theta_dots.append(theta_dot)
+
+    thetas = np.broadcast_arrays(*thetas, *theta_dots)
+
+    return np.stack(thetas[:steps + 1], axis=-2), \
+        np.stack(thetas[steps + 1:], axis=-2)
+
+
+def _model(M_list: np.array, G_list: np.array, S_list: np.array,
+           theta: np.array, *values, F_tip: np.array = None) -> tuple:
+    """
+    Prepares the evaluation of the robot for theta: the screw axes, relative
+    poses and spatial inertias of the links, stacked along the first axis,
+    followed by values. theta and values are broadcast against each other,
+    the leading axes of G_list and those of F_tip.
+    """
+    M_list, G_list, S_list = \
+        np.asarray(M_list), np.asarray(G_list), np.asarray(S_list)
+    dtype = mr._float_dtype(M_list, G_list, S_list, theta, *values)
+    arrays = [np.asarray(a, dtype=dtype) for a in (theta,) + values]
+
+    n = S_list.shape[-1]
+    shape = np.broadcast_shapes(
+        G_list.shape[:-3],
+        () if F_tip is None else mr._as_vectors(F_tip, 6).shape[:-1],
+        *(a.shape[:-1] for a in arrays))
+    arrays = [np.broadcast_to(a, shape + (n,)) for a in arrays]
+
+    A, R, p = _link_poses(M_list, S_list, arrays[0])
+    G = np.moveaxis(G_list.astype(dtype, copy=False), -3, 0)
+
+    return (A, R, p, G) + tuple(arrays[1:])
+
+
+def _newton_euler(A: np.array, R: np.array, p: np.array, G: np.array,
+                  theta_dot: np.array, theta_ddot: np.array, g: np.array,
+                  F_tip: np.array) -> np.array:
+    """
+    Recursive Newton-Euler algorithm on the output of :py:func:`_model`.
+    Velocities and accelerations can also be 0.
+    """
+    n = len(A)
+    shape = R.shape[1:-2]
+    dtype = R.dtype
+
+    # Forward pass, from the base to the tip. The base 'accelerates upwards'
+    # to include gravity. Like the poses, the twists are stacked along the
+    # first axis.
+    V = np.empty((n,) + shape + (6,), dtype=dtype)
+    V_dot = np.empty((n,) + shape + (6,), dtype=dtype)
+    V_prev = np.zeros(6, dtype=dtype)
+    V_dot_prev = np.zeros(6, dtype=dtype)
+    V_dot_prev[3:6] = -mr._as_vectors(g, 3)
+    theta_dot = np.asarray(theta_dot, dtype=dtype)[..., np.newaxis]
+    theta_ddot = np.asarray(theta_ddot, dtype=dtype)[..., np.newaxis]
+
+    for i in range(n):
+        A_theta_dot = A[i] * (theta_dot[..., i, :] if theta_dot.ndim > 1
+                              else theta_dot)
+        V[i] = mr._adjoint_apply(R[i], p[i], V_prev) + A_theta_dot
+        V_dot[i] = mr._adjoint_apply(R[i], p[i], V_dot_prev) \
+            + _little_adjoint_apply(V[i], A_theta_dot) \
+            + A[i] * (theta_ddot[..., i, :] if theta_ddot.ndim > 1
+                      else theta_ddot)
+        V_prev, V_dot_prev = V[i], V_dot[i]
+
+    # Backward pass, from the tip to the base.
+    tau = np.empty(shape + (n,), dtype=dtype)
+    F = np.zeros(6, dtype=dtype) if F_tip is None \
+        else mr._as_vectors(F_tip, 6).astype(dtype, copy=False)
+
+    for i in range(n - 1, -1, -1):
+        if i < n - 1:
+            F = _adjoint_transpose_apply(R[i + 1], p[i + 1], F)
+        F = F + _inertia_apply(G[i], V_dot[i]) \
+            - _little_adjoint_transpose_apply(V[i],
+                                              _inertia_apply(G[i], V[i]))
+        tau[..., i] = F @ A[i]
+
+    return tau
+
+
+def _composite_rigid_body(A: np.array, R: np.array, p: np.array,
+                          G: np.array) -> np.array:
+    """
+    Composite rigid body algorithm on the output of :py:func:`_model`.
+    """
+    n = len(A)
+    M = np.empty(R.shape[1:-2] + (n, n), dtype=R.dtype)
+
+    G_c = G[n - 1]
+    for i in range(n - 1, -1, -1):
+        if i < n - 1:
+            X = mr.big_adjoint(mr.R_p_to_SE3(R[i + 1], p[i + 1]))
+            G_c = G[i] + np.swapaxes(X, -1, -2) @ G_c @ X
+
+        F = _inertia_apply(G_c, A[i])
+        M[..., i, i] = F @ A[i]
+        for j in range(i - 1, -1, -1):
+            F = _adjoint_transpose_apply(R[j + 1], p[j + 1], F)
+            M[..., i, j] = M[..., j, i] = F @ A[j]
+
+    return M
+
+
+def _link_poses(M_list: np.array, S_list: np.array, theta: np.array) \
+        -> tuple:
+    """
+    Screw axes of the joints in their link frames, as n by 6 array, and the
+    rotations and displacements of the poses T_{i,i-1} of every link relative
+    to the previous one. These are stacked along the first axis, so that the
+    rotations and displacements of every link are contiguous in memory.
+    """
+    M_list = M_list.astype(theta.dtype, copy=False)
+    S_list = S_list.astype(theta.dtype, copy=False)
+
+    # A_i = Ad_{M_i^-1} S_i
+    M_inv = mr.inv_SE3(M_list)
+    A = (mr.big_adjoint(M_inv) @ S_list.T[..., np.newaxis])[..., 0]
+
+    # T_{i,i-1} = e^{-[A_i] theta_i} M_i^-1 M_{i-1}, with M_0 = I.
+    M_prev = np.concatenate((np.eye(4, dtype=theta.dtype)[np.newaxis],
+                             M_list[:-1]))
+
+    T = mr.vec_to_SE3(-A, theta) @ (M_inv @ M_prev)
+    R = np.ascontiguousarray(np.moveaxis(T[..., 0:3, 0:3], -3, 0))
+    p = np.ascontiguousarray(np.moveaxis(T[..., 0:3, 3], -2, 0))
+
+    return A, R, p
+
+
+def _adjoint_transpose_apply(R: np.array, p: np.array,
+                             F: np.array) -> np.array:
+    """
+    Computes :math:`\\Adjoint{T}^\\Transposed F` for stacks of transformation
+    matrices, given by their rotations R and displacements p, and wrenches
+    (stacked along the last axis).
+    """
+    R_T = np.swapaxes(R, -1, -2)
+    m = F[..., 0:3] - np.cross(p, F[..., 3:6])
+
+    return np.concatenate(((R_T @ m[..., np.newaxis])[..., 0],
+                           (R_T @ F[..., 3:6, np.newaxis])[..., 0]), axis=-1)
+
+
+def _little_adjoint_apply(V: np.array, W: np.array) -> np.array:
+    """
+    Computes :math:`\\LittleAdjoint{V} W` for stacks of twists (stacked along
+    the last axis), the Lie bracket of V and W.
+    """
+    omega, v = V[..., 0:3], V[..., 3:6]
+
+    return np.concatenate((np.cross(omega, W[..., 0:3]),
+                           np.cross(v, W[..., 0:3])
+                           + np.cross(omega, W[..., 3:6])), axis=-1)
+
+
+def _little_adjoint_transpose_apply(V: np.array, F: np.array) -> np.array:
+    """
+    Computes :math:`\\LittleAdjoint{V}^\\Transposed F` for stacks of twists
+    and wrenches (stacked along the last axis).
+    """
+    omega, v = V[..., 0:3], V[..., 3:6]
+    m, f = F[..., 0:3], F[..., 3:6]
+
+    return np.concatenate((np.cross(m, omega) + np.cross(f, v),
+                           np.cross(f, omega)), axis=-1)
+
+
+def _inertia_apply(G: np.array, V: np.array) -> np.array:
+    """
+    Computes G V for (stacks of) spatial inertia matrices and twists (stacked
+    along the last axis). A single inertia matrix, shared by all twists, is
+    applied with a single matrix product.
+    """
+    if G.ndim == 2:
+        return V @ G.T
+
+    return (G @ V[..., np.newaxis])[..., 0]
@@ -2,7 +2,8 @@
 .. rubric:: ``modern_robotics.num.gen``
 
 This submodule contains convenient functions to generate transformation
-matrices.
+matrices. They are written out in closed form, and accept arrays of angles and
+offsets, in which case a stack of transformation matrices is returned.
 
 """
 
@@ -16,11 +17,12 @@ def TRx(theta: float) -> np.array:
     :math:`x`-axis.
 
     Args:
-        theta: Angle to rotate with around :math:`x`, in radians.
+        theta: Angle to rotate with around :math:`x`, in radians, or an
+               array of N angles.
 
     Returns:
         Homogeneous transformation matrix with :math:`x`-rotation and zero
-        translation.
+        translation, or N by 4 by 4 array of them.
 
     Example:
         .. code-block:: python
@@ -37,7 +39,7 @@ def TRx(theta: float) -> np.array:
         :py:func:`TRy`
         :py:func:`TRz`
     """
-    return mr.vec_to_SE3(np.array([[1, 0, 0, 0, 0, 0]]).T, theta)
+    return _TR(1, 2, theta)
 
 
 def TRy(theta: float) -> np.array:
@@ -46,11 +48,12 @@ def TRy(theta: float) -> np.array:
     :math:`y`-axis.
 
     Args:
-        theta: Angle to rotate with around :math:`y`, in radians.
+        theta: Angle to rotate with around :math:`y`, in radians, or an
+               array of N angles.
 
     Returns:
         Homogeneous transformation matrix with :math:`y`-rotation and zero
-        translation.
+        translation, or N by 4 by 4 array of them.
 
     Example:
         .. code-block:: python
@@ -67,7 +70,7 @@ def TRy(theta: float) -> np.array:
         :py:func:`TRx`
         :py:func:`TRz`
     """
-    return mr.vec_to_SE3(np.array([[0, 1, 0, 0, 0, 0]]).T, theta)
+    return _TR(2, 0, theta)
 
 
 def TRz(theta: float) -> np.array:
@@ -76,18 +79,19 @@ def TRz(theta: float) -> np.array:
     :math:`z`-axis.
 
     Args:
-        theta: Angle to rotate with around :math:`z`, in radians.
+        theta: Angle to rotate with around :math:`z`, in radians, or an
+               array of N angles.
 
     Returns:
         Homogeneous transformation matrix with :math:`z`-rotation and zero
-        translation.
+        translation, or N by 4 by 4 array of them.
 
     Example:
         .. code-block:: python
 
             >>> import numpy as np
             >>> import modern_robotics.num as mr
-            >>> mr.gen.TRz(np.pi/3) 
+            >>> mr.gen.TRz(np.pi/3)
             array([[ 0.5      , -0.8660254,  0.       ,  0.       ],
                    [ 0.8660254,  0.5      ,  0.       ,  0.       ],
                    [ 0.       ,  0.       ,  1.       ,  0.       ],
@@ -97,7 +101,7 @@ def TRz(theta: float) -> np.array:
         :py:func:`TRx`
         :py:func:`TRy`
     """
-    return mr.vec_to_SE3(np.array([[0, 0, 1, 0, 0, 0]]).T, theta)
+    return _TR(0, 1, theta)
 
 
 def Tt(t: np.array = None, x: float = 0., y: float = 0., z: float = 0.) \
@@ -106,17 +110,20 @@ def Tt(t: np.array = None, x: float = 0., y: float = 0., z: float = 0.) \
     Creates a transformation matrix with only a translational part.
 
     Args:
-        t: Translation three vector. Should be a column vector. Optional, if
-           omitted use one of the following to create ``t``.
+        t: Translation three vector. Should be a column vector, or an N by 3
+           array with one translation per row. Optional, if omitted use one
+           of the following to create ``t``.
         x: :math:`x`-coordinate of the translation. Optional and only used if
-           ``t`` is not provided.
+           ``t`` is not provided. Can be an array of N coordinates, as can
+           ``y`` and ``z``; they are broadcast against each other.
         y: :math:`y`-coordinate of the translation. Optional and only used if
            ``t`` is not provided.
         z: :math:`z`-coordinate of the translation. Optional and only used if
            ``t`` is not provided.
 
     Returns:
-        Homogeneous transformation matrix without rotation, only translation.
+        Homogeneous transformation matrix without rotation, only translation,
+        or N by 4 by 4 array of them.
 
     Examples:
         .. code-block:: python
@@ -140,7 +147,229 @@ def Tt(t: np.array = None, x: float = 0., y: float = 0., z: float = 0.) \
                    [0., 0., 0., 1.]])
         """
 
-    if t is None:
-        t = np.array([[x], [y], [z]])
+    if t is not None:
+        return mr.R_p_to_SE3(np.eye(3, dtype=mr._float_dtype(t)), t)
+
+    T = _empty(x, y, z)
+    T[..., 0:3, 0:3] = np.eye(3)
+    T[..., 0, 3] = x
+    T[..., 1, 3] = y
+    T[..., 2, 3] = z
+
+    return T
+
+
+def TRzyx(alpha: float, beta: float, gamma: float) -> np.array:
+    """
+    Creates a transformation matrix with a rotation given by ZYX Euler angles,
+    i.e. a rotation around :math:`z`, followed by a rotation around the new
+    :math:`y`-axis and finally around the new :math:`x`-axis.
+
+    .. math::
+
+        \\HomogeneousTransformationMatrix = \\operatorname{TRz}(\\alpha)
+        \\operatorname{TRy}(\\beta) \\operatorname{TRx}(\\gamma)
+
+    The product is evaluated in closed form, in a single pass.
+
+    Args:
+        alpha: Angle around :math:`z`, in radians.
+        beta: Angle around :math:`y`, in radians.
+        gamma: Angle around :math:`x`, in radians.
+
+    All angles can be arrays of N angles, they are broadcast against each
+    other.
+
+    Returns:
+        Homogeneous transformation matrix with zero translation, or N by 4 by
+        4 array of them.
+
+    See Also:
+        :py:func:`TRrpy`
+    """
+    ca, cb, cc = np.cos(alpha), np.cos(beta), np.cos(gamma)
+    sa, sb, sc = np.sin(alpha), np.sin(beta), np.sin(gamma)
+
+    T = _empty(ca, cb, cc)
+    T[..., 0, 0] = ca * cb
+    T[..., 0, 1] = ca * sb * sc - sa * cc
+    T[..., 0, 2] = ca * sb * cc + sa * sc
+    T[..., 1, 0] = sa * cb
+    T[..., 1, 1] = sa * sb * sc + ca * cc
+    T[..., 1, 2] = sa * sb * cc - ca * sc
+    T[..., 2, 0] = -sb
+    T[..., 2, 1] = cb * sc
+    T[..., 2, 2] = cb * cc
+    T[..., 0:3, 3] = 0
+
+    return T
+
+
+def TRrpy(roll: float, pitch: float, yaw: float) -> np.array:
+    """
+    Creates a transformation matrix with a rotation given by roll, pitch and
+    yaw angles. These are rotations around the fixed :math:`x`, :math:`y` and
+    :math:`z`-axes respectively, in that order, which is the same as
+    ``TRzyx(yaw, pitch, roll)``.
+
+    Args:
+        roll: Angle around :math:`x`, in radians.
+        pitch: Angle around :math:`y`, in radians.
+        yaw: Angle around :math:`z`, in radians.
+
+    All angles can be arrays of N angles, they are broadcast against each
+    other.
+
+    Returns:
+        Homogeneous transformation matrix with zero translation, or N by 4 by
+        4 array of them.
+
+    Example:
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> import modern_robotics.num as mr
+            >>> T = mr.gen.TRrpy(0, 0, np.linspace(0, np.pi, 5))
+            >>> T.shape
+            (5, 4, 4)
+            >>> np.allclose(T[2], mr.gen.TRz(np.pi/2))
+            True
+
+    See Also:
+        :py:func:`TRzyx`
+    """
+    return TRzyx(yaw, pitch, roll)
+
+
+def TDH(theta: float, d: float, a: float, alpha: float) -> np.array:
+    """
+    Creates the transformation matrix of a link described by (standard)
+    Denavit-Hartenberg parameters.
+
+    .. math::
+
+        \\HomogeneousTransformationMatrix = \\operatorname{TRz}(\\theta)
+        \\operatorname{Tt}(z=d) \\operatorname{Tt}(x=a)
+        \\operatorname{TRx}(\\alpha)
+
+    The product is evaluated in closed form, in a single pass.
+
+    Args:
+        theta: Joint angle around :math:`z`, in radians.
+        d: Link offset along :math:`z`.
+        a: Link length along :math:`x`.
+        alpha: Link twist around :math:`x`, in radians.
+
+    All parameters can be arrays of N values, they are broadcast against each
+    other. E.g. one link can be evaluated for N joint angles, or N links at
+    once.
+
+    Returns:
+        Homogeneous transformation matrix of the link, or N by 4 by 4 array
+        of them.
+
+    See Also:
+        :py:func:`TmDH`
+    """
+    ct, st = np.cos(theta), np.sin(theta)
+    ca, sa = np.cos(alpha), np.sin(alpha)
+
+    T = _empty(ct, ca, d, a)
+    T[..., 0, 0] = ct
+    T[..., 0, 1] = -st * ca
+    T[..., 0, 2] = st * sa
+    T[..., 0, 3] = a * ct
+    T[..., 1, 0] = st
+    T[..., 1, 1] = ct * ca
+    T[..., 1, 2] = -ct * sa
+    T[..., 1, 3] = a * st
+    T[..., 2, 0] = 0
+    T[..., 2, 1] = sa
+    T[..., 2, 2] = ca
+    T[..., 2, 3] = d
+
+    return T
+
+
+def TmDH(alpha: float, a: float, theta: float, d: float) -> np.array:
+    """
+    Creates the transformation matrix of a link described by modified
+    (Craig's) Denavit-Hartenberg parameters.
+
+    .. math::
+
+        \\HomogeneousTransformationMatrix = \\operatorname{TRx}(\\alpha)
+        \\operatorname{Tt}(x=a) \\operatorname{TRz}(\\theta)
+        \\operatorname{Tt}(z=d)
+
+    The product is evaluated in closed form, in a single pass.
+
+    Args:
+        alpha: Link twist around :math:`x`, in radians.
+        a: Link length along :math:`x`.
+        theta: Joint angle around :math:`z`, in radians.
+        d: Link offset along :math:`z`.
+
+    All parameters can be arrays of N values, they are broadcast against each
+    other.
+
+    Returns:
+        Homogeneous transformation matrix of the link, or N by 4 by 4 array
+        of them.
+
+    See Also:
+        :py:func:`TDH`
+    """
+    ct, st = np.cos(theta), np.sin(theta)
+    ca, sa = np.cos(alpha), np.sin(alpha)
+
+    T = _empty(ct, ca, d, a)
+    T[..., 0, 0] = ct
+    T[..., 0, 1] = -st
+    T[..., 0, 2] = 0
+    T[..., 0, 3] = a
+    T[..., 1, 0] = st * ca
+    T[..., 1, 1] = ct * ca
+    T[..., 1, 2] = -sa
+    T[..., 1, 3] = -sa * d
+    T[..., 2, 0] = st * sa
+    T[..., 2, 1] = ct * sa
+    T[..., 2, 2] = ca
+    T[..., 2, 3] = ca * d
+
+    return T
+
+
+def _TR(i: int, j: int, theta: float) -> np.array:
+    """
+    Transformation matrix with a rotation in the plane of axes i and j, i.e.
+    around the remaining axis.
+    """
+    c = np.cos(theta)
+    s = np.sin(theta)
+
+    T = _empty(c)
+    T[..., 0:3, 0:3] = 0
+    T[..., 0:3, 3] = 0
+    T[..., 0, 0] = T[..., 1, 1] = T[..., 2, 2] = 1
+    T[..., i, i] = c
+    T[..., i, j] = -s
+    T[..., j, i] = s
+    T[..., j, j] = c
+
+    return T
+
+
+def _empty(*values) -> np.array:
+    """
+    Allocates the stack of transformation matrices for the broadcast shape of
+    values, with the last row already set.
+    """
+    shape = np.broadcast(*values).shape if len(values) > 1 \
+        else np.shape(values[0])
+
+    T = np.empty(shape + (4, 4), dtype=mr._float_dtype(*values))
+    T[..., 3, 0:3] = 0
+    T[..., 3, 3] = 1
 
-    return mr.R_p_to_SE3(np.eye(3), t)
+    return T
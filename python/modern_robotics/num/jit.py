@@ -0,0 +1,290 @@
+"""
+.. rubric:: ``modern_robotics.num.jit``
+
+This submodule contains kernels for single (not stacked) inputs of the
+functions that are called most often in control loops:
+:py:func:`vec_to_SO3`, :py:func:`vec_to_SE3`, :py:func:`SE3_to_vec`,
+:py:func:`big_adjoint` and :py:func:`inv_SE3`. The kernels are written as
+scalar loops and compiled with `numba <https://numba.pydata.org/>`_, which
+removes the per-call overhead of the many small numpy operations of the
+vectorized implementations.
+
+numba is optional. If it is not installed the kernels run as plain Python,
+which gives the same results but is slow, see :py:data:`COMPILED`.
+
+The kernels are used by the functions in :py:mod:`modern_robotics.num` for
+single float64 inputs after selecting the numba backend, either with
+``modern_robotics.num.set_backend('numba')`` or by setting the
+``MODERN_ROBOTICS_BACKEND`` environment variable to ``numba`` before the
+import. The functions in this submodule can also be called directly. They
+accept the same single inputs as their counterparts, as float64 arrays.
+
+"""
+
+import math
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+#: Whether the kernels are compiled with numba.
+COMPILED = numba is not None
+
+
+def _kernel(function):
+    """
+    Compiles function with numba, if it is available.
+    """
+    if numba is None:
+        return function
+
+    return numba.njit(cache=True)(function)
+
+
+def vec_to_SO3(omega: np.array, theta: float = None) -> np.array:
+    """
+    Kernel of :py:func:`modern_robotics.num.vec_to_SO3`.
+
+    Args:
+        omega: 3 vector angular velocity.
+        theta: If omitted, the Euclidean norm of omega is assumed to be theta.
+
+    Returns:
+        3 by 3 rotation matrix.
+    """
+    out = np.empty((3, 3))
+    _vec_to_SO3(omega.reshape(3), np.nan if theta is None else theta, out)
+
+    return out
+
+
+def vec_to_SE3(S: np.array, theta: float, out: np.array = None) -> np.array:
+    """
+    Kernel of :py:func:`modern_robotics.num.vec_to_SE3`.
+
+    Args:
+        S: 6 vector velocity twist.
+        theta: Distance travelled along the velocity twist screw axis.
+        out: 4 by 4 array to write the result into. Optional, if omitted a
+             new array is allocated.
+
+    Returns:
+        4 by 4 homogeneous transformation matrix.
+    """
+    if out is None:
+        out = np.empty((4, 4))
+    _vec_to_SE3(S.reshape(6), theta, out)
+
+    return out
+
+
+def SE3_to_vec(T: np.array) -> np.array:
+    """
+    Kernel of :py:func:`modern_robotics.num.SE3_to_vec`.
+
+    Args:
+        T: Homogeneous transformation matrix.
+
+    Returns:
+        6 by 1 velocity twist vector with length :math:`\\theta`.
+    """
+    out = np.empty((6, 1))
+    _SE3_to_vec(T, out)
+
+    return out
+
+
+def big_adjoint(T: np.array, out: np.array = None) -> np.array:
+    """
+    Kernel of :py:func:`modern_robotics.num.big_adjoint`.
+
+    Args:
+        T: 4 by 4 homogeneous transformation matrix.
+        out: 6 by 6 array to write the result into. Optional, if omitted a
+             new array is allocated.
+
+    Returns:
+        6 by 6 'big adjoint' form of the transformation matrix T.
+    """
+    if out is None:
+        out = np.empty((6, 6))
+    _big_adjoint(T, out)
+
+    return out
+
+
+def inv_SE3(T: np.array, out: np.array = None) -> np.array:
+    """
+    Kernel of :py:func:`modern_robotics.num.inv_SE3`.
+
+    Args:
+        T: 4 by 4 homogeneous transformation matrix.
+        out: 4 by 4 array to write the result into. Optional, if omitted a
+             new array is allocated. Can be T itself to invert in place.
+
+    Returns:
+        4 by 4 inverse homogeneous transformation matrix.
+    """
+    if out is None:
+        out = np.empty((4, 4))
+    _inv_SE3(T, out)
+
+    return out
+
+
+@_kernel
+def _isclose(a, b):
+    # Same tolerances as np.isclose, which the numpy implementations use.
+    return abs(a - b) <= 1e-8 + 1e-5 * abs(b)
+
+
+@_kernel
+def _vec_to_SO3(omega, theta, out):
+    wx, wy, wz = omega[0], omega[1], omega[2]
+    if math.isnan(theta):
+        theta = math.sqrt(wx * wx + wy * wy + wz * wz)
+        wx, wy, wz = wx / theta, wy / theta, wz / theta
+
+    s = math.sin(theta)
+    c = 1 - math.cos(theta)
+    ww = wx * wx + wy * wy + wz * wz
+
+    # Rodrigues' formula, I + sin(theta) w~ + (1 - cos(theta)) w~^2
+    out[0, 0] = 1 + c * (wx * wx - ww)
+    out[0, 1] = -s * wz + c * wx * wy
+    out[0, 2] = s * wy + c * wx * wz
+    out[1, 0] = s * wz + c * wx * wy
+    out[1, 1] = 1 + c * (wy * wy - ww)
+    out[1, 2] = -s * wx + c * wy * wz
+    out[2, 0] = -s * wy + c * wx * wz
+    out[2, 1] = s * wx + c * wy * wz
+    out[2, 2] = 1 + c * (wz * wz - ww)
+
+
+@_kernel
+def _vec_to_SE3(S, theta, out):
+    _vec_to_SO3(S[0:3], theta, out)
+
+    wx, wy, wz, vx, vy, vz = S[0], S[1], S[2], S[3], S[4], S[5]
+    c = 1 - math.cos(theta)
+    t = theta - math.sin(theta)
+
+    # p = theta v + (1 - cos(theta)) w x v + (theta - sin(theta)) w x (w x v)
+    ux = wy * vz - wz * vy
+    uy = wz * vx - wx * vz
+    uz = wx * vy - wy * vx
+    out[0, 3] = theta * vx + c * ux + t * (wy * uz - wz * uy)
+    out[1, 3] = theta * vy + c * uy + t * (wz * ux - wx * uz)
+    out[2, 3] = theta * vz + c * uz + t * (wx * uy - wy * ux)
+
+    out[3, 0] = 0
+    out[3, 1] = 0
+    out[3, 2] = 0
+    out[3, 3] = 1
+
+
+@_kernel
+def _SE3_to_vec(T, out):
+    # Special cases as in the numpy implementation: the screw axis of the
+    # identity is undefined, a pure translation has an infinite pitch.
+    identity = True
+    translation = True
+    for i in range(4):
+        for j in range(4):
+            if not _isclose(T[i, j], 1. if i == j else 0.):
+                identity = False
+                if i < 3 and j < 3:
+                    translation = False
+
+    if identity:
+        for i in range(6):
+            out[i, 0] = np.nan
+        return
+
+    px, py, pz = T[0, 3], T[1, 3], T[2, 3]
+
+    if translation:
+        # (p / |p|) |p| instead of p, the unit axis times the distance as in
+        # the numpy implementation, so that both round the same.
+        norm = math.sqrt(px * px + py * py + pz * pz)
+        out[0, 0] = 0
+        out[1, 0] = 0
+        out[2, 0] = 0
+        out[3, 0] = px / norm * norm
+        out[4, 0] = py / norm * norm
+        out[5, 0] = pz / norm * norm
+        return
+
+    trace = T[0, 0] + T[1, 1] + T[2, 2]
+    if _isclose(trace, -1.):
+        # Half turn, the axis is taken from the z, y or x column, whichever
+        # is the first with a diagonal element unequal to -1.
+        k = 2 if not _isclose(T[2, 2], -1.) \
+            else 1 if not _isclose(T[1, 1], -1.) else 0
+        scale = math.sqrt(2 * (1 + T[k, k]))
+        wx = (T[0, k] + (k == 0)) / scale
+        wy = (T[1, k] + (k == 1)) / scale
+        wz = (T[2, k] + (k == 2)) / scale
+        theta = np.pi
+    else:
+        wx = T[2, 1] - T[1, 2]
+        wy = T[0, 2] - T[2, 0]
+        wz = T[1, 0] - T[0, 1]
+        sin = math.sqrt(wx * wx + wy * wy + wz * wz)
+        theta = math.atan2(sin, trace - 1)
+        wx, wy, wz = wx / sin, wy / sin, wz / sin
+
+    # v = G^-1(theta) p, with
+    # G^-1 = I / theta - w~ / 2 + (1 / theta - cot(theta / 2) / 2) w~^2
+    a = 1 / theta
+    b = 1 / theta - 1/2 / math.tan(theta / 2)
+    wp = wx * px + wy * py + wz * pz
+    vx = a * px - 1/2 * (wy * pz - wz * py) + b * (wx * wp - px)
+    vy = a * py - 1/2 * (wz * px - wx * pz) + b * (wy * wp - py)
+    vz = a * pz - 1/2 * (wx * py - wy * px) + b * (wz * wp - pz)
+
+    out[0, 0] = wx * theta
+    out[1, 0] = wy * theta
+    out[2, 0] = wz * theta
+    out[3, 0] = vx * theta
+    out[4, 0] = vy * theta
+    out[5, 0] = vz * theta
+
+
+@_kernel
+def _big_adjoint(T, out):
+    px, py, pz = T[0, 3], T[1, 3], T[2, 3]
+    for j in range(3):
+        r0, r1, r2 = T[0, j], T[1, j], T[2, j]
+        out[0, j] = out[3, j + 3] = r0
+        out[1, j] = out[4, j + 3] = r1
+        out[2, j] = out[5, j + 3] = r2
+        out[0, j + 3] = 0
+        out[1, j + 3] = 0
+        out[2, j + 3] = 0
+        # Column j of p~ R is p x R[:, j].
+        out[3, j] = py * r2 - pz * r1
+        out[4, j] = pz * r0 - px * r2
+        out[5, j] = px * r1 - py * r0
+
+
+@_kernel
+def _inv_SE3(T, out):
+    # All of T is read before writing, so that out can be T itself.
+    r00, r01, r02, px = T[0, 0], T[0, 1], T[0, 2], T[0, 3]
+    r10, r11, r12, py = T[1, 0], T[1, 1], T[1, 2], T[1, 3]
+    r20, r21, r22, pz = T[2, 0], T[2, 1], T[2, 2], T[2, 3]
+
+    out[0, 0], out[0, 1], out[0, 2] = r00, r10, r20
+    out[1, 0], out[1, 1], out[1, 2] = r01, r11, r21
+    out[2, 0], out[2, 1], out[2, 2] = r02, r12, r22
+    out[0, 3] = -(r00 * px + r10 * py + r20 * pz)
+    out[1, 3] = -(r01 * px + r11 * py + r21 * pz)
+    out[2, 3] = -(r02 * px + r12 * py + r22 * pz)
+
+    out[3, 0] = 0
+    out[3, 1] = 0
+    out[3, 2] = 0
+    out[3, 3] = 1
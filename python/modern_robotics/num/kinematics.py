@@ -0,0 +1,648 @@
+"""
+.. rubric:: ``modern_robotics.num.kinematics``
+
+This submodule contains forward kinematics of open chains, using the product
+of exponentials formula. All functions accept a single joint configuration
+or a K by n array with one configuration per row, in which case all
+configurations are evaluated at once.
+
+The screw axes of a robot are given as a 6 by n array ``S_list`` (or
+``B_list`` for body frame screw axes), with the screw axis of joint
+:math:`i` in column :math:`i`.
+
+The inverse kinematics solvers run damped least squares Newton-Raphson
+iterations on a whole batch of problems at once, e.g. many random initial
+guesses for one target, or one initial guess per target of a trajectory.
+
+Manipulability maps evaluate the manipulability ellipsoid over many joint
+configurations, in chunks, and can stream the results into a memory-mapped
+``.npy`` file, so maps larger than memory can be produced.
+
+"""
+
+import os
+import typing
+import numpy as np
+import modern_robotics.num as mr
+from modern_robotics import profiling
+
+
+#: Structured dtype of a manipulability map entry. ``measure`` is the
+#: manipulability measure
+#: :math:`\\sqrt{\\det(\\Jacobian\\Jacobian\\Transposed)}`, ``condition``
+#: the ratio between largest and smallest eigenvalue of
+#: :math:`\\Jacobian\\Jacobian\\Transposed` (NaN if singular) and
+#: ``singular`` whether the Jacobian is singular.
+MANIPULABILITY_DTYPE = np.dtype([('measure', float), ('condition', float),
+                                 ('singular', bool)])
+
+
+class IKResult(typing.NamedTuple):
+    """
+    Result of :py:func:`IK_body` and :py:func:`IK_space`. For a batch of K
+    problems every field has K entries, one per problem.
+    """
+
+    #: Joint positions of the last iteration.
+    theta: np.array
+    #: Whether both error norms dropped below their tolerance.
+    success: np.array
+    #: Number of Newton-Raphson steps that were taken.
+    iterations: np.array
+    #: Norm of the angular part of the remaining error twist.
+    err_omega: np.array
+    #: Norm of the linear part of the remaining error twist.
+    err_v: np.array
+
+
+def FK_space(M: np.array, S_list: np.array, theta: np.array,
+             out: np.array = None) -> np.array:
+    """
+    Computes the end-effector pose with the product of exponentials formula
+    in the space frame.
+
+    .. math::
+
+        \\HomogeneousTransformationMatrix(\\theta) =
+        e^{\\TildeSkew{\\Screw}_1\\theta_1} \\cdots
+        e^{\\TildeSkew{\\Screw}_n\\theta_n} M
+
+    Args:
+        M: 4 by 4 home pose of the end-effector
+           :math:`M \\in \\SEthree`.
+        S_list: 6 by n array with the space frame screw axes of the joints as
+                columns.
+        theta: n vector of joint positions, or K by n array with one joint
+               configuration per row.
+        out: 4 by 4 (or K by 4 by 4) array to write the pose into. Optional,
+             if omitted a new array is allocated.
+
+    Returns:
+        4 by 4 end-effector pose
+        :math:`\\HomogeneousTransformationMatrix \\in \\SEthree`, or K by 4 by
+        4 array of poses if K configurations were given.
+
+    Example:
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> import modern_robotics.num as mr
+            >>> M = mr.gen.Tt(x=2)
+            >>> S_list = np.array([[0, 0, 1, 0, 0, 0],
+            ...                    [0, 0, 1, 0, -1, 0]]).T
+            >>> mr.kinematics.FK_space(M, S_list, [0, np.pi/2]).round(3)
+            array([[ 0., -1.,  0.,  1.],
+                   [ 1.,  0.,  0.,  1.],
+                   [ 0.,  0.,  1.,  0.],
+                   [ 0.,  0.,  0.,  1.]])
+
+    See Also:
+        :py:func:`FK_body`
+        :py:func:`FK_jacobian_space`
+        :py:func:`link_poses`
+    """
+    return np.matmul(_prefix_products(S_list, theta)[..., -1, :, :], M,
+                     out=out)
+
+
+def FK_body(M: np.array, B_list: np.array, theta: np.array,
+            out: np.array = None) -> np.array:
+    """
+    Computes the end-effector pose with the product of exponentials formula
+    in the body frame.
+
+    .. math::
+
+        \\HomogeneousTransformationMatrix(\\theta) =
+        M e^{\\TildeSkew{\\BodyScrew}_1\\theta_1} \\cdots
+        e^{\\TildeSkew{\\BodyScrew}_n\\theta_n}
+
+    Args:
+        M: 4 by 4 home pose of the end-effector
+           :math:`M \\in \\SEthree`.
+        B_list: 6 by n array with the body frame screw axes of the joints as
+                columns.
+        theta: n vector of joint positions, or K by n array with one joint
+               configuration per row.
+        out: 4 by 4 (or K by 4 by 4) array to write the pose into. Optional,
+             if omitted a new array is allocated.
+
+    Returns:
+        4 by 4 end-effector pose
+        :math:`\\HomogeneousTransformationMatrix \\in \\SEthree`, or K by 4 by
+        4 array of poses if K configurations were given.
+
+    See Also:
+        :py:func:`FK_space`
+        :py:func:`FK_jacobian_body`
+    """
+    return np.matmul(M, _suffix_products(B_list, theta)[..., 0, :, :],
+                     out=out)
+
+
+def link_poses(M_list: np.array, S_list: np.array, theta: np.array) \
+        -> np.array:
+    """
+    Computes the poses of all links of the chain in the space frame. The pose
+    of link :math:`i` only depends on the first :math:`i` joints.
+
+    .. math::
+
+        \\HomogeneousTransformationMatrix_i(\\theta) =
+        e^{\\TildeSkew{\\Screw}_1\\theta_1} \\cdots
+        e^{\\TildeSkew{\\Screw}_i\\theta_i} M_i
+
+    Args:
+        M_list: n by 4 by 4 array with the home poses :math:`M_i` of the link
+                frames, expressed in the space frame.
+        S_list: 6 by n array with the space frame screw axes of the joints as
+                columns.
+        theta: n vector of joint positions, or K by n array with one joint
+               configuration per row.
+
+    Returns:
+        n by 4 by 4 array with the link poses, or K by n by 4 by 4 array if K
+        configurations were given.
+
+    See Also:
+        :py:func:`FK_space`
+    """
+    return _prefix_products(S_list, theta) @ M_list
+
+
+def jacobian_space(S_list: np.array, theta: np.array) -> np.array:
+    """
+    Computes the space Jacobian, of which column :math:`i` is the screw axis
+    of joint :math:`i` in the current configuration.
+
+    .. math::
+
+        \\Jacobian_{s,i}(\\theta) =
+        \\Adjoint{e^{\\TildeSkew{\\Screw}_1\\theta_1} \\cdots
+        e^{\\TildeSkew{\\Screw}_{i-1}\\theta_{i-1}}} \\Screw_i
+
+    Args:
+        S_list: 6 by n array with the space frame screw axes of the joints as
+                columns.
+        theta: n vector of joint positions, or K by n array with one joint
+               configuration per row.
+
+    Returns:
+        6 by n space Jacobian, or K by 6 by n array of Jacobians if K
+        configurations were given.
+
+    See Also:
+        :py:func:`FK_jacobian_space`
+        :py:func:`jacobian_body`
+    """
+    return _FK_jacobian_space(S_list, theta)[1]
+
+
+def jacobian_body(B_list: np.array, theta: np.array) -> np.array:
+    """
+    Computes the body Jacobian, of which column :math:`i` is the screw axis
+    of joint :math:`i` in the current end-effector frame.
+
+    .. math::
+
+        \\Jacobian_{b,i}(\\theta) =
+        \\Adjoint{e^{-\\TildeSkew{\\BodyScrew}_n\\theta_n} \\cdots
+        e^{-\\TildeSkew{\\BodyScrew}_{i+1}\\theta_{i+1}}} \\BodyScrew_i
+
+    Args:
+        B_list: 6 by n array with the body frame screw axes of the joints as
+                columns.
+        theta: n vector of joint positions, or K by n array with one joint
+               configuration per row.
+
+    Returns:
+        6 by n body Jacobian, or K by 6 by n array of Jacobians if K
+        configurations were given.
+
+    See Also:
+        :py:func:`FK_jacobian_body`
+        :py:func:`jacobian_space`
+    """
+    return _FK_jacobian_body(B_list, theta)[1]
+
+
+def FK_jacobian_space(M: np.array, S_list: np.array, theta: np.array) \
+        -> tuple:
+    """
+    Computes the end-effector pose and the space Jacobian together. The
+    running products of exponentials are computed once and used for both.
+
+    Args:
+        M: 4 by 4 home pose of the end-effector
+           :math:`M \\in \\SEthree`.
+        S_list: 6 by n array with the space frame screw axes of the joints as
+                columns.
+        theta: n vector of joint positions, or K by n array with one joint
+               configuration per row.
+
+    Returns:
+        Tuple with the end-effector pose as in :py:func:`FK_space` and the
+        space Jacobian as in :py:func:`jacobian_space`.
+    """
+    T, J = _FK_jacobian_space(S_list, theta)
+
+    return T @ M, J
+
+
+def FK_jacobian_body(M: np.array, B_list: np.array, theta: np.array) \
+        -> tuple:
+    """
+    Computes the end-effector pose and the body Jacobian together. The
+    running products of exponentials are computed once and used for both.
+
+    Args:
+        M: 4 by 4 home pose of the end-effector
+           :math:`M \\in \\SEthree`.
+        B_list: 6 by n array with the body frame screw axes of the joints as
+                columns.
+        theta: n vector of joint positions, or K by n array with one joint
+               configuration per row.
+
+    Returns:
+        Tuple with the end-effector pose as in :py:func:`FK_body` and the body
+        Jacobian as in :py:func:`jacobian_body`.
+    """
+    T, J = _FK_jacobian_body(B_list, theta)
+
+    return M @ T, J
+
+
+def IK_body(B_list: np.array, M: np.array, T_d: np.array,
+            theta0: np.array, eomg: float = 1e-3, ev: float = 1e-3,
+            max_iterations: int = 20, damping: float = 1e-2) -> IKResult:
+    """
+    Solves the inverse kinematics numerically with damped least squares
+    Newton-Raphson iterations, using the body Jacobian.
+
+    Each iteration computes the body frame error twist
+    :math:`\\Twist_b = \\log(\\HomogeneousTransformationMatrix^{-1}(\\theta)
+    \\HomogeneousTransformationMatrix_d)` and takes the step
+
+    .. math::
+
+        \\Delta\\theta = (\\Jacobian_b\\Transposed\\Jacobian_b +
+        \\lambda^2 I)^{-1}\\Jacobian_b\\Transposed\\Twist_b
+
+    Several problems can be solved at once by giving a stack of targets
+    and/or a stack of initial guesses. Problems that have converged are
+    dropped from the following iterations, and the loop stops as soon as all
+    problems have converged.
+
+    Args:
+        B_list: 6 by n array with the body frame screw axes of the joints as
+                columns.
+        M: 4 by 4 home pose of the end-effector
+           :math:`M \\in \\SEthree`.
+        T_d: 4 by 4 desired end-effector pose, or K by 4 by 4 array of
+             desired poses.
+        theta0: n vector with the initial guess, or K by n array with one
+                initial guess per row.
+        eomg: Tolerance on the norm of the angular part of the error twist.
+        ev: Tolerance on the norm of the linear part of the error twist.
+        max_iterations: Maximum number of iterations per problem.
+        damping: Damping factor :math:`\\lambda`, keeps the steps bounded
+                 near singularities.
+
+    Returns:
+        :py:class:`IKResult` with the joint positions, convergence flags,
+        iteration counts and remaining errors.
+
+    Example:
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> import modern_robotics.num as mr
+            >>> M = mr.gen.Tt(x=2)
+            >>> B_list = np.array([[0, 0, 1, 0, 2, 0],
+            ...                    [0, 0, 1, 0, 1, 0]]).T
+            >>> T_d = mr.gen.Tt(x=1, y=1) @ mr.gen.TRz(np.pi/2)
+            >>> seeds = np.array([[0.1, 1.0], [1.0, -1.0]])
+            >>> result = mr.kinematics.IK_body(B_list, M, T_d, seeds)
+            >>> result.theta.round(3), result.success
+            (array([[-0.   ,  1.571],
+                   [-0.   ,  1.571]]), array([ True,  True]))
+
+    See Also:
+        :py:func:`IK_space`
+        :py:func:`FK_body`
+    """
+    def error(theta, T_d):
+        T, J = _FK_jacobian_body(B_list, theta)
+        V = _log_error(M @ T, T_d)
+        return J, V
+
+    return _IK(error, T_d, theta0, eomg, ev, max_iterations, damping)
+
+
+def IK_space(S_list: np.array, M: np.array, T_d: np.array,
+             theta0: np.array, eomg: float = 1e-3, ev: float = 1e-3,
+             max_iterations: int = 20, damping: float = 1e-2) -> IKResult:
+    """
+    Solves the inverse kinematics numerically with damped least squares
+    Newton-Raphson iterations, using the space Jacobian. The error twist is
+    expressed in the space frame, :math:`\\Twist_s =
+    \\Adjoint{\\HomogeneousTransformationMatrix(\\theta)}\\Twist_b`; apart
+    from that it works the same as :py:func:`IK_body`.
+
+    Args:
+        S_list: 6 by n array with the space frame screw axes of the joints as
+                columns.
+        M: 4 by 4 home pose of the end-effector
+           :math:`M \\in \\SEthree`.
+        T_d: 4 by 4 desired end-effector pose, or K by 4 by 4 array of
+             desired poses.
+        theta0: n vector with the initial guess, or K by n array with one
+                initial guess per row.
+        eomg: Tolerance on the norm of the angular part of the error twist.
+        ev: Tolerance on the norm of the linear part of the error twist.
+        max_iterations: Maximum number of iterations per problem.
+        damping: Damping factor :math:`\\lambda`, keeps the steps bounded
+                 near singularities.
+
+    Returns:
+        :py:class:`IKResult` with the joint positions, convergence flags,
+        iteration counts and remaining errors.
+
+    See Also:
+        :py:func:`IK_body`
+        :py:func:`FK_space`
+    """
+    def error(theta, T_d):
+        P, J = _FK_jacobian_space(S_list, theta)
+        T = P @ M
+        V = mr._adjoint_apply(T[..., 0:3, 0:3], T[..., 0:3, 3],
+                              _log_error(T, T_d))
+        return J, V
+
+    return _IK(error, T_d, theta0, eomg, ev, max_iterations, damping)
+
+
+def manipulability_map_space(S_list: np.array, theta: np.array,
+                             out: typing.Union[np.array, str] = None,
+                             chunk_size: int = 65536) -> np.array:
+    """
+    Evaluates the manipulability of the space Jacobian over many joint
+    configurations. The configurations are processed in chunks of
+    ``chunk_size``, so only one chunk of Jacobians is in memory at a time.
+    Singular configurations are flagged instead of raising, see
+    :py:data:`MANIPULABILITY_DTYPE`.
+
+    Args:
+        S_list: 6 by n array with the space frame screw axes of the joints as
+                columns.
+        theta: K by n array with one joint configuration per row. Can be a
+               memory-mapped array.
+        out: K array of :py:data:`MANIPULABILITY_DTYPE` to write the map
+             into, or path of a ``.npy`` file to create and stream the map
+             into as a memory-mapped array. Optional, if omitted a new array
+             is allocated.
+        chunk_size: Number of configurations to evaluate at once.
+
+    Returns:
+        K array of :py:data:`MANIPULABILITY_DTYPE`, ``out`` (or the memory
+        map of the file) if it was given.
+
+    Example:
+        The UR5 arm is singular in its home configuration, where the axes of
+        its fourth and sixth joint align.
+
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> from modern_robotics.num import kinematics
+            >>> S_list = np.array([[0, 0, 1, 0, 0, 0],
+            ...                    [0, 1, 0, -0.089, 0, 0],
+            ...                    [0, 1, 0, -0.089, 0, 0.425],
+            ...                    [0, 1, 0, -0.089, 0, 0.817],
+            ...                    [0, 0, -1, -0.109, 0.817, 0],
+            ...                    [0, 1, 0, 0.006, 0, 0.817]]).T
+            >>> theta = np.array([[0, 0, 0, 0, 0, 0],
+            ...                   [0, -np.pi/4, np.pi/2, 0, np.pi/2, 0]])
+            >>> m = kinematics.manipulability_map_space(S_list, theta)
+            >>> m['singular']
+            array([ True, False])
+            >>> m['measure'].round(3)
+            array([0.   , 0.085])
+
+    See Also:
+        :py:func:`modern_robotics.num.manipulability`
+        :py:func:`manipulability_map_body`
+    """
+    return _manipulability_map(jacobian_space, S_list, theta, out,
+                               chunk_size)
+
+
+def manipulability_map_body(B_list: np.array, theta: np.array,
+                            out: typing.Union[np.array, str] = None,
+                            chunk_size: int = 65536) -> np.array:
+    """
+    Evaluates the manipulability of the body Jacobian over many joint
+    configurations, see :py:func:`manipulability_map_space`.
+
+    Args:
+        B_list: 6 by n array with the body frame screw axes of the joints as
+                columns.
+        theta: K by n array with one joint configuration per row. Can be a
+               memory-mapped array.
+        out: K array of :py:data:`MANIPULABILITY_DTYPE` to write the map
+             into, or path of a ``.npy`` file to create and stream the map
+             into as a memory-mapped array. Optional, if omitted a new array
+             is allocated.
+        chunk_size: Number of configurations to evaluate at once.
+
+    Returns:
+        K array of :py:data:`MANIPULABILITY_DTYPE`, ``out`` (or the memory
+        map of the file) if it was given.
+
+    See Also:
+        :py:func:`modern_robotics.num.manipulability`
+        :py:func:`manipulability_map_space`
+    """
+    return _manipulability_map(jacobian_body, B_list, theta, out, chunk_size)
+
+
+def _manipulability_map(jacobian: typing.Callable, screw_list: np.array,
+                        theta: np.array, out: typing.Union[np.array, str],
+                        chunk_size: int) -> np.array:
+    """
+    Chunked manipulability map loop, ``jacobian`` maps the screw axes and a
+    chunk of joint configurations to their Jacobians.
+    """
+    K = len(theta)
+    if out is None:
+        out = np.empty(K, dtype=MANIPULABILITY_DTYPE)
+    elif isinstance(out, (str, os.PathLike)):
+        out = np.lib.format.open_memmap(out, mode='w+',
+                                        dtype=MANIPULABILITY_DTYPE,
+                                        shape=(K,))
+
+    for start in range(0, K, chunk_size):
+        J = jacobian(screw_list, theta[start:start + chunk_size])
+        A = J @ np.swapaxes(J, -1, -2)
+
+        # Eigenvalues only, the ellipsoid axes are not needed for the map.
+        w = np.linalg.eigvalsh(A)
+        det = np.prod(w, axis=-1)
+        singular = np.isclose(det, 0)
+        if profiling.active is not None:
+            profiling.active.count(
+                'num.kinematics.manipulability_map.singular', singular)
+
+        chunk = out[start:start + chunk_size]
+        chunk['measure'] = np.sqrt(np.maximum(det, 0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            chunk['condition'] = np.where(singular, np.nan,
+                                          w[:, -1] / w[:, 0])
+        chunk['singular'] = singular
+
+    if isinstance(out, np.memmap):
+        out.flush()
+
+    return out
+
+
+def _IK(error: typing.Callable, T_d: np.array, theta0: np.array,
+        eomg: float, ev: float, max_iterations: int, damping: float) \
+        -> IKResult:
+    """
+    Batched damped least squares Newton-Raphson loop. ``error`` maps a stack
+    of joint positions and targets to the Jacobians and error twists.
+    """
+    T_d = np.asarray(T_d)
+    theta0 = np.asarray(theta0)
+    n = theta0.shape[-1]
+    shape = np.broadcast(T_d[..., 0, 0], theta0[..., 0]).shape
+
+    # Work on flat copies of the batch, so that the active problems can be
+    # selected with a single index array.
+    theta = np.array(np.broadcast_to(theta0, shape + (n,)),
+                     dtype=mr._float_dtype(theta0, T_d)).reshape(-1, n)
+    T_d = np.broadcast_to(T_d, shape + (4, 4)).reshape(-1, 4, 4)
+    K = theta.shape[0]
+
+    success = np.zeros(K, dtype=bool)
+    iterations = np.zeros(K, dtype=int)
+    err_omega = np.zeros(K)
+    err_v = np.zeros(K)
+
+    active = np.arange(K)
+    for i in range(max_iterations + 1):
+        J, V = error(theta[active], T_d[active])
+        err_omega[active] = np.linalg.norm(V[:, 0:3], axis=-1)
+        err_v[active] = np.linalg.norm(V[:, 3:6], axis=-1)
+
+        converged = (err_omega[active] <= eomg) & (err_v[active] <= ev)
+        success[active[converged]] = True
+        if i == max_iterations or np.all(converged):
+            break
+
+        active = active[~converged]
+        J = J[~converged]
+        V = V[~converged, :, np.newaxis]
+
+        # Solve the damped normal equations in whichever space is smaller,
+        # both forms give the same step.
+        J_T = np.swapaxes(J, -1, -2)
+        if n <= 6:
+            A = J_T @ J + damping**2 * np.eye(n, dtype=J.dtype)
+            d_theta = np.linalg.solve(A, J_T @ V)
+        else:
+            A = J @ J_T + damping**2 * np.eye(6, dtype=J.dtype)
+            d_theta = J_T @ np.linalg.solve(A, V)
+
+        theta[active] += d_theta[..., 0]
+        iterations[active] += 1
+
+    return IKResult(theta.reshape(shape + (n,)), success.reshape(shape),
+                    iterations.reshape(shape), err_omega.reshape(shape),
+                    err_v.reshape(shape))
+
+
+def _log_error(T: np.array, T_d: np.array) -> np.array:
+    """
+    Body frame error twists that move the stack of poses T to T_d. Poses that
+    already coincide give a zero twist instead of NaN.
+    """
+    return mr.SE3_to_vec(mr.inv_SE3(T) @ T_d, robust=True)
+
+
+def _FK_jacobian_space(S_list: np.array, theta: np.array) -> tuple:
+    """
+    Product of all exponentials and the space Jacobian, from a single set of
+    prefix products.
+    """
+    S_list = np.asarray(S_list)
+    P = _prefix_products(S_list, theta)
+
+    J = np.empty(P.shape[:-2] + (6,), dtype=P.dtype)
+    J[..., 0, :] = S_list[:, 0]
+    J[..., 1:, :] = mr._adjoint_apply(P[..., :-1, 0:3, 0:3],
+                                      P[..., :-1, 0:3, 3], S_list[:, 1:].T)
+
+    return P[..., -1, :, :], np.swapaxes(J, -1, -2)
+
+
+def _FK_jacobian_body(B_list: np.array, theta: np.array) -> tuple:
+    """
+    Product of all exponentials and the body Jacobian, from a single set of
+    suffix products.
+    """
+    B_list = np.asarray(B_list)
+    P = _suffix_products(B_list, theta)
+
+    J = np.empty(P.shape[:-2] + (6,), dtype=P.dtype)
+    J[..., -1, :] = B_list[:, -1]
+    J[..., :-1, :] = _adjoint_inv_apply(P[..., 1:, :, :], B_list[:, :-1].T)
+
+    return P[..., 0, :, :], np.swapaxes(J, -1, -2)
+
+
+def _prefix_products(S_list: np.array, theta: np.array) -> np.array:
+    """
+    Computes the running products
+    :math:`e^{\\TildeSkew{\\Screw}_1\\theta_1} \\cdots
+    e^{\\TildeSkew{\\Screw}_i\\theta_i}` for i = 1 ... n, stacked along the
+    third to last axis.
+    """
+    T = mr.vec_to_SE3(np.asarray(S_list).T, theta)
+
+    # The loop runs over the joints only, all configurations are handled by
+    # each matrix product at once.
+    for i in range(1, T.shape[-3]):
+        np.matmul(T[..., i - 1, :, :], T[..., i, :, :], out=T[..., i, :, :])
+
+    return T
+
+
+def _suffix_products(B_list: np.array, theta: np.array) -> np.array:
+    """
+    Computes the running products
+    :math:`e^{\\TildeSkew{\\BodyScrew}_i\\theta_i} \\cdots
+    e^{\\TildeSkew{\\BodyScrew}_n\\theta_n}` for i = 1 ... n, stacked along
+    the third to last axis.
+    """
+    T = mr.vec_to_SE3(np.asarray(B_list).T, theta)
+
+    for i in range(T.shape[-3] - 2, -1, -1):
+        np.matmul(T[..., i, :, :], T[..., i + 1, :, :], out=T[..., i, :, :])
+
+    return T
+
+
+def _adjoint_inv_apply(T: np.array, V: np.array) -> np.array:
+    """
+    Computes :math:`\\Adjoint{T^{-1}} V` for stacks of transformation
+    matrices and twists (stacked along the last axis), without inverting T.
+    """
+    R_T = np.swapaxes(T[..., 0:3, 0:3], -1, -2)
+    p = T[..., 0:3, 3]
+    omega = V[..., 0:3]
+    v = V[..., 3:6] - np.cross(p, omega)
+
+    return np.concatenate(((R_T @ omega[..., np.newaxis])[..., 0],
+                           (R_T @ v[..., np.newaxis])[..., 0]), axis=-1)
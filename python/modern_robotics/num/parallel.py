@@ -0,0 +1,289 @@
+"""
+.. rubric:: ``modern_robotics.num.parallel``
+
+This submodule evaluates batched functions on a pool of processes, for
+workloads that are too large for a single core, e.g. reachability studies
+over millions of target poses.
+
+The inputs are split along their first axis into chunks, and every chunk is
+evaluated by one of the processes. Inputs and outputs are exchanged through
+:py:mod:`multiprocessing.shared_memory` instead of being pickled, only the
+function and the chunk bounds are sent to the processes. The results are
+written into place, so they are in the same order as the inputs.
+
+The function has to be picklable, i.e. defined at module level, and has to
+accept stacks and return a stack (or a tuple of stacks) with one entry per
+input row. Fixed arguments, such as the screw axes of a robot, can be bound
+with :py:func:`functools.partial`:
+
+.. code-block:: python
+
+    import functools
+    from modern_robotics.num import kinematics, parallel
+
+    with parallel.Executor(processes=4) as executor:
+        result = executor.map_batch(
+            functools.partial(kinematics.IK_space, S_list, M), T_d, theta0)
+
+"""
+
+import math
+import multiprocessing.pool
+import os
+import time
+import typing
+import weakref
+from multiprocessing import shared_memory
+import numpy as np
+
+#: Smallest number of rows per chunk, when the chunk size is not given.
+MIN_CHUNK_SIZE = 1024
+
+#: Number of chunks per process, when the chunk size is not given. More than
+#: one chunk per process balances the load if chunks take different times.
+CHUNKS_PER_PROCESS = 4
+
+
+class Executor:
+    """
+    Pool of processes that evaluates batched functions on chunks of their
+    inputs. The pool is started on first use, and stopped by :py:meth:`close`
+    or when leaving the ``with`` block.
+
+    Args:
+        processes: Number of processes. Defaults to the number of cores.
+        chunk_size: Number of rows per chunk. Defaults to an even split into
+                    :py:data:`CHUNKS_PER_PROCESS` chunks per process, of at
+                    least :py:data:`MIN_CHUNK_SIZE` rows, see also
+                    :py:meth:`tune_chunk_size`.
+    """
+
+    def __init__(self, processes: int = None, chunk_size: int = None):
+        self.processes = processes or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._pool = None
+        self._finalizer = None
+
+    def __enter__(self) -> 'Executor':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Stops the processes of the pool.
+        """
+        if self._finalizer is not None:
+            self._finalizer()
+        self._pool = None
+        self._finalizer = None
+
+    def map_batch(self, function: typing.Callable, *arrays: np.array,
+                  chunk_size: int = None) \
+            -> typing.Union[np.array, tuple]:
+        """
+        Evaluates ``function(*arrays)`` in chunks along the first axis of the
+        arrays, distributed over the processes of the pool.
+
+        Batches that fit in a single chunk, and executors with a single
+        process, evaluate the function in the calling process.
+
+        Args:
+            function: Picklable function of stacks, returning a stack or a
+                      tuple (e.g. a named tuple) of stacks with one entry per
+                      input row.
+            arrays: Input stacks, all with the same length.
+            chunk_size: Number of rows per chunk. Defaults to the chunk size
+                        of the executor.
+
+        Returns:
+            Same as ``function(*arrays)``.
+
+        Raises:
+            ValueError: If the arrays have different lengths, or the results
+                        of the function have no leading batch axis.
+        """
+        arrays = [np.asarray(a) for a in arrays]
+        K = _batch_length(arrays)
+        chunk_size = chunk_size or self.chunk_size \
+            or self._default_chunk_size(K)
+
+        if self.processes == 1 or K <= chunk_size:
+            return function(*arrays)
+
+        # The layout of the results is taken from the first row.
+        sample = function(*(a[:1] for a in arrays))
+        samples = _as_tuple(sample)
+        for s in samples:
+            if np.ndim(s) == 0 or len(s) != 1:
+                raise ValueError('function has to return stacks with one '
+                                 'entry per input row')
+
+        blocks = []
+        try:
+            inputs = [_share(a.shape, a.dtype, blocks, a) for a in arrays]
+            outputs = [_share((K,) + np.shape(s)[1:], np.asarray(s).dtype,
+                              blocks) for s in samples]
+
+            tasks = [(function, inputs, outputs, start,
+                      min(start + chunk_size, K))
+                     for start in range(0, K, chunk_size)]
+            self._start().starmap(_evaluate_chunk, tasks, chunksize=1)
+
+            # Copied out, so that the shared memory can be released.
+            results = [_view(spec, block).copy()
+                       for spec, block in zip(outputs, blocks[len(inputs):])]
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        if isinstance(sample, tuple):
+            return type(sample)(*results) if hasattr(sample, '_fields') \
+                else tuple(results)
+
+        return results[0]
+
+    def tune_chunk_size(self, function: typing.Callable, *arrays: np.array,
+                        candidates: typing.Sequence[int] = None,
+                        repeat: int = 3) -> int:
+        """
+        Times :py:meth:`map_batch` with several chunk sizes, and keeps the
+        fastest as chunk size of the executor. The arrays should be a
+        representative sample of the workload, large enough for a couple of
+        chunks per process.
+
+        Args:
+            function: Function to evaluate, see :py:meth:`map_batch`.
+            arrays: Input stacks, all with the same length.
+            candidates: Chunk sizes to try. Defaults to powers of 4 from 256
+                        up to an even split over the processes.
+            repeat: Number of timings per chunk size, the fastest counts.
+
+        Returns:
+            Fastest chunk size.
+        """
+        arrays = [np.asarray(a) for a in arrays]
+        K = _batch_length(arrays)
+
+        if candidates is None:
+            largest = max(math.ceil(K / self.processes), 1)
+            candidates = [4**k for k in range(4, 16) if 4**k < largest] \
+                + [largest]
+
+        timings = []
+        for chunk_size in candidates:
+            best = math.inf
+            for _ in range(repeat):
+                start = time.perf_counter()
+                self.map_batch(function, *arrays, chunk_size=chunk_size)
+                best = min(best, time.perf_counter() - start)
+            timings.append(best)
+
+        self.chunk_size = candidates[int(np.argmin(timings))]
+
+        return self.chunk_size
+
+    def _default_chunk_size(self, K: int) -> int:
+        return max(MIN_CHUNK_SIZE,
+                   math.ceil(K / (CHUNKS_PER_PROCESS * self.processes)))
+
+    def _start(self) -> multiprocessing.pool.Pool:
+        if self._pool is None:
+            self._pool = multiprocessing.get_context().Pool(self.processes)
+            # Also stops the processes if the executor is never closed.
+            self._finalizer = weakref.finalize(self, self._pool.terminate)
+
+        return self._pool
+
+
+def map_batch(function: typing.Callable, *arrays: np.array,
+              processes: int = None, chunk_size: int = None) \
+        -> typing.Union[np.array, tuple]:
+    """
+    Evaluates ``function(*arrays)`` in chunks on a temporary pool of
+    processes, see :py:meth:`Executor.map_batch`. Use an :py:class:`Executor`
+    to reuse the pool for several calls.
+
+    Args:
+        function: Picklable function of stacks, returning a stack or a tuple
+                  of stacks with one entry per input row.
+        arrays: Input stacks, all with the same length.
+        processes: Number of processes. Defaults to the number of cores.
+        chunk_size: Number of rows per chunk, see :py:class:`Executor`.
+
+    Returns:
+        Same as ``function(*arrays)``.
+    """
+    with Executor(processes, chunk_size) as executor:
+        return executor.map_batch(function, *arrays)
+
+
+def _batch_length(arrays: typing.Sequence[np.array]) -> int:
+    """
+    Common length of the input stacks.
+    """
+    if not arrays or any(a.ndim == 0 for a in arrays):
+        raise ValueError('Expected at least one input stack')
+    K = len(arrays[0])
+    if any(len(a) != K for a in arrays):
+        raise ValueError('All input stacks need to have the same length, got '
+                         f'{[len(a) for a in arrays]}')
+
+    return K
+
+
+def _share(shape: tuple, dtype: np.dtype, blocks: list,
+           a: np.array = None) -> tuple:
+    """
+    Allocates a block of shared memory for an array of shape and dtype,
+    appends it to blocks and copies a into it, if given. Returns the spec that
+    processes use to attach to the array.
+    """
+    dtype = np.dtype(dtype)
+    block = shared_memory.SharedMemory(
+        create=True, size=max(math.prod(shape) * dtype.itemsize, 1))
+    blocks.append(block)
+    spec = (block.name, shape, dtype.str)
+    if a is not None:
+        _view(spec, block)[...] = a
+
+    return spec
+
+
+def _view(spec: tuple, block: shared_memory.SharedMemory) -> np.array:
+    """
+    Array in a block of shared memory.
+    """
+    _, shape, dtype = spec
+    return np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _evaluate_chunk(function: typing.Callable, inputs: list, outputs: list,
+                    start: int, stop: int):
+    """
+    Evaluates function on rows start to stop of the shared inputs, and writes
+    the results into the shared outputs. Runs in the processes of the pool.
+    """
+    blocks = [shared_memory.SharedMemory(name=spec[0])
+              for spec in inputs + outputs]
+    try:
+        arrays = [_view(spec, block)[start:stop]
+                  for spec, block in zip(inputs, blocks)]
+        results = _as_tuple(function(*arrays))
+        for spec, block, result in zip(outputs, blocks[len(inputs):],
+                                       results):
+            _view(spec, block)[start:stop] = result
+        # The views have to be released before the blocks can be closed.
+        del arrays, results
+    finally:
+        for block in blocks:
+            block.close()
+
+
+def _as_tuple(result: typing.Union[np.array, tuple]) -> tuple:
+    """
+    Results of a function as tuple, also if it returns a single array.
+    """
+    return tuple(result) if isinstance(result, tuple) else (result,)
@@ -0,0 +1,210 @@
+"""
+.. rubric:: ``modern_robotics.num.pose``
+
+This submodule contains a lightweight pose type, :py:class:`SE3`. It stores a
+homogeneous transformation matrix in a single 4 by 4 array, with the rotation
+matrix and displacement vector as views into that array. All operations can
+write their result into an existing pose with the ``out`` argument, so
+chained operations in a control loop can reuse the same buffers instead of
+allocating new arrays on every call.
+
+An :py:class:`SE3` converts to a plain 4 by 4 array with ``np.asarray``, so it
+can be passed to the functions in :py:mod:`modern_robotics.num` directly.
+
+"""
+
+import numpy as np
+import modern_robotics.num as mr
+
+
+class SE3:
+    """
+    Pose :math:`\\HomogeneousTransformationMatrix \\in \\SEthree`, backed by
+    a 4 by 4 array.
+
+    Args:
+        matrix: 4 by 4 homogeneous transformation matrix to initialize the
+                pose with. Optional, defaults to identity.
+        buffer: Preallocated 4 by 4 float array to use as storage. Optional,
+                if omitted a new array is allocated, with the precision of
+                ``matrix`` (float64 by default). The last row of the buffer is
+                (re)set to ``[0, 0, 0, 1]``.
+
+    Example:
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> import modern_robotics.num as mr
+            >>> from modern_robotics.num.pose import SE3
+            >>> a = SE3(mr.gen.TRz(np.pi/2))
+            >>> b = SE3.from_R_p(np.eye(3), np.array([[1], [0], [0]]))
+            >>> c = SE3()
+            >>> a.compose(b, out=c).p.round(3)
+            array([[0.],
+                   [1.],
+                   [0.]])
+    """
+
+    __slots__ = ('matrix', 'R', 'p')
+
+    def __init__(self, matrix: np.array = None, buffer: np.array = None):
+        if buffer is None:
+            buffer = np.eye(4, dtype=mr._float_dtype(matrix))
+        elif buffer.shape != (4, 4):
+            raise ValueError('Buffer should be a 4 by 4 array')
+        else:
+            buffer[3] = (0, 0, 0, 1)
+
+        if matrix is not None:
+            buffer[0:3] = np.asarray(matrix)[0:3]
+
+        #: 4 by 4 homogeneous transformation matrix.
+        self.matrix = buffer
+        #: 3 by 3 rotation matrix, a view into :py:attr:`matrix`.
+        self.R = buffer[0:3, 0:3]
+        #: 3 by 1 displacement vector, a view into :py:attr:`matrix`.
+        self.p = buffer[0:3, 3:4]
+
+    @classmethod
+    def from_R_p(cls, R: np.array, p: np.array) -> 'SE3':
+        """
+        Constructs a pose from a rotation matrix and displacement vector.
+
+        Args:
+            R: 3 by 3 rotation matrix :math:`\\RotationMatrix\\in\\SOthree`
+            p: 3 by 1 displacement vector
+
+        Returns:
+            New pose.
+        """
+        pose = cls(buffer=np.empty((4, 4), dtype=mr._float_dtype(R, p)))
+        pose.R[...] = R
+        pose.p[...] = np.reshape(p, (3, 1))
+
+        return pose
+
+    @classmethod
+    def exp(cls, S: np.array, theta: float, out: 'SE3' = None) -> 'SE3':
+        """
+        Pose reached by moving along the screw axis S, see
+        :py:func:`modern_robotics.num.vec_to_SE3`.
+
+        Args:
+            S: 6 vector velocity twist
+            theta: Distance travelled along the velocity twist screw axis
+            out: Pose to write the result into. Optional, if omitted a new
+                 pose is created.
+
+        Returns:
+            The resulting pose, ``out`` if it was given.
+        """
+        if out is None:
+            out = cls(buffer=np.empty((4, 4),
+                                      dtype=mr._float_dtype(S, theta)))
+        mr.vec_to_SE3(S, theta, out=out.matrix)
+
+        return out
+
+    def log(self) -> np.array:
+        """
+        Twist that reaches this pose in unit time, see
+        :py:func:`modern_robotics.num.SE3_to_vec` in robust mode, so that the
+        identity gives a zero twist.
+
+        Returns:
+            6 by 1 velocity twist vector :math:`\\Twist` with length
+            :math:`\\theta`.
+        """
+        return mr.SE3_to_vec(self.matrix, robust=True)
+
+    def compose(self, other: 'SE3', out: 'SE3' = None) -> 'SE3':
+        """
+        Composes this pose with another, i.e. computes
+        :math:`\\HomogeneousTransformationMatrix_{self}
+        \\HomogeneousTransformationMatrix_{other}`.
+
+        Args:
+            other: Pose to compose with, on the right.
+            out: Pose to write the result into. Optional, if omitted a new
+                 pose is created. Can be ``self`` or ``other``.
+
+        Returns:
+            The composed pose, ``out`` if it was given.
+        """
+        if out is None:
+            out = SE3(buffer=np.empty((4, 4), dtype=np.result_type(
+                self.matrix, other.matrix)))
+        np.matmul(self.matrix, other.matrix, out=out.matrix)
+
+        return out
+
+    def inv(self, out: 'SE3' = None) -> 'SE3':
+        """
+        Inverts the pose, see :py:func:`modern_robotics.num.inv_SE3`.
+
+        Args:
+            out: Pose to write the result into. Optional, if omitted a new
+                 pose is created. Can be ``self`` to invert in place.
+
+        Returns:
+            The inverted pose, ``out`` if it was given.
+        """
+        if out is None:
+            out = SE3(buffer=np.empty_like(self.matrix))
+        mr.inv_SE3(self.matrix, out=out.matrix)
+
+        return out
+
+    def adjoint(self, out: np.array = None) -> np.array:
+        """
+        Constructs the 'big adjoint' form of the pose, see
+        :py:func:`modern_robotics.num.big_adjoint`.
+
+        Args:
+            out: 6 by 6 array to write the result into. Optional, if omitted
+                 a new array is allocated.
+
+        Returns:
+            6 by 6 'big adjoint' matrix, ``out`` if it was given.
+        """
+        return mr.big_adjoint(self.matrix, out=out)
+
+    def transform(self, points: np.array, out: np.array = None) -> np.array:
+        """
+        Transforms points, i.e. computes
+        :math:`\\RotationMatrix x + p` for every point :math:`x`.
+
+        Args:
+            points: 3 by N array with one point per column.
+            out: 3 by N array to write the result into. Optional, if omitted
+                 a new array is allocated.
+
+        Returns:
+            3 by N array with the transformed points, ``out`` if it was given.
+        """
+        out = np.matmul(self.R, points, out=out)
+        out += self.p
+
+        return out
+
+    def copy(self) -> 'SE3':
+        """
+        Returns:
+            Copy of this pose with its own storage.
+        """
+        return SE3(self.matrix)
+
+    def __matmul__(self, other):
+        if isinstance(other, SE3):
+            return self.compose(other)
+
+        return self.matrix @ other
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None or dtype == self.matrix.dtype:
+            return self.matrix.copy() if copy else self.matrix
+
+        return self.matrix.astype(dtype)
+
+    def __repr__(self):
+        return f'SE3({np.array2string(self.matrix, prefix="SE3(")})'
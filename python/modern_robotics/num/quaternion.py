@@ -0,0 +1,601 @@
+"""
+.. rubric:: ``modern_robotics.num.quaternion``
+
+This submodule contains unit quaternions for rotations and unit dual
+quaternions for rigid body motions, as a compact alternative to rotation and
+homogeneous transformation matrices. A quaternion takes 4 numbers instead of
+the 9 of a rotation matrix, and a chain of products that drifted off unit
+length is repaired with a single normalization, see :py:func:`normalize` and
+:py:func:`dual_normalize`. The products are written out component by
+component; for large stacks they are still slower than the batched matrix
+products of numpy, so the gain is in memory and robustness, not speed.
+
+A quaternion :math:`q = w + x i + y j + z k` is stored as an array with the
+components :math:`(w, x, y, z)` along the last axis, so a stack of N
+quaternions is an N by 4 array. A dual quaternion
+:math:`Q = q_r + \\varepsilon q_d` is stored as the 8 components of its real
+part :math:`q_r` (the rotation) followed by those of its dual part
+:math:`q_d = \\frac{1}{2} p q_r` (with the displacement :math:`p` as pure
+quaternion). All functions broadcast over the leading axes.
+
+Conversions to and from the existing formats are exact up to rounding:
+:py:func:`from_SO3` and :py:func:`to_SO3` for rotation matrices,
+:py:func:`exp` and :py:func:`log` for angular velocity vectors,
+:py:func:`dual_from_SE3` and :py:func:`dual_to_SE3` for transformation
+matrices, and :py:func:`dual_exp` and :py:func:`dual_log` for twists.
+
+"""
+
+import typing
+import numpy as np
+import modern_robotics.num as mr
+
+
+def mul(q: np.array, p: np.array, out: np.array = None) -> np.array:
+    """
+    Hamilton product :math:`q p` of two quaternions, i.e. the rotation
+    :math:`p` followed by :math:`q` in the fixed frame.
+
+    Args:
+        q: Quaternion, or N by 4 array of quaternions.
+        p: Quaternion, or N by 4 array of quaternions.
+        out: Array to write the result into. Optional, if omitted a new array
+             is allocated.
+
+    Returns:
+        Product quaternion, or N by 4 array of them.
+
+    Example:
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> from modern_robotics.num import quaternion
+            >>> q = quaternion.exp(np.array([[0], [0], [1]]), np.pi/2)
+            >>> quaternion.mul(q, q).round(3)
+            array([0., 0., 0., 1.])
+    """
+    return _product(_hamilton, q, p, out)
+
+
+def conjugate(q: np.array) -> np.array:
+    """
+    Conjugate :math:`q^*` of a quaternion, which is its inverse if it has
+    unit length.
+
+    Args:
+        q: Quaternion, or N by 4 array of quaternions.
+
+    Returns:
+        Conjugate quaternion, or N by 4 array of them.
+    """
+    q = np.asarray(q)
+    q = q.astype(mr._float_dtype(q), copy=True)
+    q[..., 1:] *= -1
+
+    return q
+
+
+def inverse(q: np.array) -> np.array:
+    """
+    Inverse :math:`q^{-1} = q^* / |q|^2` of a quaternion.
+
+    Args:
+        q: Quaternion, or N by 4 array of quaternions, not zero.
+
+    Returns:
+        Inverse quaternion, or N by 4 array of them.
+
+    See Also:
+        :py:func:`conjugate`
+    """
+    q = conjugate(q)
+
+    return q / np.sum(q**2, axis=-1, keepdims=True)
+
+
+def normalize(q: np.array) -> np.array:
+    """
+    Scales a quaternion to unit length, e.g. to remove the drift accumulated
+    in a long chain of products.
+
+    Args:
+        q: Quaternion, or N by 4 array of quaternions, not zero.
+
+    Returns:
+        Unit quaternion, or N by 4 array of them.
+    """
+    q = np.asarray(q)
+
+    return q / np.linalg.norm(q, axis=-1, keepdims=True)
+
+
+def exp(omega: np.array, theta: float = None) -> np.array:
+    """
+    'Integration' of an angular velocity to the unit quaternion of the
+    orientation that it reaches in unit time, the quaternion counterpart of
+    :py:func:`modern_robotics.num.vec_to_SO3`.
+
+    .. math::
+
+        q = \\cos\\frac{\\theta}{2} +
+        \\UnitLength{\\omega} \\sin\\frac{\\theta}{2}
+
+    Args:
+        omega: 3 vector angular velocity, or N by 3 array with one angular
+               velocity per row. Can be unit length, in that case theta
+               should also be provided.
+        theta: If omitted, the Euclidean norm of omega is assumed to be theta.
+               Can be an array of N angles.
+
+    Returns:
+        Unit quaternion, or N by 4 array of them.
+
+    See Also:
+        :py:func:`log`
+    """
+    dtype = mr._float_dtype(omega, theta)
+    phi = mr._as_vectors(omega, 3).astype(dtype, copy=False)
+    if theta is not None:
+        phi = phi * np.asarray(theta, dtype=dtype)[..., np.newaxis]
+
+    angle = np.linalg.norm(phi, axis=-1)
+
+    q = np.empty(angle.shape + (4,), dtype=dtype)
+    q[..., 0] = np.cos(angle / 2)
+    # sin(angle/2) / angle, which is 1/2 in the limit of a zero angle.
+    q[..., 1:] = phi * (np.sinc(angle / (2 * np.pi)) / 2)[..., np.newaxis]
+
+    return q
+
+
+def log(q: np.array) -> np.array:
+    """
+    'Differentiation' of a unit quaternion to the angular velocity that
+    reaches its orientation in unit time, the quaternion counterpart of
+    :py:func:`modern_robotics.num.SO3_to_vec`. Of :math:`q` and :math:`-q`,
+    which represent the same orientation, the shortest rotation is returned,
+    so :math:`\\theta \\in [0, \\pi]`.
+
+    Unlike the matrix logarithm this needs no special cases, the angular
+    velocity of the identity is zero.
+
+    Args:
+        q: Unit quaternion, or N by 4 array of them.
+
+    Returns:
+        Angular velocity vector :math:`\\omega` with length :math:`\\theta`,
+        or N by 3 array with one angular velocity per row if a stack was
+        given.
+
+    See Also:
+        :py:func:`exp`
+    """
+    q = np.asarray(q)
+    omega = _log(q)
+
+    if q.ndim == 1:
+        return omega[:, np.newaxis]
+
+    return omega
+
+
+def from_SO3(R: np.array) -> np.array:
+    """
+    Converts a rotation matrix to a unit quaternion, with a non-negative
+    :math:`w` component.
+
+    The components are taken from the row of :math:`4 q q^\\Transposed` with
+    the largest diagonal element, which keeps the conversion accurate for
+    every rotation angle.
+
+    Args:
+        R: 3 by 3 rotation matrix :math:`\\RotationMatrix \\in \\SOthree`, or
+           N by 3 by 3 array of rotation matrices.
+
+    Returns:
+        Unit quaternion, or N by 4 array of them.
+
+    See Also:
+        :py:func:`to_SO3`
+    """
+    R = np.asarray(R)
+    R = R.astype(mr._float_dtype(R), copy=False)
+    r00, r01, r02 = R[..., 0, 0], R[..., 0, 1], R[..., 0, 2]
+    r10, r11, r12 = R[..., 1, 0], R[..., 1, 1], R[..., 1, 2]
+    r20, r21, r22 = R[..., 2, 0], R[..., 2, 1], R[..., 2, 2]
+
+    # K = 4 q q^T, written in terms of R.
+    K = np.empty(R.shape[:-2] + (4, 4), dtype=R.dtype)
+    K[..., 0, 0] = 1 + r00 + r11 + r22
+    K[..., 1, 1] = 1 + r00 - r11 - r22
+    K[..., 2, 2] = 1 - r00 + r11 - r22
+    K[..., 3, 3] = 1 - r00 - r11 + r22
+    K[..., 0, 1] = K[..., 1, 0] = r21 - r12
+    K[..., 0, 2] = K[..., 2, 0] = r02 - r20
+    K[..., 0, 3] = K[..., 3, 0] = r10 - r01
+    K[..., 1, 2] = K[..., 2, 1] = r01 + r10
+    K[..., 1, 3] = K[..., 3, 1] = r02 + r20
+    K[..., 2, 3] = K[..., 3, 2] = r12 + r21
+
+    k = np.argmax(np.diagonal(K, axis1=-2, axis2=-1), axis=-1)
+    row = np.take_along_axis(K, k[..., np.newaxis, np.newaxis], axis=-2)
+    row = row[..., 0, :]
+    K_kk = np.take_along_axis(row, k[..., np.newaxis], axis=-1)
+    q = row / (2 * np.sqrt(K_kk))
+
+    return np.where(q[..., 0:1] < 0, -q, q)
+
+
+def to_SO3(q: np.array, out: np.array = None) -> np.array:
+    """
+    Converts a unit quaternion to a rotation matrix.
+
+    Args:
+        q: Unit quaternion, or N by 4 array of them.
+        out: 3 by 3 (or N by 3 by 3) array to write the result into.
+             Optional, if omitted a new array is allocated.
+
+    Returns:
+        3 by 3 rotation matrix :math:`\\RotationMatrix \\in \\SOthree`, or N by
+        3 by 3 array of rotation matrices if a stack was given.
+
+    See Also:
+        :py:func:`from_SO3`
+    """
+    q = np.asarray(q)
+    if out is None:
+        out = np.empty(q.shape[:-1] + (3, 3), dtype=mr._float_dtype(q))
+
+    w, x, y, z = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+    xx, yy, zz = x * x, y * y, z * z
+    xy, xz, yz = x * y, x * z, y * z
+    wx, wy, wz = w * x, w * y, w * z
+
+    out[..., 0, 0] = 1 - 2 * (yy + zz)
+    out[..., 0, 1] = 2 * (xy - wz)
+    out[..., 0, 2] = 2 * (xz + wy)
+    out[..., 1, 0] = 2 * (xy + wz)
+    out[..., 1, 1] = 1 - 2 * (xx + zz)
+    out[..., 1, 2] = 2 * (yz - wx)
+    out[..., 2, 0] = 2 * (xz - wy)
+    out[..., 2, 1] = 2 * (yz + wx)
+    out[..., 2, 2] = 1 - 2 * (xx + yy)
+
+    return out
+
+
+def slerp(q_start: np.array, q_end: np.array, s: float) -> np.array:
+    """
+    Spherical linear interpolation between two unit quaternions, along the
+    shortest rotation.
+
+    .. math::
+
+        q(s) = q_{start} \\exp(s \\log(q_{start}^* q_{end}))
+
+    Args:
+        q_start: Unit quaternion at :math:`s = 0`, or N by 4 array of them.
+        q_end: Unit quaternion at :math:`s = 1`, or N by 4 array of them.
+        s: Path parameter, or array of N path parameters, usually in
+           :math:`[0, 1]`.
+
+    Returns:
+        Interpolated unit quaternion, or N by 4 array of them.
+
+    Example:
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> from modern_robotics.num import quaternion
+            >>> q_end = quaternion.exp(np.array([[0], [0], [1]]), np.pi/2)
+            >>> q = quaternion.slerp(np.array([1, 0, 0, 0]), q_end,
+            ...                      np.linspace(0, 1, 3))
+            >>> quaternion.log(q).round(3)
+            array([[0.   , 0.   , 0.   ],
+                   [0.   , 0.   , 0.785],
+                   [0.   , 0.   , 1.571]])
+    """
+    omega = _log(mul(conjugate(q_start), q_end))
+
+    return mul(q_start, exp(omega, s))
+
+
+def dual_mul(A: np.array, B: np.array, out: np.array = None) -> np.array:
+    """
+    Product :math:`A B` of two dual quaternions, the counterpart of the
+    product of two transformation matrices.
+
+    .. math::
+
+        A B = a_r b_r + \\varepsilon (a_r b_d + a_d b_r)
+
+    Args:
+        A: Dual quaternion, or N by 8 array of dual quaternions.
+        B: Dual quaternion, or N by 8 array of dual quaternions.
+        out: Array to write the result into. Optional, if omitted a new array
+             is allocated.
+
+    Returns:
+        Product dual quaternion, or N by 8 array of them.
+    """
+    return _product(_dual_hamilton, A, B, out)
+
+
+def dual_inverse(Q: np.array) -> np.array:
+    """
+    Inverse of a unit dual quaternion, the counterpart of
+    :py:func:`modern_robotics.num.inv_SE3`. It is the quaternion conjugate of
+    both parts.
+
+    Args:
+        Q: Unit dual quaternion, or N by 8 array of them.
+
+    Returns:
+        Inverse dual quaternion, or N by 8 array of them.
+    """
+    Q = np.asarray(Q)
+    Q = Q.astype(mr._float_dtype(Q), copy=True)
+    Q[..., 1:4] *= -1
+    Q[..., 5:8] *= -1
+
+    return Q
+
+
+def dual_normalize(Q: np.array) -> np.array:
+    """
+    Projects a dual quaternion onto the unit dual quaternions, e.g. to remove
+    the drift accumulated in a long chain of products. The real part is
+    scaled to unit length and the dual part made orthogonal to it.
+
+    Args:
+        Q: Dual quaternion with a non-zero real part, or N by 8 array of
+           them.
+
+    Returns:
+        Unit dual quaternion, or N by 8 array of them.
+    """
+    Q = np.asarray(Q)
+    norm = np.linalg.norm(Q[..., 0:4], axis=-1, keepdims=True)
+    Q = Q / norm
+    q_r, q_d = Q[..., 0:4], Q[..., 4:8]
+    q_d -= q_r * np.sum(q_r * q_d, axis=-1, keepdims=True)
+
+    return Q
+
+
+def dual_from_SE3(T: np.array) -> np.array:
+    """
+    Converts a transformation matrix to a unit dual quaternion.
+
+    Args:
+        T: Homogeneous transformation matrix, or N by 4 by 4 array of
+           homogeneous transformation matrices.
+
+    Returns:
+        Unit dual quaternion, or N by 8 array of them.
+
+    See Also:
+        :py:func:`dual_to_SE3`
+    """
+    T = np.asarray(T)
+    q_r = from_SO3(T[..., 0:3, 0:3])
+
+    return np.concatenate((q_r, _dual_part(T[..., 0:3, 3], q_r)), axis=-1)
+
+
+def dual_to_SE3(Q: np.array, out: np.array = None) -> np.array:
+    """
+    Converts a unit dual quaternion to a transformation matrix.
+
+    Args:
+        Q: Unit dual quaternion, or N by 8 array of them.
+        out: 4 by 4 (or N by 4 by 4) array to write the result into.
+             Optional, if omitted a new array is allocated.
+
+    Returns:
+        4 by 4 homogeneous transformation matrix
+        :math:`\\HomogeneousTransformationMatrix \\in \\SEthree`, or N by 4 by
+        4 array of transformation matrices if a stack was given.
+
+    See Also:
+        :py:func:`dual_from_SE3`
+    """
+    Q = np.asarray(Q)
+    if out is None:
+        out = np.empty(Q.shape[:-1] + (4, 4), dtype=mr._float_dtype(Q))
+
+    to_SO3(Q[..., 0:4], out=out[..., 0:3, 0:3])
+    out[..., 0:3, 3] = _displacement(Q)
+    out[..., 3, 0:3] = 0
+    out[..., 3, 3] = 1
+
+    return out
+
+
+def dual_exp(S: np.array, theta: float) -> np.array:
+    """
+    'Integration' of a velocity twist to the unit dual quaternion of the
+    configuration that it reaches in unit time, the dual quaternion
+    counterpart of :py:func:`modern_robotics.num.vec_to_SE3`.
+
+    Args:
+        S: 6 vector velocity twist, or N by 6 array with one twist per row.
+        theta: Distance travelled along the velocity twist screw axis, or an
+               array of N distances.
+
+    Returns:
+        Unit dual quaternion, or N by 8 array of them.
+
+    See Also:
+        :py:func:`dual_log`
+    """
+    dtype = mr._float_dtype(S, theta)
+    S = mr._as_vectors(S, 6).astype(dtype, copy=False)
+    S = S * np.asarray(theta, dtype=dtype)[..., np.newaxis]
+    omega, v = S[..., 0:3], S[..., 3:6]
+    angle = np.linalg.norm(omega, axis=-1)
+
+    # p = G(theta) v, with the coefficients of the unit axis expressed in
+    # terms of omega = omega_hat theta.
+    a = (np.sinc(angle / (2 * np.pi))**2 / 2)[..., np.newaxis]
+    b = mr._coefficient(angle, lambda x: (x - np.sin(x)) / x**3,
+                        (1/6, -1/120, 1/5040, -1/362880))[..., np.newaxis]
+    omega_cross_v = np.cross(omega, v)
+    p = v + a * omega_cross_v + b * np.cross(omega, omega_cross_v)
+
+    q_r = exp(omega)
+
+    return np.concatenate((q_r, _dual_part(p, q_r)), axis=-1)
+
+
+def dual_log(Q: np.array) -> np.array:
+    """
+    'Differentiation' of a unit dual quaternion to the velocity twist that
+    reaches its configuration in unit time, the dual quaternion counterpart
+    of :py:func:`modern_robotics.num.SE3_to_vec`. Of the rotations the
+    shortest is returned, as in :py:func:`log`.
+
+    Unlike the matrix logarithm this needs no special cases: pure
+    translations give a zero angular part, and the identity gives a zero
+    twist.
+
+    Args:
+        Q: Unit dual quaternion, or N by 8 array of them.
+
+    Returns:
+        Velocity twist vector :math:`\\Twist` with length :math:`\\theta`, or
+        N by 6 array with one twist per row if a stack was given.
+
+    See Also:
+        :py:func:`dual_exp`
+    """
+    Q = np.asarray(Q)
+    omega = _log(Q[..., 0:4])
+    p = _displacement(Q)
+    angle = np.linalg.norm(omega, axis=-1)
+
+    # v = G(theta)^-1 p, with the coefficient of the unit axis expressed in
+    # terms of omega = omega_hat theta.
+    c = mr._coefficient(angle,
+                        lambda x: 1 / x**2 - 1 / (2 * x * np.tan(x / 2)),
+                        (1/12, 1/720, 1/30240, 1/1209600))[..., np.newaxis]
+    v = p - 1/2 * np.cross(omega, p) \
+        + c * np.cross(omega, np.cross(omega, p))
+
+    S = np.concatenate((omega, v), axis=-1)
+
+    if Q.ndim == 1:
+        return S[:, np.newaxis]
+
+    return S
+
+
+def sclerp(Q_start: np.array, Q_end: np.array, s: float) -> np.array:
+    """
+    Screw linear interpolation between two unit dual quaternions, i.e. a
+    constant screw motion from one configuration to the other, like
+    :py:func:`modern_robotics.num.trajectory.screw_trajectory`.
+
+    .. math::
+
+        Q(s) = Q_{start} \\exp(s \\log(Q_{start}^{-1} Q_{end}))
+
+    Args:
+        Q_start: Unit dual quaternion at :math:`s = 0`, or N by 8 array of
+                 them.
+        Q_end: Unit dual quaternion at :math:`s = 1`, or N by 8 array of
+               them.
+        s: Path parameter, or array of N path parameters, usually in
+           :math:`[0, 1]`.
+
+    Returns:
+        Interpolated unit dual quaternion, or N by 8 array of them.
+    """
+    S = dual_log(dual_mul(dual_inverse(Q_start), Q_end))
+
+    return dual_mul(Q_start, dual_exp(S, s))
+
+
+def _product(product: typing.Callable, a: np.array, b: np.array,
+             out: np.array) -> np.array:
+    """
+    Product of (dual) quaternions a and b, with product the function that
+    returns the components of the product. All components are evaluated
+    before they are written, so out can be a or b.
+    """
+    a, b = np.asarray(a), np.asarray(b)
+    dtype = mr._float_dtype(a, b)
+    a = a.astype(dtype, copy=False)
+    b = b.astype(dtype, copy=False)
+    components = product(a, b)
+    if out is None:
+        out = np.empty(np.broadcast_shapes(a.shape, b.shape), dtype=dtype)
+
+    for i, component in enumerate(components):
+        out[..., i] = component
+
+    return out
+
+
+def _hamilton(a: np.array, b: np.array) -> tuple:
+    """
+    Components (w, x, y, z) of the Hamilton product of the quaternions a and
+    b, written out with 16 multiplications.
+    """
+    a_w, a_x, a_y, a_z = np.moveaxis(a, -1, 0)
+    b_w, b_x, b_y, b_z = np.moveaxis(b, -1, 0)
+
+    return (a_w * b_w - a_x * b_x - a_y * b_y - a_z * b_z,
+            a_w * b_x + a_x * b_w + a_y * b_z - a_z * b_y,
+            a_w * b_y - a_x * b_z + a_y * b_w + a_z * b_x,
+            a_w * b_z + a_x * b_y - a_y * b_x + a_z * b_w)
+
+
+def _dual_hamilton(A: np.array, B: np.array) -> tuple:
+    """
+    Components of the product a_r b_r + e (a_r b_d + a_d b_r) of the dual
+    quaternions A and B.
+    """
+    a_r, a_d = A[..., 0:4], A[..., 4:8]
+    b_r, b_d = B[..., 0:4], B[..., 4:8]
+    d_w, d_x, d_y, d_z = _hamilton(a_r, b_d)
+    e_w, e_x, e_y, e_z = _hamilton(a_d, b_r)
+
+    return _hamilton(a_r, b_r) + (d_w + e_w, d_x + e_x, d_y + e_y, d_z + e_z)
+
+
+def _log(q: np.array) -> np.array:
+    """
+    :py:func:`log` with the angular velocities stacked along the last axis,
+    also for a single quaternion.
+    """
+    q = np.asarray(q)
+    q = q.astype(mr._float_dtype(q), copy=False)
+    w = np.abs(q[..., 0])
+    v = np.where(q[..., 0:1] < 0, -q[..., 1:], q[..., 1:])
+    norm = np.linalg.norm(v, axis=-1)
+
+    # theta / sin(theta/2), which is 2 / cos(theta/2) in the limit of a zero
+    # angle.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = np.where(norm > 0, 2 * np.arctan2(norm, w) / norm, 2 / w)
+
+    return v * factor[..., np.newaxis]
+
+
+def _dual_part(p: np.array, q_r: np.array) -> np.array:
+    """
+    Dual part 1/2 p q_r of the displacement p (stacked along the last axis)
+    and rotation q_r.
+    """
+    t = np.concatenate((np.zeros_like(p[..., 0:1]), p), axis=-1)
+
+    return mul(t, q_r) / 2
+
+
+def _displacement(Q: np.array) -> np.array:
+    """
+    Displacement 2 q_d q_r^* of a unit dual quaternion, stacked along the
+    last axis.
+    """
+    return 2 * mul(Q[..., 4:8], conjugate(Q[..., 0:4]))[..., 1:]
@@ -0,0 +1,403 @@
+"""
+.. rubric:: ``modern_robotics.num.trajectory``
+
+This submodule contains time scalings and point-to-point trajectories, in
+joint space, along a constant screw motion, and with decoupled rotational
+and translational motion.
+
+Every trajectory is sampled at N evenly spaced times from 0 to
+:math:`T_f`. It can be generated in one vectorized call, optionally into a
+preallocated array with ``out``, or lazily with the ``iter_*`` variants.
+These compute the samples in chunks and yield them one by one, so long
+trajectories never have to be in memory at once.
+
+Time scalings map times :math:`t \\in [0, T_f]` to path parameters
+:math:`s \\in [0, 1]`. The trajectories accept any function with the same
+signature as :py:func:`quintic_time_scaling`, e.g. a
+:py:func:`trapezoidal_time_scaling` with its velocity bound to a value using
+:py:func:`functools.partial`.
+
+"""
+
+import typing
+import numpy as np
+import modern_robotics.num as mr
+
+
+def cubic_time_scaling(T_f: float, t: np.array) -> np.array:
+    """
+    Third-order polynomial time scaling, with zero velocity at the start and
+    end.
+
+    .. math::
+
+        s(t) = 3 \\left(\\frac{t}{T_f}\\right)^2
+        - 2 \\left(\\frac{t}{T_f}\\right)^3
+
+    Args:
+        T_f: Total duration of the motion.
+        t: Time, or array of times, in :math:`[0, T_f]`.
+
+    Returns:
+        Path parameter :math:`s` at the given time(s).
+    """
+    tau = np.asarray(t) / T_f
+
+    return tau**2 * (3 - 2 * tau)
+
+
+def quintic_time_scaling(T_f: float, t: np.array) -> np.array:
+    """
+    Fifth-order polynomial time scaling, with zero velocity and acceleration
+    at the start and end.
+
+    .. math::
+
+        s(t) = 10 \\left(\\frac{t}{T_f}\\right)^3
+        - 15 \\left(\\frac{t}{T_f}\\right)^4
+        + 6 \\left(\\frac{t}{T_f}\\right)^5
+
+    Args:
+        T_f: Total duration of the motion.
+        t: Time, or array of times, in :math:`[0, T_f]`.
+
+    Returns:
+        Path parameter :math:`s` at the given time(s).
+
+    Example:
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> from modern_robotics.num import trajectory
+            >>> trajectory.quintic_time_scaling(2, np.array([0, 0.5, 1, 2]))
+            array([0.        , 0.10351562, 0.5       , 1.        ])
+    """
+    tau = np.asarray(t) / T_f
+
+    return tau**3 * (10 + tau * (-15 + 6 * tau))
+
+
+def trapezoidal_time_scaling(T_f: float, t: np.array, v: float = None) \
+        -> np.array:
+    """
+    Trapezoidal motion profile time scaling: constant acceleration, coasting
+    at constant velocity :math:`v`, and constant deceleration. The
+    acceleration follows from :math:`v` and :math:`T_f`,
+    :math:`a = v^2 / (v T_f - 1)`.
+
+    Args:
+        T_f: Total duration of the motion.
+        t: Time, or array of times, in :math:`[0, T_f]`.
+        v: Coasting velocity of :math:`s`, has to satisfy
+           :math:`1 < v T_f \\leq 2`. Optional, defaults to
+           :math:`1.5 / T_f`, which accelerates during the first and
+           decelerates during the last third of the motion.
+
+    Returns:
+        Path parameter :math:`s` at the given time(s).
+
+    Raises:
+        ValueError: If the velocity can not reach :math:`s = 1` in time, or
+                    if it is so high that it can not be reached.
+    """
+    if v is None:
+        v = 1.5 / T_f
+    elif not 1 < v * T_f <= 2:
+        raise ValueError('Coasting velocity should satisfy 1 < v T_f <= 2')
+
+    a = v**2 / (v * T_f - 1)
+    t_a = v / a
+    t = np.asarray(t)
+
+    return np.where(t <= t_a, a / 2 * t**2,
+                    np.where(t <= T_f - t_a, v * t - v**2 / (2 * a),
+                             1 - a / 2 * (T_f - t)**2))
+
+
+def joint_trajectory(theta_start: np.array, theta_end: np.array, T_f: float,
+                     N: int, time_scaling: typing.Callable = None,
+                     out: np.array = None) -> np.array:
+    """
+    Straight-line trajectory in joint space.
+
+    .. math::
+
+        \\theta(s) = \\theta_{start} + s (\\theta_{end} - \\theta_{start})
+
+    Args:
+        theta_start: n vector of initial joint positions.
+        theta_end: n vector of final joint positions.
+        T_f: Total duration of the motion.
+        N: Number of samples, at least 2.
+        time_scaling: Time scaling function. Optional, defaults to
+                      :py:func:`quintic_time_scaling`.
+        out: N by n array to write the trajectory into. Optional, if omitted
+             a new array is allocated.
+
+    Returns:
+        N by n array with the joint positions of one sample per row, ``out``
+        if it was given.
+
+    See Also:
+        :py:func:`iter_joint_trajectory`
+    """
+    sample = _joint_sampler(theta_start, theta_end)
+
+    return sample(_path_parameters(T_f, N, 0, N, time_scaling), out)
+
+
+def screw_trajectory(X_start: np.array, X_end: np.array, T_f: float, N: int,
+                     time_scaling: typing.Callable = None,
+                     out: np.array = None) -> np.array:
+    """
+    Trajectory along the constant screw motion that moves the end-effector
+    from :math:`X_{start}` to :math:`X_{end}`.
+
+    .. math::
+
+        X(s) = X_{start} \\exp(\\log(X_{start}^{-1} X_{end}) s)
+
+    Args:
+        X_start: 4 by 4 initial end-effector pose.
+        X_end: 4 by 4 final end-effector pose.
+        T_f: Total duration of the motion.
+        N: Number of samples, at least 2.
+        time_scaling: Time scaling function. Optional, defaults to
+                      :py:func:`quintic_time_scaling`.
+        out: N by 4 by 4 array to write the trajectory into. Optional, if
+             omitted a new array is allocated.
+
+    Returns:
+        N by 4 by 4 array with the pose of every sample, ``out`` if it was
+        given.
+
+    Example:
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> import modern_robotics.num as mr
+            >>> from modern_robotics.num import trajectory
+            >>> X_end = mr.gen.Tt(x=1) @ mr.gen.TRz(np.pi/2)
+            >>> X = trajectory.screw_trajectory(np.eye(4), X_end, 5, 1001)
+            >>> X.shape
+            (1001, 4, 4)
+            >>> np.allclose(X[-1], X_end)
+            True
+
+    See Also:
+        :py:func:`iter_screw_trajectory`
+        :py:func:`cartesian_trajectory`
+    """
+    sample = _screw_sampler(X_start, X_end)
+
+    return sample(_path_parameters(T_f, N, 0, N, time_scaling), out)
+
+
+def cartesian_trajectory(X_start: np.array, X_end: np.array, T_f: float,
+                         N: int, time_scaling: typing.Callable = None,
+                         out: np.array = None) -> np.array:
+    """
+    Trajectory with decoupled rotational and translational motion: the
+    origin of the end-effector frame moves along a straight line, while the
+    orientation rotates around a constant axis.
+
+    .. math::
+
+        p(s) &= p_{start} + s (p_{end} - p_{start}) \\\\
+        R(s) &= R_{start} \\exp(\\log(R_{start}\\Transposed R_{end}) s)
+
+    Args:
+        X_start: 4 by 4 initial end-effector pose.
+        X_end: 4 by 4 final end-effector pose.
+        T_f: Total duration of the motion.
+        N: Number of samples, at least 2.
+        time_scaling: Time scaling function. Optional, defaults to
+                      :py:func:`quintic_time_scaling`.
+        out: N by 4 by 4 array to write the trajectory into. Optional, if
+             omitted a new array is allocated.
+
+    Returns:
+        N by 4 by 4 array with the pose of every sample, ``out`` if it was
+        given.
+
+    See Also:
+        :py:func:`iter_cartesian_trajectory`
+        :py:func:`screw_trajectory`
+    """
+    sample = _cartesian_sampler(X_start, X_end)
+
+    return sample(_path_parameters(T_f, N, 0, N, time_scaling), out)
+
+
+def iter_joint_trajectory(theta_start: np.array, theta_end: np.array,
+                          T_f: float, N: int,
+                          time_scaling: typing.Callable = None,
+                          chunk_size: int = 4096) -> typing.Iterator:
+    """
+    Lazily generates the trajectory of :py:func:`joint_trajectory`.
+
+    Args:
+        theta_start: n vector of initial joint positions.
+        theta_end: n vector of final joint positions.
+        T_f: Total duration of the motion.
+        N: Number of samples, at least 2.
+        time_scaling: Time scaling function. Optional, defaults to
+                      :py:func:`quintic_time_scaling`.
+        chunk_size: Number of samples to compute at once.
+
+    Yields:
+        n vector of joint positions of each sample.
+    """
+    return _iterate(_joint_sampler(theta_start, theta_end), T_f, N,
+                    time_scaling, chunk_size)
+
+
+def iter_screw_trajectory(X_start: np.array, X_end: np.array, T_f: float,
+                          N: int, time_scaling: typing.Callable = None,
+                          chunk_size: int = 4096) -> typing.Iterator:
+    """
+    Lazily generates the trajectory of :py:func:`screw_trajectory`.
+
+    Args:
+        X_start: 4 by 4 initial end-effector pose.
+        X_end: 4 by 4 final end-effector pose.
+        T_f: Total duration of the motion.
+        N: Number of samples, at least 2.
+        time_scaling: Time scaling function. Optional, defaults to
+                      :py:func:`quintic_time_scaling`.
+        chunk_size: Number of samples to compute at once.
+
+    Yields:
+        4 by 4 pose of each sample.
+
+    Example:
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> import modern_robotics.num as mr
+            >>> from modern_robotics.num import trajectory
+            >>> X_end = mr.gen.Tt(x=1) @ mr.gen.TRz(np.pi/2)
+            >>> for X in trajectory.iter_screw_trajectory(
+            ...         np.eye(4), X_end, 600, 600001):
+            ...     pass
+            >>> np.allclose(X, X_end)
+            True
+    """
+    return _iterate(_screw_sampler(X_start, X_end), T_f, N, time_scaling,
+                    chunk_size)
+
+
+def iter_cartesian_trajectory(X_start: np.array, X_end: np.array, T_f: float,
+                              N: int, time_scaling: typing.Callable = None,
+                              chunk_size: int = 4096) -> typing.Iterator:
+    """
+    Lazily generates the trajectory of :py:func:`cartesian_trajectory`.
+
+    Args:
+        X_start: 4 by 4 initial end-effector pose.
+        X_end: 4 by 4 final end-effector pose.
+        T_f: Total duration of the motion.
+        N: Number of samples, at least 2.
+        time_scaling: Time scaling function. Optional, defaults to
+                      :py:func:`quintic_time_scaling`.
+        chunk_size: Number of samples to compute at once.
+
+    Yields:
+        4 by 4 pose of each sample.
+    """
+    return _iterate(_cartesian_sampler(X_start, X_end), T_f, N,
+                    time_scaling, chunk_size)
+
+
+def _path_parameters(T_f: float, N: int, start: int, stop: int,
+                     time_scaling: typing.Callable) -> np.array:
+    """
+    Path parameters of samples start up to stop of N samples evenly spaced
+    from 0 to T_f. The last sample is exactly at T_f.
+    """
+    if N < 2:
+        raise ValueError('A trajectory needs at least 2 samples')
+    if time_scaling is None:
+        time_scaling = quintic_time_scaling
+
+    return time_scaling(T_f, T_f * (np.arange(start, stop) / (N - 1)))
+
+
+def _iterate(sample: typing.Callable, T_f: float, N: int,
+             time_scaling: typing.Callable, chunk_size: int) \
+        -> typing.Iterator:
+    """
+    Yields the samples one by one, computed in chunks. Every chunk gets its
+    own array, so yielded samples stay valid after the next chunk.
+    """
+    for start in range(0, N, chunk_size):
+        stop = min(start + chunk_size, N)
+        yield from sample(
+            _path_parameters(T_f, N, start, stop, time_scaling), None)
+
+
+def _joint_sampler(theta_start: np.array, theta_end: np.array) \
+        -> typing.Callable:
+    dtype = mr._float_dtype(theta_start, theta_end)
+    theta_start = np.asarray(theta_start, dtype=dtype)
+    d_theta = np.asarray(theta_end, dtype=dtype) - theta_start
+
+    def sample(s, out):
+        if out is None:
+            out = np.empty(s.shape + theta_start.shape, dtype=dtype)
+        np.multiply(s[:, np.newaxis].astype(dtype, copy=False), d_theta,
+                    out=out)
+        out += theta_start
+
+        return out
+
+    return sample
+
+
+def _screw_sampler(X_start: np.array, X_end: np.array) -> typing.Callable:
+    dtype = mr._float_dtype(X_start, X_end)
+    X_start = np.asarray(X_start, dtype=dtype)
+    X_end = np.asarray(X_end, dtype=dtype)
+    V = mr.SE3_to_vec(mr.inv_SE3(X_start) @ X_end, robust=True)[:, 0]
+
+    # Split the twist into unit screw axis and distance, the distance is
+    # measured along v if there is no rotation. Coinciding poses give a zero
+    # axis, i.e. a constant trajectory.
+    theta = np.linalg.norm(V[0:3])
+    if np.isclose(theta, 0):
+        theta = np.linalg.norm(V[3:6])
+    S = V / theta if theta > 0 else V
+
+    def sample(s, out):
+        theta_s = s.astype(S.dtype, copy=False) * theta
+        return np.matmul(X_start, mr.vec_to_SE3(S, theta_s), out=out)
+
+    return sample
+
+
+def _cartesian_sampler(X_start: np.array, X_end: np.array) -> typing.Callable:
+    dtype = mr._float_dtype(X_start, X_end)
+    X_start = np.asarray(X_start, dtype=dtype)
+    X_end = np.asarray(X_end, dtype=dtype)
+    R_start = X_start[0:3, 0:3]
+    p_start = X_start[0:3, 3]
+    d_p = X_end[0:3, 3] - p_start
+
+    omega = mr.SO3_to_vec(R_start.T @ X_end[0:3, 0:3], robust=True)[:, 0]
+    theta = np.linalg.norm(omega)
+    omega_hat = omega / theta if theta > 0 else omega
+
+    def sample(s, out):
+        if out is None:
+            out = np.empty(s.shape + (4, 4), dtype=dtype)
+        s = s.astype(dtype, copy=False)
+        np.matmul(R_start, mr.vec_to_SO3(omega_hat, s * theta),
+                  out=out[:, 0:3, 0:3])
+        np.multiply(s[:, np.newaxis], d_p, out=out[:, 0:3, 3])
+        out[:, 0:3, 3] += p_start
+        out[:, 3, 0:3] = 0
+        out[:, 3, 3] = 1
+
+        return out
+
+    return sample
@@ -0,0 +1,345 @@
+"""
+.. rubric:: ``modern_robotics.profiling``
+
+Opt-in instrumentation of :py:mod:`modern_robotics.num` and
+:py:mod:`modern_robotics.sym`. While a :py:class:`Profile` is active, it
+records the number of calls and the latency of every call of the public
+functions of these modules, and how often the special cases of the functions
+are hit, e.g. the identity and half turn branches of ``SO3_to_vec``.
+
+.. code-block:: python
+
+    import modern_robotics.num as mr
+    from modern_robotics import profiling
+
+    with profiling.Profile() as profile:
+        mr.SE3_to_vec(T)
+
+    print(profile.report())
+    profile.save('profile.json')
+
+The instrumentation replaces the functions in their modules while the
+profile is active, and restores them afterwards, so there is no overhead
+when profiling is disabled; the special cases only check whether
+:py:data:`active` is set. Calls are also recorded when the functions call
+each other, but not through references that were taken before the profile
+started, e.g. with ``from modern_robotics.num import SE3_to_vec``.
+
+Profiling imports nothing itself: modules that are loaded when the profile
+starts are instrumented right away, the others when they are first
+imported, so the lazy loading of the package (and of sympy) is kept.
+
+A whole program can be profiled by setting the ``MODERN_ROBOTICS_PROFILE``
+environment variable to the path of the report, which is written when the
+program exits. Paths ending in ``.json`` get the :py:meth:`Profile.stats`
+as JSON, all others the text :py:meth:`Profile.report`.
+
+"""
+
+import atexit
+import collections
+import functools
+import importlib.abc
+import inspect
+import json
+import sys
+import time
+import typing
+
+#: Modules whose public functions are instrumented by default, once they are
+#: imported.
+MODULES = (
+    'modern_robotics.num',
+    'modern_robotics.num.dynamics',
+    'modern_robotics.num.gen',
+    'modern_robotics.num.jit',
+    'modern_robotics.num.kinematics',
+    'modern_robotics.num.parallel',
+    'modern_robotics.num.quaternion',
+    'modern_robotics.num.trajectory',
+    'modern_robotics.sym',
+    'modern_robotics.sym.cache',
+    'modern_robotics.sym.chain',
+    'modern_robotics.sym.codegen',
+    'modern_robotics.sym.gen',
+)
+
+#: The :py:class:`Profile` that is recording, None if profiling is disabled.
+active = None
+
+
+class Profile:
+    """
+    Records calls, latencies and special case hits while it is active,
+    between :py:meth:`start` and :py:meth:`stop` or in a ``with`` block.
+    Only one profile can be active at a time. A profile can be started again
+    to add to its records.
+
+    Args:
+        modules: Names of the modules to instrument. Defaults to
+                 :py:data:`MODULES`.
+    """
+
+    def __init__(self, modules: typing.Sequence[str] = MODULES):
+        self.modules = tuple(modules)
+        #: Latencies in seconds of all recorded calls, per function.
+        self.calls = collections.defaultdict(list)
+        #: Number of hits and number of evaluated items, per special case.
+        self.branches = collections.defaultdict(lambda: [0, 0])
+        self._originals = []
+        self._hook = None
+
+    def __enter__(self) -> 'Profile':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        """
+        Instruments the functions of the modules that are imported, and of
+        the others as soon as they are imported, and starts recording.
+
+        Raises:
+            RuntimeError: If another profile is active.
+        """
+        global active
+
+        if active is not None:
+            raise RuntimeError('Another profile is already active')
+
+        for module_name in self.modules:
+            if module_name in sys.modules:
+                self._instrument_module(sys.modules[module_name])
+
+        # Functions that the package itself already forwarded from num.
+        package = sys.modules['modern_robotics']
+        replaced = {id(o): w for m, _, o, w in self._originals
+                    if m.__name__ == 'modern_robotics.num'}
+        for name, value in list(vars(package).items()):
+            if id(value) in replaced:
+                self._replace(package, name, value, replaced[id(value)])
+
+        self._hook = _ImportHook(self)
+        sys.meta_path.insert(0, self._hook)
+
+        active = self
+
+    def stop(self):
+        """
+        Stops recording and restores the original functions.
+        """
+        global active
+
+        if self._hook in sys.meta_path:
+            sys.meta_path.remove(self._hook)
+        self._hook = None
+
+        originals = {id(w): o for _, _, o, w in self._originals}
+        for module, name, original, _ in reversed(self._originals):
+            setattr(module, name, original)
+        self._originals = []
+
+        # The package may have forwarded instrumented functions of num that
+        # was imported after the profile started.
+        package = sys.modules['modern_robotics']
+        for name, value in list(vars(package).items()):
+            if id(value) in originals:
+                setattr(package, name, originals[id(value)])
+
+        if active is self:
+            active = None
+
+    def count(self, branch: str, taken: typing.Union[bool, 'np.array']):
+        """
+        Records whether a special case was taken, called by the instrumented
+        functions themselves.
+
+        Args:
+            branch: Name of the special case, e.g. ``num.SO3_to_vec.identity``.
+            taken: Whether the special case was taken, or a mask with one
+                   entry per evaluated item.
+        """
+        record = self.branches[branch]
+        if hasattr(taken, 'size'):
+            record[0] += int(taken.sum())
+            record[1] += int(taken.size)
+        else:
+            record[0] += bool(taken)
+            record[1] += 1
+
+    def stats(self) -> dict:
+        """
+        Summary of the records.
+
+        Returns:
+            Dictionary with under ``'functions'`` the number of calls and the
+            total, mean, median, 90th and 99th percentile and maximum latency
+            in seconds per called function, and under ``'branches'`` the
+            number of hits and evaluated items per special case.
+        """
+        # Not imported at the top, so that profiling does not load numpy
+        # before the profiled program does.
+        import numpy as np
+
+        functions = {}
+        for name, latencies in sorted(self.calls.items()):
+            if not latencies:
+                continue
+            p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+            functions[name] = {
+                'calls': len(latencies), 'total': float(np.sum(latencies)),
+                'mean': float(np.mean(latencies)), 'p50': float(p50),
+                'p90': float(p90), 'p99': float(p99),
+                'max': float(np.max(latencies))}
+
+        branches = {name: {'hits': hits, 'total': total}
+                    for name, (hits, total) in sorted(self.branches.items())}
+
+        return {'functions': functions, 'branches': branches}
+
+    def report(self) -> str:
+        """
+        Text table of the records, with the functions ordered by total time.
+        """
+        stats = self.stats()
+        functions = sorted(stats['functions'].items(),
+                           key=lambda item: -item[1]['total'])
+        width = max([len(name) for name in stats['functions']]
+                    + [len(name) for name in stats['branches']]
+                    + [len('function')])
+
+        lines = [f'{"function":<{width}}  {"calls":>8}  ' + '  '.join(
+            f'{column:>10}'
+            for column in ('total', 'mean', 'p50', 'p90', 'p99', 'max'))]
+        for name, s in functions:
+            lines.append(f'{name:<{width}}  {s["calls"]:>8}  ' + '  '.join(
+                f'{_format_time(s[column]):>10}'
+                for column in ('total', 'mean', 'p50', 'p90', 'p99', 'max')))
+
+        if stats['branches']:
+            lines += ['', f'{"branch":<{width}}  {"hits":>8}  {"of":>10}']
+            for name, s in stats['branches'].items():
+                lines.append(f'{name:<{width}}  {s["hits"]:>8}  '
+                             f'{s["total"]:>10}')
+
+        return '\n'.join(lines)
+
+    def save(self, path: str):
+        """
+        Writes the records to a file, the :py:meth:`stats` as JSON if the
+        path ends in ``.json`` and the :py:meth:`report` otherwise.
+
+        Args:
+            path: File to write.
+        """
+        with open(path, 'w') as f:
+            if path.endswith('.json'):
+                json.dump(self.stats(), f, indent=2)
+            else:
+                f.write(self.report() + '\n')
+
+    def _instrument_module(self, module):
+        """
+        Replaces the public functions defined in module by instrumented ones.
+        """
+        prefix = module.__name__.replace('modern_robotics.', '', 1)
+        for name, function in list(vars(module).items()):
+            if name.startswith('_') or not inspect.isfunction(function) \
+                    or function.__module__ != module.__name__:
+                continue
+            self._replace(module, name, function, _instrument(
+                function, self.calls[f'{prefix}.{name}']))
+
+    def _replace(self, module, name: str, original: typing.Callable,
+                 wrapper: typing.Callable):
+        self._originals.append((module, name, original, wrapper))
+        setattr(module, name, wrapper)
+
+
+class _ImportHook(importlib.abc.MetaPathFinder):
+    """
+    Import hook that instruments the modules of a profile when they are
+    imported while the profile is active.
+    """
+
+    def __init__(self, profile: Profile):
+        self.profile = profile
+
+    def find_spec(self, name: str, path, target=None):
+        if name not in self.profile.modules:
+            return None
+
+        # The module is found by the other finders, only its loader is
+        # wrapped.
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, 'find_spec', None)
+            if finder is self or find_spec is None:
+                continue
+            spec = find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        if hasattr(spec.loader, 'exec_module'):
+            spec.loader = _InstrumentingLoader(spec.loader, self.profile)
+
+        return spec
+
+
+class _InstrumentingLoader(importlib.abc.Loader):
+    """
+    Loader that instruments a module of a profile after the original loader
+    executed it.
+    """
+
+    def __init__(self, loader: importlib.abc.Loader, profile: Profile):
+        self.loader = loader
+        self.profile = profile
+
+    def __getattr__(self, name: str):
+        return getattr(self.loader, name)
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        self.loader.exec_module(module)
+        if self.profile._hook is not None:
+            self.profile._instrument_module(module)
+
+
+def _instrument(function: typing.Callable, latencies: list) \
+        -> typing.Callable:
+    """
+    Wraps function to append the latency of every call to latencies.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    return wrapper
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.3f} {unit}'
+
+    return f'{seconds / 1e-9:.0f} ns'
+
+
+def _profile_to(path: str):
+    """
+    Profiles the rest of the program, and saves the records to path when it
+    exits.
+    """
+    profile = Profile()
+    profile.start()
+    atexit.register(profile.save, path)
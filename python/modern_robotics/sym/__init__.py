@@ -8,8 +8,46 @@ loaded by using ``import modern_robotics.sym as mr``.
 
 """
 
+import importlib
 import sympy as sp
-from . import gen
+
+from modern_robotics import profiling
+from . import cache
+
+__all__ = [
+    'SO3_to_vec',
+    'vec_to_SO3',
+    'vec_to_so3',
+    'so3_to_vec',
+    'vec_to_SE3',
+    'big_adjoint',
+    'little_adjoint',
+    'exp_jacobian_SO3',
+    'exp_jacobian_inv_SO3',
+    'exp_jacobian_SE3',
+    'exp_jacobian_inv_SE3',
+    'inv_SE3',
+    'R_p_to_SE3',
+    'gen',
+    'codegen',
+    'cache',
+    'chain',
+]
+
+_SUBMODULES = ('gen', 'codegen', 'chain')
+
+
+def __getattr__(name: str):
+    # Submodules are imported on first use, to keep importing the package
+    # itself cheap.
+    if name in _SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
 
 
 def SO3_to_vec(R: sp.Matrix) -> sp.Matrix:
@@ -28,12 +66,19 @@ def SO3_to_vec(R: sp.Matrix) -> sp.Matrix:
         :py:func:`so3_to_vec`
         :py:func:`vec_to_SO3`
     """
-    if sp.eye(3).equals(R):
+    trace = cache.simplify(sp.Trace(R))
+    identity = cache.equals(sp.eye(3), R)
+    half_turn = not identity and trace == -1
+    if profiling.active is not None:
+        profiling.active.count('sym.SO3_to_vec.identity', identity)
+        profiling.active.count('sym.SO3_to_vec.half_turn', half_turn)
+
+    if identity:
         # If R is equal to identity (to precision), angular velocity magnitude
         # is 0 and direction is undefined.
         theta = sp.Integer(0)
         omega = sp.Matrix([[sp.nan], [sp.nan], [sp.nan]])
-    elif sp.simplify(sp.Trace(R)) == -1:
+    elif half_turn:
         # If trace of R is -1, angular velocity magnitude is pi, and direction
         # is either x, y, or z, depending on values of R.
         theta = sp.pi
@@ -47,7 +92,7 @@ def SO3_to_vec(R: sp.Matrix) -> sp.Matrix:
             omega = 1/(sp.sqrt(2 * (1 + R[0, 0]))) * \
                 (R[:, 0] + sp.Matrix([[1], [0], [0]]))
     else:
-        theta = sp.acos((sp.simplify(sp.Trace(R)) - 1)/2)
+        theta = sp.acos((trace - 1)/2)
         omega_tilde = 1/(2 * sp.sin(theta)) * (R - R.T)
         omega = so3_to_vec(omega_tilde)
 
@@ -151,7 +196,7 @@ def vec_to_SE3(S: sp.Matrix, theta: sp.Number) -> sp.Matrix:
     """
     omega = S[:3, 0]
     v = S[3:, 0]
-    if sp.zeros(3, 1).equals(omega):
+    if cache.equals(sp.zeros(3, 1), omega):
         R = sp.eye(3)
         p = v * theta
     else:
@@ -227,6 +272,182 @@ def little_adjoint(V: sp.Matrix) -> sp.Matrix:
                             sp.Matrix.hstack(vec_to_so3(v), vec_to_so3(w)))
 
 
+def exp_jacobian_SO3(omega: sp.Matrix, side: str = 'left') -> sp.Matrix:
+    """
+    Left or right Jacobian of the exponential map of :math:`\\SOthree`.
+
+    .. math::
+
+        \\Jacobian_l(\\omega) = I +
+        \\frac{1 - \\cos\\theta}{\\theta^2}\\TildeSkew{\\omega} +
+        \\frac{\\theta - \\sin\\theta}{\\theta^3}\\TildeSkew{\\omega}^2,
+        \\quad \\Jacobian_r(\\omega) = \\Jacobian_l(-\\omega)
+
+    Args:
+        omega: 3 vector angular velocity with length :math:`\\theta`.
+        side: ``'left'`` or ``'right'``.
+
+    Returns:
+        3 by 3 Jacobian.
+
+    Raises:
+        ValueError: If side is unknown.
+
+    See Also:
+        :py:func:`exp_jacobian_inv_SO3`
+    """
+    omega = _exp_coordinates(omega, side)
+    if cache.equals(sp.zeros(3, 1), omega):
+        return sp.eye(3)
+
+    theta = omega.norm()
+    omega_tilde = vec_to_so3(omega)
+
+    return sp.eye(3) + (1 - sp.cos(theta)) / theta**2 * omega_tilde \
+        + (theta - sp.sin(theta)) / theta**3 * omega_tilde**2
+
+
+def exp_jacobian_inv_SO3(omega: sp.Matrix, side: str = 'left') \
+        -> sp.Matrix:
+    """
+    Inverse of the left or right Jacobian of the exponential map of
+    :math:`\\SOthree`.
+
+    .. math::
+
+        \\Jacobian_l^{-1}(\\omega) = I - \\frac{1}{2}\\TildeSkew{\\omega} +
+        \\left(\\frac{1}{\\theta^2} -
+        \\frac{1}{2\\theta\\tan(\\theta/2)}\\right)\\TildeSkew{\\omega}^2,
+        \\quad \\Jacobian_r^{-1}(\\omega) = \\Jacobian_l^{-1}(-\\omega)
+
+    Args:
+        omega: 3 vector angular velocity with length :math:`\\theta`.
+        side: ``'left'`` or ``'right'``.
+
+    Returns:
+        3 by 3 inverse Jacobian.
+
+    Raises:
+        ValueError: If side is unknown.
+
+    See Also:
+        :py:func:`exp_jacobian_SO3`
+    """
+    omega = _exp_coordinates(omega, side)
+    if cache.equals(sp.zeros(3, 1), omega):
+        return sp.eye(3)
+
+    theta = omega.norm()
+    omega_tilde = vec_to_so3(omega)
+
+    return sp.eye(3) - omega_tilde / 2 \
+        + (1 / theta**2 - 1 / (2 * theta * sp.tan(theta / 2))) \
+        * omega_tilde**2
+
+
+def exp_jacobian_SE3(V: sp.Matrix, side: str = 'left') -> sp.Matrix:
+    """
+    Left or right Jacobian of the exponential map of :math:`\\SEthree`.
+
+    .. math::
+
+        \\Jacobian_l(\\Twist) =
+        \\begin{bmatrix}
+        \\Jacobian_l(\\omega) & 0 \\\\
+        Q(\\omega, v) & \\Jacobian_l(\\omega)
+        \\end{bmatrix},
+        \\quad \\Jacobian_r(\\Twist) = \\Jacobian_l(-\\Twist)
+
+    Args:
+        V: 6 by 1 velocity twist with length :math:`\\theta`.
+        side: ``'left'`` or ``'right'``.
+
+    Returns:
+        6 by 6 Jacobian.
+
+    Raises:
+        ValueError: If side is unknown.
+
+    See Also:
+        :py:func:`exp_jacobian_inv_SE3`
+    """
+    V = _exp_coordinates(V, side)
+    J = exp_jacobian_SO3(V[:3, 0])
+
+    return sp.Matrix.vstack(sp.Matrix.hstack(J, sp.zeros(3, 3)),
+                            sp.Matrix.hstack(_exp_jacobian_Q(V), J))
+
+
+def exp_jacobian_inv_SE3(V: sp.Matrix, side: str = 'left') -> sp.Matrix:
+    """
+    Inverse of the left or right Jacobian of the exponential map of
+    :math:`\\SEthree`.
+
+    .. math::
+
+        \\Jacobian_l^{-1}(\\Twist) =
+        \\begin{bmatrix}
+        \\Jacobian_l^{-1}(\\omega) & 0 \\\\
+        -\\Jacobian_l^{-1}(\\omega)Q(\\omega, v)\\Jacobian_l^{-1}(\\omega) &
+        \\Jacobian_l^{-1}(\\omega)
+        \\end{bmatrix},
+        \\quad \\Jacobian_r^{-1}(\\Twist) = \\Jacobian_l^{-1}(-\\Twist)
+
+    Args:
+        V: 6 by 1 velocity twist with length :math:`\\theta`.
+        side: ``'left'`` or ``'right'``.
+
+    Returns:
+        6 by 6 inverse Jacobian.
+
+    Raises:
+        ValueError: If side is unknown.
+
+    See Also:
+        :py:func:`exp_jacobian_SE3`
+    """
+    V = _exp_coordinates(V, side)
+    J_inv = exp_jacobian_inv_SO3(V[:3, 0])
+
+    return sp.Matrix.vstack(
+        sp.Matrix.hstack(J_inv, sp.zeros(3, 3)),
+        sp.Matrix.hstack(-J_inv * _exp_jacobian_Q(V) * J_inv, J_inv))
+
+
+def _exp_coordinates(x: sp.Matrix, side: str) -> sp.Matrix:
+    """
+    Exponential coordinates, negated for the right Jacobians, which are the
+    left Jacobians of the inverse.
+    """
+    if side == 'right':
+        return -x
+    if side != 'left':
+        raise ValueError(f'Unknown side {side!r}')
+
+    return x
+
+
+def _exp_jacobian_Q(V: sp.Matrix) -> sp.Matrix:
+    """
+    Lower left block Q(omega, v) of the left Jacobian of SE(3).
+    """
+    omega = V[:3, 0]
+    W = vec_to_so3(omega)
+    U = vec_to_so3(V[3:, 0])
+    if cache.equals(sp.zeros(3, 1), omega):
+        return U / 2
+
+    theta = omega.norm()
+    b = (theta - sp.sin(theta)) / theta**3
+    c = (theta**2 + 2 * sp.cos(theta) - 2) / (2 * theta**4)
+    d = (2 * theta - 3 * sp.sin(theta) + theta * sp.cos(theta)) \
+        / (2 * theta**5)
+
+    return U / 2 + b * (W * U + U * W + W * U * W) \
+        + c * (W**2 * U + U * W**2 - 3 * W * U * W) \
+        + d * (W * U * W**2 + W**2 * U * W)
+
+
 def inv_SE3(T: sp.Matrix) -> sp.Matrix:
     """
     Inverts the transformation matrix T.
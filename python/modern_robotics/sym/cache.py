@@ -0,0 +1,228 @@
+"""
+.. rubric:: ``modern_robotics.sym.cache``
+
+This submodule contains a memoizing wrapper around the expensive sympy
+operations, :py:func:`sympy.simplify` and :py:meth:`sympy.Matrix.equals`.
+Derivations of larger robots simplify the same subexpressions over and over,
+with the cache every distinct expression is only simplified once. The
+functions in :py:mod:`modern_robotics.sym` use it internally.
+
+Expressions are keyed by their structure, so equal expressions hit the same
+entry no matter where they were built. The cache keeps at most
+:py:data:`MAXSIZE` entries and evicts the least recently used ones.
+
+The cache can be persisted across sessions: if the
+``MODERN_ROBOTICS_SIMPLIFY_CACHE`` environment variable holds a file path,
+the default cache is loaded from that file on first use and written back to
+it when the interpreter exits. The file is read with :py:mod:`pickle`, which
+can execute arbitrary code, so it must be a trusted path that only you can
+write to. A corrupt or unreadable file is ignored, the cache then starts
+empty.
+
+"""
+
+import atexit
+import collections
+import os
+import pickle
+import tempfile
+import typing
+import warnings
+
+import sympy as sp
+
+from modern_robotics import profiling
+
+#: Default maximum number of cached results.
+MAXSIZE = 4096
+
+#: Version of the cache file format, files of another version are ignored.
+CACHE_VERSION = 1
+
+
+class SimplifyCache:
+    """
+    Bounded least recently used cache of simplification results.
+
+    Args:
+        maxsize: Maximum number of cached results.
+        path: File to persist the cache in. Optional, if given the cache is
+              loaded from it on first use and :py:meth:`save` writes to it by
+              default. Has to be trusted, see :py:meth:`load`.
+    """
+
+    def __init__(self, maxsize: int = MAXSIZE, path: str = None):
+        self.maxsize = maxsize
+        self.path = path
+        #: Number of lookups that were answered from the cache.
+        self.hits = 0
+        #: Number of lookups that had to be computed.
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._loaded = path is None
+
+    def simplify(self, expr: sp.Basic) -> sp.Basic:
+        """
+        Cached :py:func:`sympy.simplify`.
+
+        Args:
+            expr: Expression or matrix to simplify.
+
+        Returns:
+            Simplified expression. Matrices are returned as mutable
+            :py:class:`sympy.Matrix`, like sympy does.
+        """
+        # Results are stored immutable, so that callers can not modify cache
+        # entries.
+        result = self._lookup(('simplify', _key(expr)),
+                              lambda: _key(sp.simplify(expr)))
+
+        if isinstance(expr, sp.MatrixBase) \
+                and not isinstance(expr, sp.ImmutableMatrix):
+            return result.as_mutable()
+
+        return result
+
+    def equals(self, a: sp.Basic, b: sp.Basic) -> bool:
+        """
+        Cached ``a.equals(b)``.
+
+        Args:
+            a: Expression or matrix.
+            b: Expression or matrix to compare with.
+
+        Returns:
+            Whether a and b are equal, or None if sympy could not decide.
+        """
+        return self._lookup(('equals', _key(a), _key(b)), lambda: a.equals(b))
+
+    def clear(self):
+        """
+        Removes all entries and resets the statistics.
+        """
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def load(self, path: str = None):
+        """
+        Merges the entries stored in a file into the cache. Missing,
+        unreadable and corrupt files, and files written by another version,
+        are ignored with a warning for the corrupt ones.
+
+        The file is unpickled, which can execute arbitrary code: only load
+        files from a trusted path.
+
+        Args:
+            path: File to load. Optional, defaults to :py:attr:`path`.
+        """
+        path = path or self.path
+        self._loaded = True
+        try:
+            with open(path, 'rb') as f:
+                stored = pickle.load(f)
+        except OSError:
+            return
+        except Exception as e:
+            # Unpickling raises all kinds of errors on corrupt files.
+            warnings.warn(f'Ignoring corrupt simplify cache {path!r}: {e!r}',
+                          RuntimeWarning)
+            return
+
+        if not isinstance(stored, dict) \
+                or stored.get('version') != CACHE_VERSION \
+                or stored.get('sympy') != sp.__version__:
+            return
+
+        for key, value in stored['entries']:
+            self._entries.setdefault(key, value)
+        self._trim()
+
+    def save(self, path: str = None):
+        """
+        Writes the cache to a file, atomically.
+
+        Args:
+            path: File to write. Optional, defaults to :py:attr:`path`.
+        """
+        path = path or self.path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        stored = {'version': CACHE_VERSION, 'sympy': sp.__version__,
+                  'entries': list(self._entries.items())}
+        fd, tmp = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(stored, f)
+        os.replace(tmp, path)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _lookup(self, key: tuple, compute: typing.Callable):
+        if not self._loaded:
+            self.load()
+
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            hit = False
+            value = self._entries[key] = compute()
+            self._trim()
+        else:
+            self.hits += 1
+            hit = True
+            self._entries.move_to_end(key)
+
+        if profiling.active is not None:
+            profiling.active.count(f'sym.cache.{key[0]}.hit', hit)
+
+        return value
+
+    def _trim(self):
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+def _key(expr: sp.Basic) -> sp.Basic:
+    """
+    Hashable form of an expression, mutable matrices are made immutable.
+    """
+    if isinstance(expr, sp.MatrixBase):
+        return sp.ImmutableMatrix(expr)
+
+    return sp.sympify(expr)
+
+
+#: Cache used by :py:func:`simplify` and :py:func:`equals`.
+default = SimplifyCache(path=os.environ.get('MODERN_ROBOTICS_SIMPLIFY_CACHE'))
+
+if default.path is not None:
+    atexit.register(default.save)
+
+
+def simplify(expr: sp.Basic) -> sp.Basic:
+    """
+    :py:func:`sympy.simplify`, memoized in the :py:data:`default` cache.
+
+    Args:
+        expr: Expression or matrix to simplify.
+
+    Returns:
+        Simplified expression.
+    """
+    return default.simplify(expr)
+
+
+def equals(a: sp.Basic, b: sp.Basic) -> bool:
+    """
+    ``a.equals(b)``, memoized in the :py:data:`default` cache.
+
+    Args:
+        a: Expression or matrix.
+        b: Expression or matrix to compare with.
+
+    Returns:
+        Whether a and b are equal, or None if sympy could not decide.
+    """
+    return default.equals(a, b)
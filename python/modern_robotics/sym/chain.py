@@ -0,0 +1,208 @@
+"""
+.. rubric:: ``modern_robotics.sym.chain``
+
+This submodule composes long chains of symbolic transformation matrices,
+e.g. the forward kinematics of a robot, without the expression swell of
+multiplying the matrices with ``*``.
+
+Three things keep the expressions small:
+
+* Sines and cosines are abbreviated by symbols, ``s1`` and ``c1`` for
+  :math:`\\sin(q_1)` and :math:`\\cos(q_1)`, so every link is polynomial in
+  the abbreviations.
+* After every link the product is expanded and reduced with
+  :math:`s^2 + c^2 = 1`.
+* After every link the non-trivial entries of the product are replaced by
+  intermediate symbols, so the next link only multiplies symbols. The
+  intermediate symbols ``T3_01``, ``T3_02``, ... name the entries of the
+  product of the first 3 links.
+
+The result is available in common subexpression form, as the list of
+abbreviations and intermediate symbols with their definitions and the final
+matrix in terms of those symbols, or expanded into a single matrix of the
+original symbols.
+
+"""
+
+import re
+
+import sympy as sp
+
+from . import cache
+
+
+class Chain:
+    """
+    Incrementally composed product of transformation matrices.
+
+    Args:
+        abbreviate: Whether to abbreviate sines and cosines by symbols.
+        intermediates: Whether to replace the entries of the product by
+                       intermediate symbols after every link.
+
+    Example:
+        .. code-block:: python
+
+            >>> import sympy as sp
+            >>> import modern_robotics.sym as mr
+            >>> from modern_robotics.sym.chain import Chain
+            >>> q1, q2 = sp.symbols('q1 q2')
+            >>> chain = Chain()
+            >>> chain.append(mr.gen.TRz(q1) * mr.gen.Tt(x=1))
+            >>> chain.append(mr.gen.TRz(q2) * mr.gen.Tt(x=1))
+            >>> chain.matrix[0:2, 3]
+            Matrix([
+            [T2_03],
+            [T2_13]])
+            >>> chain.expand()[0:2, 3]
+            Matrix([
+            [-sin(q1)*sin(q2) + cos(q1)*cos(q2) + cos(q1)],
+            [ sin(q1)*cos(q2) + sin(q1) + sin(q2)*cos(q1)]])
+    """
+
+    def __init__(self, abbreviate: bool = True, intermediates: bool = True):
+        self.abbreviate = abbreviate
+        self.intermediates = intermediates
+        #: Product of the links so far, in terms of the abbreviations and
+        #: intermediate symbols.
+        self.matrix = None
+        #: List of (symbol, expression) pairs, the abbreviations followed by
+        #: the intermediate symbols in order of definition.
+        self.replacements = []
+        # Abbreviations as {argument: (sin symbol, cos symbol)}
+        self._abbreviations = {}
+        self._links = 0
+
+    def append(self, T: sp.Matrix):
+        """
+        Multiplies a link onto the right of the chain.
+
+        Args:
+            T: 4 by 4 homogeneous transformation matrix of the link.
+        """
+        if self.abbreviate:
+            T = T.replace(sp.sin, lambda arg: self._abbreviation(arg)[0]) \
+                .replace(sp.cos, lambda arg: self._abbreviation(arg)[1])
+
+        self._links += 1
+        if self.matrix is None:
+            matrix = sp.Matrix(T)
+        else:
+            matrix = self.matrix * T
+        matrix = matrix.applyfunc(self._reduce)
+
+        if self.intermediates:
+            for i in range(3):
+                for j in range(4):
+                    if not _trivial(matrix[i, j]):
+                        symbol = sp.Symbol(f'T{self._links}_{i}{j}')
+                        self.replacements.append((symbol, matrix[i, j]))
+                        matrix[i, j] = symbol
+
+        self.matrix = matrix
+
+    def cse(self) -> tuple:
+        """
+        The chain in common subexpression form, like :py:func:`sympy.cse`.
+
+        Returns:
+            Tuple with the list of (symbol, expression) replacements and the
+            product of the chain in terms of these symbols.
+        """
+        return list(self.replacements), self.matrix
+
+    def expand(self, simplify: bool = False) -> sp.Matrix:
+        """
+        The product of the chain in terms of the original symbols.
+
+        Args:
+            simplify: Whether to also simplify every entry, e.g. to collapse
+                      sums into sines and cosines of sums of angles. This is
+                      done by :py:func:`modern_robotics.sym.cache.simplify`.
+
+        Returns:
+            4 by 4 homogeneous transformation matrix.
+        """
+        abbreviations = dict(self.replacements[:2 * len(self._abbreviations)])
+
+        values = {}
+        for symbol, expr in self.replacements[len(abbreviations):]:
+            values[symbol] = self._reduce(expr.xreplace(values))
+
+        matrix = self.matrix.xreplace(values).xreplace(abbreviations)
+
+        if simplify:
+            matrix = matrix.applyfunc(cache.simplify)
+
+        return matrix
+
+    def _abbreviation(self, arg: sp.Basic) -> tuple:
+        """
+        Sine and cosine symbols of arg, created on first use.
+        """
+        if arg not in self._abbreviations:
+            # Joint symbols like q1 give s1 and c1, other symbols keep their
+            # name, e.g. s_theta. Anything else is numbered.
+            n = len(self._abbreviations)
+            names = {s.name for s, c in self._abbreviations.values()}
+            suffix = f'_{n}'
+            if arg.is_Symbol:
+                suffix = re.search(r'\d*$', arg.name).group()
+                if not suffix or f's{suffix}' in names:
+                    suffix = f'_{arg.name}'
+            s = sp.Symbol(f's{suffix}', real=True)
+            c = sp.Symbol(f'c{suffix}', real=True)
+
+            # Abbreviations are kept in front of the intermediate symbols.
+            self._abbreviations[arg] = (s, c)
+            self.replacements[2 * n:2 * n] = [(s, sp.sin(arg)),
+                                              (c, sp.cos(arg))]
+
+        return self._abbreviations[arg]
+
+    def _reduce(self, expr: sp.Basic) -> sp.Basic:
+        """
+        Expands expr and reduces it with s^2 + c^2 = 1 for every pair of
+        abbreviations.
+        """
+        expr = sp.expand(expr)
+        squares = {s: c for s, c in self._abbreviations.values()}
+        if not squares or not expr.has(*squares):
+            return expr
+
+        def reduce_power(power):
+            s, c = power.base, squares[power.base]
+            return s**(power.exp % 2) * (1 - c**2)**(power.exp // 2)
+
+        return sp.expand(expr.replace(
+            lambda e: e.is_Pow and e.base in squares and e.exp.is_Integer
+            and e.exp >= 2, reduce_power))
+
+
+def compose(*links: sp.Matrix, abbreviate: bool = True,
+            intermediates: bool = True) -> Chain:
+    """
+    Composes a chain of transformation matrices, see :py:class:`Chain`.
+
+    Args:
+        links: 4 by 4 homogeneous transformation matrices, in order.
+        abbreviate: Whether to abbreviate sines and cosines by symbols.
+        intermediates: Whether to replace the entries of the product by
+                       intermediate symbols after every link.
+
+    Returns:
+        The composed chain.
+    """
+    chain = Chain(abbreviate, intermediates)
+    for T in links:
+        chain.append(T)
+
+    return chain
+
+
+def _trivial(expr: sp.Basic) -> bool:
+    """
+    Whether expr is a number, a symbol or a negated symbol, which is not
+    worth an intermediate symbol.
+    """
+    return expr.is_Atom or (-expr).is_Atom
@@ -0,0 +1,311 @@
+"""
+.. rubric:: ``modern_robotics.sym.codegen``
+
+This submodule turns symbolic expressions, e.g. the forward kinematics of a
+robot built from :py:mod:`modern_robotics.sym.gen`, into fast numerical
+functions. Common subexpressions are eliminated first, after which either a
+vectorized `numpy <https://numpy.org/>`_ function or a C function (compiled
+with the local C compiler) is generated.
+
+Generated code is cached on disk, keyed by a hash of the expression, so the
+symbolic work only has to be done once. The cache directory is taken from
+the ``MODERN_ROBOTICS_CACHE`` environment variable, and defaults to
+``~/.cache/modern_robotics``.
+
+"""
+
+import ctypes
+import hashlib
+import importlib.util
+import os
+import shutil
+import subprocess
+import tempfile
+import typing
+
+import numpy as np
+import sympy as sp
+
+try:
+    from sympy.printing.numpy import NumPyPrinter
+except ImportError:  # sympy < 1.7
+    from sympy.printing.pycode import NumPyPrinter
+
+
+#: Version of the code generator, part of every cache key so that a change in
+#: the generated code invalidates earlier cache entries.
+CODEGEN_VERSION = 1
+
+
+def compile_expr(expr: typing.Union[sp.Basic, typing.Callable],
+                 args: typing.Sequence[sp.Symbol], backend: str = 'numpy',
+                 key: str = None, cache_dir: str = None) -> typing.Callable:
+    """
+    Compiles a symbolic expression into a vectorized numerical function.
+
+    The generated function takes one argument per symbol in ``args``. The
+    arguments are broadcast against each other, and the result has the
+    broadcast shape followed by the shape of ``expr``. So passing N values
+    for a joint angle returns an N by 4 by 4 array for a transformation
+    matrix.
+
+    Args:
+        expr: Matrix or scalar sympy expression. Can also be a function
+              without arguments that returns the expression, in which case it
+              is only called if the result is not cached yet.
+        args: Symbols that become the arguments of the generated function, in
+              order. All free symbols of ``expr`` should be in here.
+        backend: ``'numpy'`` for a generated numpy function, ``'c'`` for a C
+                 function compiled with the compiler in the ``CC`` environment
+                 variable (``cc`` by default).
+        key: Cache key to use instead of the hash of ``expr``. Has to be given
+             to skip building ``expr`` altogether when it is a function.
+        cache_dir: Directory to cache the generated code in. Defaults to the
+                   ``MODERN_ROBOTICS_CACHE`` environment variable, or
+                   ``~/.cache/modern_robotics``.
+
+    Returns:
+        Vectorized numerical function of ``args``.
+
+    Example:
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> import sympy as sp
+            >>> import modern_robotics.sym as mr
+            >>> q1, q2 = sp.symbols('q1 q2')
+            >>> T = mr.gen.TRz(q1) * mr.gen.Tt(x=1) * mr.gen.TRz(q2) \\
+            ...     * mr.gen.Tt(x=1)
+            >>> fk = mr.codegen.compile_expr(T, [q1, q2])
+            >>> fk(np.array([0, np.pi/2]), np.pi/2).round(3)
+            array([[[ 0., -1.,  0.,  1.],
+                    [ 1.,  0.,  0.,  1.],
+                    [ 0.,  0.,  1.,  0.],
+                    [ 0.,  0.,  0.,  1.]],
+            <BLANKLINE>
+                   [[-1., -0.,  0., -1.],
+                    [ 0., -1.,  0.,  1.],
+                    [ 0.,  0.,  1.,  0.],
+                    [ 0.,  0.,  0.,  1.]]])
+    """
+    if backend not in ('numpy', 'c'):
+        raise ValueError(f'Unknown backend {backend!r}')
+
+    args = tuple(args)
+    cache_dir = _cache_dir(cache_dir)
+
+    if key is None:
+        if callable(expr):
+            expr = expr()
+        key = sp.srepr(expr)
+
+    digest = hashlib.sha256(repr((CODEGEN_VERSION, backend, key,
+                                  tuple(sp.srepr(a) for a in args)))
+                            .encode()).hexdigest()[:32]
+    name = f'mr_{digest}'
+
+    if backend == 'numpy':
+        path = os.path.join(cache_dir, name + '.py')
+        if not os.path.exists(path):
+            if callable(expr):
+                expr = expr()
+            _write(path, _numpy_source(expr, args))
+        return _load_numpy(path, name)
+
+    path = os.path.join(cache_dir, name + _shared_library_suffix())
+    if not os.path.exists(path):
+        if callable(expr):
+            expr = expr()
+        _compile_c(path, _c_source(expr, args))
+    return _load_c(path, len(args))
+
+
+def clear_cache(cache_dir: str = None):
+    """
+    Removes all generated code from the cache directory.
+
+    Args:
+        cache_dir: Cache directory, see :py:func:`compile_expr`.
+    """
+    cache_dir = _cache_dir(cache_dir)
+    for filename in os.listdir(cache_dir):
+        if filename.startswith('mr_'):
+            os.remove(os.path.join(cache_dir, filename))
+
+
+def _cache_dir(cache_dir: str) -> str:
+    """
+    Resolves and creates the cache directory.
+    """
+    if cache_dir is None:
+        cache_dir = os.environ.get(
+            'MODERN_ROBOTICS_CACHE',
+            os.path.join(os.path.expanduser('~'), '.cache', 'modern_robotics'))
+    os.makedirs(cache_dir, exist_ok=True)
+
+    return cache_dir
+
+
+def _write(path: str, text: str):
+    """
+    Writes text to path atomically, so that concurrent processes never see a
+    partially written cache entry.
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(fd, 'w') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def _cse(expr: sp.Basic, args: tuple) -> tuple:
+    """
+    Renames the arguments to ``a0, a1, ...`` and eliminates common
+    subexpressions, which are named ``c0, c1, ...``.
+
+    Returns:
+        Tuple with the argument names, the list of (name, expression)
+        replacements, the flat list of output expressions and the output
+        shape.
+    """
+    expr = sp.sympify(expr)
+    missing = expr.free_symbols - set(args)
+    if missing:
+        raise ValueError(f'Symbols {sorted(map(str, missing))} are not in '
+                         f'args')
+
+    names = [f'a{i}' for i in range(len(args))]
+    expr = expr.xreplace(dict(zip(args, sp.symbols(names))))
+
+    if isinstance(expr, sp.MatrixBase):
+        shape = expr.shape
+        outputs = list(expr)
+    else:
+        shape = ()
+        outputs = [expr]
+
+    replacements, outputs = sp.cse(outputs,
+                                   symbols=sp.numbered_symbols('c'))
+
+    return names, replacements, outputs, shape
+
+
+def _numpy_source(expr: sp.Basic, args: tuple) -> str:
+    """
+    Generates the source of a module with a vectorized numpy function ``f``.
+    """
+    names, replacements, outputs, shape = _cse(expr, args)
+    printer = NumPyPrinter()
+
+    lines = ['import numpy', '', '', f'def f({", ".join(names)}):']
+    for name in names:
+        lines.append(f'    {name} = numpy.asarray({name}, dtype=float)')
+    if names:
+        lines.append(f'    out = numpy.empty(numpy.broadcast('
+                     f'{", ".join(names)}).shape + {shape!r})')
+    else:
+        lines.append(f'    out = numpy.empty({shape!r})')
+    for symbol, replacement in replacements:
+        lines.append(f'    {symbol} = {printer.doprint(replacement)}')
+    for index, output in zip(np.ndindex(*shape), outputs):
+        index = ', '.join(('...',) + tuple(map(str, index)))
+        lines.append(f'    out[{index}] = {printer.doprint(output)}')
+    lines.append('    return out')
+
+    return '\n'.join(lines) + '\n'
+
+
+def _load_numpy(path: str, name: str) -> typing.Callable:
+    """
+    Imports a generated numpy module and returns its function.
+    """
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module.f
+
+
+def _c_source(expr: sp.Basic, args: tuple) -> str:
+    """
+    Generates the source of a C function ``f`` that evaluates the expression
+    for ``n`` sets of arguments, stored row by row in ``args``.
+    """
+    names, replacements, outputs, shape = _cse(expr, args)
+    size = int(np.prod(shape))
+
+    lines = ['#include <math.h>', '',
+             'void f(const double *args, long n, double *out)', '{',
+             '    for (long k = 0; k < n; ++k) {']
+    for i, name in enumerate(names):
+        lines.append(f'        const double {name} = '
+                     f'args[k * {len(names)} + {i}];')
+    for symbol, replacement in replacements:
+        lines.append(f'        const double {symbol} = '
+                     f'{sp.ccode(replacement)};')
+    for i, output in enumerate(outputs):
+        lines.append(f'        out[k * {size} + {i}] = {sp.ccode(output)};')
+    lines += ['    }', '}']
+
+    # The shape is stored in the source as well, so that the wrapper can be
+    # rebuilt from the cached library alone.
+    dims = ', '.join(map(str, shape)) or '0'
+    lines.append(f'const long shape[] = {{{dims}}};')
+    lines.append(f'const long ndim = {len(shape)};')
+
+    return '\n'.join(lines) + '\n'
+
+
+def _shared_library_suffix() -> str:
+    """
+    File name suffix of shared libraries on this platform.
+    """
+    return '.dll' if os.name == 'nt' else '.so'
+
+
+def _compile_c(path: str, source: str):
+    """
+    Compiles C source into a shared library at path.
+    """
+    compiler = os.environ.get('CC', 'cc')
+    if shutil.which(compiler) is None:
+        raise RuntimeError(f'C compiler {compiler!r} not found, use the '
+                           f'numpy backend instead')
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(path)) as tmp:
+        src = os.path.join(tmp, 'f.c')
+        lib = os.path.join(tmp, 'f' + _shared_library_suffix())
+        with open(src, 'w') as f:
+            f.write(source)
+        subprocess.run([compiler, '-O2', '-shared', '-fPIC', '-o', lib, src,
+                        '-lm'], check=True, capture_output=True)
+        os.replace(lib, path)
+
+
+def _load_c(path: str, nargs: int) -> typing.Callable:
+    """
+    Loads a compiled library and wraps its function so that it broadcasts its
+    arguments like the numpy backend.
+    """
+    lib = ctypes.CDLL(path)
+    lib.f.restype = None
+    lib.f.argtypes = [ctypes.c_void_p, ctypes.c_long, ctypes.c_void_p]
+    ndim = ctypes.c_long.in_dll(lib, 'ndim').value
+    shape = tuple((ctypes.c_long * max(ndim, 1)).in_dll(lib, 'shape'))[:ndim]
+
+    def f(*args):
+        if len(args) != nargs:
+            raise TypeError(f'Expected {nargs} arguments, got {len(args)}')
+        args = np.broadcast_arrays(*(np.asarray(a, dtype=float)
+                                     for a in args)) if args else []
+        batch = args[0].shape if args else ()
+        packed = np.ascontiguousarray(
+            np.stack(args, axis=-1).reshape(-1, nargs) if args
+            else np.empty((1, 0)))
+        out = np.empty((packed.shape[0],) + shape)
+        lib.f(packed.ctypes.data, packed.shape[0], out.ctypes.data)
+        return out.reshape(batch + shape)
+
+    # Keep the library loaded as long as the function exists.
+    f.library = lib
+
+    return f
@@ -0,0 +1,34 @@
+"""
+Robot models shared by the tests.
+"""
+
+import numpy as np
+import modern_robotics.num as mr
+
+# UR5, see the example of kinematics.manipulability_map_space, with the
+# screw axes in the space frame (S_LIST) and in the end-effector frame
+# (B_LIST), and the home pose M of the end-effector.
+S_LIST = np.array([[0, 0, 1, 0, 0, 0],
+                   [0, 1, 0, -0.089, 0, 0],
+                   [0, 1, 0, -0.089, 0, 0.425],
+                   [0, 1, 0, -0.089, 0, 0.817],
+                   [0, 0, -1, -0.109, 0.817, 0],
+                   [0, 1, 0, 0.006, 0, 0.817]]).T
+M = np.array([[-1, 0, 0, 0.817],
+              [0, 0, 1, 0.191],
+              [0, 1, 0, -0.006],
+              [0, 0, 0, 1]], dtype=float)
+B_LIST = mr.big_adjoint(mr.inv_SE3(M)) @ S_LIST
+
+# Links of the UR5 with box-shaped inertias: home poses of the link frames
+# and their spatial inertia matrices.
+M_LIST = np.broadcast_to(np.eye(4), (6, 4, 4)).copy()
+M_LIST[:, 0:3, 3] = [[0, 0, 0.089], [0, 0.136, 0.089], [0.425, 0.016, 0.089],
+                     [0.817, 0.109, 0.089], [0.817, 0.109, -0.006],
+                     [0.817, 0.191, -0.006]]
+G_LIST = np.zeros((6, 6, 6))
+G_LIST[:, 0:3, 0:3] = np.array([0.01, 0.03, 0.02, 0.005, 0.003, 0.001]
+                               )[:, np.newaxis, np.newaxis] \
+    * np.diag([1, 1.5, 2])
+G_LIST[:, 3:6, 3:6] = np.array([3.7, 8.4, 2.3, 1.2, 1.2, 0.2]
+                               )[:, np.newaxis, np.newaxis] * np.eye(3)
@@ -0,0 +1,82 @@
+"""
+Bounded and persistent simplification cache of
+:py:mod:`modern_robotics.sym.cache`.
+"""
+
+import pytest
+
+sp = pytest.importorskip('sympy')
+cache = pytest.importorskip('modern_robotics.sym.cache')
+
+x = sp.Symbol('x')
+A, B, C = (sp.sin(x)**2 + sp.cos(x)**2, sp.sin(x) / sp.cos(x),
+           (x**2 - 1) / (x - 1))
+
+
+def _is_hit(c: cache.SimplifyCache, expr: sp.Basic) -> bool:
+    hits = c.hits
+    c.simplify(expr)
+    return c.hits > hits
+
+
+def test_evicts_oldest():
+    c = cache.SimplifyCache(maxsize=2)
+    assert c.simplify(A) == 1
+    c.simplify(B)
+    c.simplify(C)
+
+    assert len(c) == 2
+    assert c.misses == 3
+    assert _is_hit(c, C)
+    assert _is_hit(c, B)
+    assert not _is_hit(c, A)
+
+
+def test_hit_moves_to_front():
+    c = cache.SimplifyCache(maxsize=2)
+    c.simplify(A)
+    c.simplify(B)
+    assert _is_hit(c, A)
+    c.simplify(C)
+
+    assert _is_hit(c, A)
+    assert not _is_hit(c, B)
+
+
+def test_equals():
+    c = cache.SimplifyCache()
+
+    assert c.equals(A, sp.Integer(1))
+    assert c.equals(A, sp.Integer(1))
+    assert (c.hits, c.misses) == (1, 1)
+
+
+def test_persistent_file(tmp_path):
+    path = tmp_path / 'simplify.pickle'
+    first = cache.SimplifyCache(path=str(path))
+    first.simplify(A)
+    first.simplify(sp.Matrix([B, C]))
+    first.save()
+
+    second = cache.SimplifyCache(path=str(path))
+    assert second.simplify(A) == 1
+    assert second.simplify(sp.Matrix([B, C])) == sp.Matrix([sp.tan(x), x + 1])
+    assert (second.hits, second.misses) == (2, 0)
+
+
+def test_corrupt_file(tmp_path):
+    path = tmp_path / 'simplify.pickle'
+    path.write_bytes(b'\x80\x04not a pickle')
+    c = cache.SimplifyCache(path=str(path))
+
+    with pytest.warns(RuntimeWarning, match='corrupt'):
+        assert c.simplify(A) == 1
+    assert (c.hits, c.misses) == (0, 1)
+
+
+def test_unreadable_file(tmp_path):
+    # A directory can not be opened as file.
+    c = cache.SimplifyCache(path=str(tmp_path))
+
+    assert c.simplify(A) == 1
+    assert (c.hits, c.misses) == (0, 1)
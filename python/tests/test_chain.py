@@ -0,0 +1,92 @@
+"""
+Chains of symbolic transformation matrices of
+:py:mod:`modern_robotics.sym.chain`, against the plain matrix product.
+"""
+
+import functools
+import pytest
+
+sp = pytest.importorskip('sympy')
+ms = pytest.importorskip('modern_robotics.sym')
+chain = pytest.importorskip('modern_robotics.sym.chain')
+
+Q = sp.symbols('q1:7', real=True)
+S = sp.symbols('s1:7', real=True)
+C = sp.symbols('c1:7', real=True)
+
+# Six joints with alternating axes and rational link offsets, like an
+# industrial arm.
+LINKS = [ms.gen.TRz(Q[0]) * ms.gen.Tt(z=sp.Rational(89, 1000)),
+         ms.gen.TRy(Q[1]) * ms.gen.Tt(x=sp.Rational(17, 40)),
+         ms.gen.TRy(Q[2]) * ms.gen.Tt(x=sp.Rational(49, 125)),
+         ms.gen.TRy(Q[3]) * ms.gen.Tt(y=sp.Rational(109, 1000)),
+         ms.gen.TRz(Q[4]) * ms.gen.Tt(z=sp.Rational(-19, 200)),
+         ms.gen.TRx(Q[5]) * ms.gen.Tt(y=sp.Rational(41, 500))]
+PRODUCT = functools.reduce(lambda A, B: A * B, LINKS)
+
+
+def _abbreviated(expr: sp.Basic) -> sp.Basic:
+    return sp.expand(expr.xreplace({sp.sin(q): s for q, s in zip(Q, S)})
+                     .xreplace({sp.cos(q): c for q, c in zip(Q, C)}))
+
+
+def _is_zero(expr: sp.Basic) -> bool:
+    """
+    Whether expr vanishes modulo s^2 + c^2 = 1 for all joints. The
+    identities are in distinct variables, so reducing by one after the other
+    gives the normal form.
+    """
+    expr = _abbreviated(expr)
+    for s, c in zip(S, C):
+        expr = sp.rem(expr, s**2 + c**2 - 1, s)
+
+    return sp.expand(expr) == 0
+
+
+def test_expand_equals_product():
+    expanded = chain.compose(*LINKS).expand()
+
+    assert all(_is_zero(e) for e in expanded - PRODUCT)
+
+
+def test_plain_expand_is_expanded_product():
+    # Without abbreviations there is nothing to reduce.
+    expanded = chain.compose(*LINKS, abbreviate=False,
+                             intermediates=False).expand()
+
+    assert expanded == PRODUCT.applyfunc(sp.expand)
+
+
+def test_cse_equals_product():
+    replacements, matrix = chain.compose(*LINKS).cse()
+    for symbol, expr in reversed(replacements):
+        matrix = matrix.xreplace({symbol: expr})
+
+    assert all(_is_zero(e) for e in matrix - PRODUCT)
+
+
+def test_abbreviations():
+    c = chain.compose(*LINKS, intermediates=False)
+    abbreviations = c.replacements[:12]
+
+    assert c.replacements == abbreviations
+    assert abbreviations == [pair for q, s, c_ in zip(Q, S, C)
+                             for pair in ((s, sp.sin(q)), (c_, sp.cos(q)))]
+    assert not c.matrix.has(sp.sin, sp.cos)
+
+
+def test_abbreviation_names():
+    theta, q = sp.symbols('theta q1')
+    c = chain.compose(ms.gen.TRz(theta), ms.gen.TRx(q), ms.gen.TRy(2 * q))
+
+    assert [str(s) for s, _ in c.replacements[:6]] \
+        == ['s_theta', 'c_theta', 's1', 'c1', 's_2', 'c_2']
+
+
+def test_squares_reduced():
+    c = chain.compose(ms.gen.TRz(Q[0]), ms.gen.TRz(-Q[0]),
+                      intermediates=False)
+    assert c.matrix == sp.eye(4)
+
+    matrix = chain.compose(*LINKS, intermediates=False).matrix
+    assert max(sp.degree(e, s) for e in matrix for s in S) == 1
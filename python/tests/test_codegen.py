@@ -0,0 +1,104 @@
+"""
+Code generation of :py:mod:`modern_robotics.sym.codegen`, on the forward
+kinematics and Jacobian of a symbolic three joint arm, with both backends and
+the on-disk cache.
+"""
+
+import os
+import shutil
+import numpy as np
+import pytest
+import modern_robotics.num as mr
+
+sp = pytest.importorskip('sympy')
+ms = pytest.importorskip('modern_robotics.sym')
+codegen = pytest.importorskip('modern_robotics.sym.codegen')
+
+rng = np.random.default_rng(0)
+
+Q = sp.symbols('q1:4')
+T = ms.gen.TRz(Q[0]) * ms.gen.Tt(x=1) * ms.gen.TRy(Q[1]) \
+    * ms.gen.Tt(z=sp.Rational(1, 2)) * ms.gen.TRx(Q[2]) \
+    * ms.gen.Tt(y=sp.Rational(1, 5))
+JACOBIAN = T[0:3, 3].jacobian(Q)
+
+THETA = rng.uniform(-np.pi, np.pi, size=(3, 7))
+
+BACKENDS = ['numpy', pytest.param('c', marks=pytest.mark.skipif(
+    shutil.which(os.environ.get('CC', 'cc')) is None,
+    reason='No C compiler found'))]
+
+
+def _FK(q1, q2, q3) -> np.array:
+    return mr.gen.TRz(q1) @ mr.gen.Tt(x=1) @ mr.gen.TRy(q2) \
+        @ mr.gen.Tt(z=0.5) @ mr.gen.TRx(q3) @ mr.gen.Tt(y=0.2)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_FK(backend, tmp_path):
+    fk = codegen.compile_expr(T, Q, backend=backend, cache_dir=tmp_path)
+
+    np.testing.assert_allclose(fk(*THETA), _FK(*THETA), atol=1e-14)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_scalar_and_broadcast_arguments(backend, tmp_path):
+    fk = codegen.compile_expr(T, Q, backend=backend, cache_dir=tmp_path)
+
+    assert fk(*THETA[:, 0]).shape == (4, 4)
+    np.testing.assert_allclose(fk(*THETA[:, 0]), _FK(*THETA[:, 0]),
+                               atol=1e-14)
+    # A scalar and a 2 by 1 and a 3 array broadcast to 2 by 3.
+    q1, q2, q3 = 0.3, THETA[1, 0:2, np.newaxis], THETA[2, 0:3]
+    assert fk(q1, q2, q3).shape == (2, 3, 4, 4)
+    np.testing.assert_allclose(fk(q1, q2, q3)[1, 2],
+                               _FK(q1, q2[1, 0], q3[2]), atol=1e-14)
+
+
+def test_backends_agree_on_jacobian(tmp_path):
+    if shutil.which(os.environ.get('CC', 'cc')) is None:
+        pytest.skip('No C compiler found')
+    jacobian = [codegen.compile_expr(JACOBIAN, Q, backend=backend,
+                                     cache_dir=tmp_path)(*THETA)
+                for backend in ('numpy', 'c')]
+
+    assert jacobian[0].shape == (7, 3, 3)
+    np.testing.assert_allclose(jacobian[0], jacobian[1], atol=1e-14)
+
+
+def test_jacobian_finite_differences(tmp_path):
+    jacobian = codegen.compile_expr(JACOBIAN, Q, cache_dir=tmp_path)
+    h = 1e-6
+    expected = np.stack([(_FK(*(THETA + h * e[:, np.newaxis]))
+                          - _FK(*(THETA - h * e[:, np.newaxis])))[:, 0:3, 3]
+                         / (2 * h) for e in np.eye(3)], axis=-1)
+
+    np.testing.assert_allclose(jacobian(*THETA), expected, atol=1e-8)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_cache(backend, tmp_path):
+    codegen.compile_expr(T, Q, backend=backend, cache_dir=tmp_path)
+    entries = os.listdir(tmp_path)
+    assert len(entries) == 1
+
+    # A cache hit does not build the expression.
+    def build():
+        raise AssertionError('Expression built despite cache entry')
+    fk = codegen.compile_expr(build, Q, backend=backend, key=sp.srepr(T),
+                              cache_dir=tmp_path)
+    assert os.listdir(tmp_path) == entries
+    np.testing.assert_allclose(fk(*THETA), _FK(*THETA), atol=1e-14)
+
+    # A changed expression is a new entry.
+    codegen.compile_expr(T.subs(Q[2], 0), Q, backend=backend,
+                         cache_dir=tmp_path)
+    assert len(os.listdir(tmp_path)) == 2
+
+    codegen.clear_cache(tmp_path)
+    assert os.listdir(tmp_path) == []
+
+
+def test_missing_symbols(tmp_path):
+    with pytest.raises(ValueError, match='q3'):
+        codegen.compile_expr(T, Q[0:2], cache_dir=tmp_path)
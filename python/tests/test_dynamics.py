@@ -0,0 +1,174 @@
+"""
+Dynamics of :py:mod:`modern_robotics.num.dynamics` on the UR5, checked
+against the energy of the links and the kinematics, and the simulation
+inputs.
+"""
+
+import numpy as np
+import pytest
+import modern_robotics.num as mr
+from modern_robotics.num import dynamics, kinematics
+from robots import G_LIST, M_LIST, S_LIST
+
+rng = np.random.default_rng(0)
+
+THETA = rng.uniform(-1, 1, size=(5, 6))
+THETA_DOT = rng.normal(size=(5, 6))
+THETA_DDOT = rng.normal(size=(5, 6))
+TAU = rng.normal(size=6)
+G = np.array([0, 0, -9.81])
+
+
+def _kinetic_energy(theta: np.array, theta_dot: np.array) -> float:
+    """
+    Sum of the kinetic energies of the links, from their body twists.
+    """
+    T = kinematics.link_poses(M_LIST, S_LIST, theta)
+    J = kinematics.jacobian_space(S_LIST, theta)
+    energy = 0
+    for i in range(len(T)):
+        V = mr.big_adjoint(mr.inv_SE3(T[i])) @ J[:, :i + 1] @ theta_dot[:i + 1]
+        energy += V @ G_LIST[i] @ V / 2
+
+    return energy
+
+
+def _potential_energy(theta: np.array) -> float:
+    """
+    Sum of the potential energies of the links, with their centers of mass
+    at the link frames.
+    """
+    p = kinematics.link_poses(M_LIST, S_LIST, theta)[:, 0:3, 3]
+
+    return -G_LIST[:, 3, 3] @ p @ G
+
+
+def test_mass_matrix_kinetic_energy():
+    M = dynamics.mass_matrix(M_LIST, G_LIST, S_LIST, THETA)
+
+    for M_k, theta, theta_dot in zip(M, THETA, THETA_DOT):
+        assert theta_dot @ M_k @ theta_dot / 2 \
+            == pytest.approx(_kinetic_energy(theta, theta_dot), rel=1e-12)
+    np.testing.assert_allclose(M, np.swapaxes(M, -1, -2), atol=1e-15)
+    assert np.all(np.linalg.eigvalsh(M) > 0)
+
+
+def test_mass_matrix_inverse_dynamics():
+    # Without gravity and velocities, the joint torques are M theta_ddot.
+    M = dynamics.mass_matrix(M_LIST, G_LIST, S_LIST, THETA)
+    tau = dynamics.inverse_dynamics(M_LIST, G_LIST, S_LIST, THETA, 0,
+                                    THETA_DDOT, g=(0, 0, 0))
+
+    np.testing.assert_allclose(tau, (M @ THETA_DDOT[..., np.newaxis])[..., 0],
+                               atol=1e-13)
+
+
+def test_forward_dynamics_inverts_inverse_dynamics():
+    F_tip = rng.normal(size=6)
+    tau = dynamics.inverse_dynamics(M_LIST, G_LIST, S_LIST, THETA, THETA_DOT,
+                                    THETA_DDOT, F_tip=F_tip)
+    theta_ddot = dynamics.forward_dynamics(M_LIST, G_LIST, S_LIST, THETA,
+                                           THETA_DOT, tau, F_tip=F_tip)
+
+    np.testing.assert_allclose(theta_ddot, THETA_DDOT, atol=1e-11)
+
+
+def test_gravity_forces_potential_energy_gradient():
+    h = 1e-6
+    for theta in THETA:
+        gradient = [(_potential_energy(theta + h * e)
+                     - _potential_energy(theta - h * e)) / (2 * h)
+                    for e in np.eye(6)]
+
+        np.testing.assert_allclose(
+            dynamics.gravity_forces(M_LIST, G_LIST, S_LIST, theta, G),
+            gradient, atol=1e-7)
+
+
+def test_end_effector_forces_jacobian_transpose():
+    # F_tip is expressed in the frame of the last link.
+    B_list = mr.big_adjoint(mr.inv_SE3(M_LIST[-1])) @ S_LIST
+    F_tip = rng.normal(size=(5, 6))
+    J_b = kinematics.jacobian_body(B_list, THETA)
+
+    np.testing.assert_allclose(
+        dynamics.end_effector_forces(M_LIST, G_LIST, S_LIST, THETA, F_tip),
+        (np.swapaxes(J_b, -1, -2) @ F_tip[..., np.newaxis])[..., 0],
+        atol=1e-13)
+
+
+def test_batch_matches_samples():
+    # K = 2 instances with their own payloads, of N = 5 samples each.
+    theta = np.stack((THETA, THETA[::-1]))
+    theta_dot = np.stack((THETA_DOT, -THETA_DOT))
+    theta_ddot = np.stack((THETA_DDOT, THETA_DOT))
+    G_list = np.stack((G_LIST, 2 * G_LIST))[:, np.newaxis]
+    F_tip = rng.normal(size=6)
+    tau = dynamics.inverse_dynamics(M_LIST, G_list, S_LIST, theta, theta_dot,
+                                    theta_ddot, F_tip=F_tip)
+
+    assert tau.shape == (2, 5, 6)
+    for k in range(2):
+        for i in range(5):
+            np.testing.assert_allclose(
+                tau[k, i],
+                dynamics.inverse_dynamics(M_LIST, G_list[k, 0], S_LIST,
+                                          theta[k, i], theta_dot[k, i],
+                                          theta_ddot[k, i], F_tip=F_tip),
+                atol=1e-12)
+
+
+def test_euler_step():
+    theta, theta_dot = dynamics.euler_step(
+        lambda t, theta, theta_dot: -theta - t, 2, THETA, THETA_DOT, 0.1)
+
+    np.testing.assert_allclose(theta, THETA + 0.1 * THETA_DOT, atol=1e-15)
+    np.testing.assert_allclose(theta_dot, THETA_DOT - 0.1 * (THETA + 2),
+                               atol=1e-15)
+
+
+def test_rk4_step_harmonic_oscillator():
+    # theta'' = -theta is solved by a rotation of (theta, theta_dot), with a
+    # local error of order dt^5.
+    dt = 0.1
+    theta, theta_dot = dynamics.rk4_step(lambda t, theta, theta_dot: -theta,
+                                         0, THETA, THETA_DOT, dt)
+
+    np.testing.assert_allclose(
+        theta, np.cos(dt) * THETA + np.sin(dt) * THETA_DOT, atol=1e-6)
+    np.testing.assert_allclose(
+        theta_dot, np.cos(dt) * THETA_DOT - np.sin(dt) * THETA, atol=1e-6)
+
+
+def test_rk4_energy_drift():
+    theta, theta_dot = dynamics.simulate(M_LIST, G_LIST, S_LIST, THETA[0],
+                                         THETA_DOT[0], np.zeros(6), 1e-3,
+                                         steps=200)
+    energy = [_kinetic_energy(*state) + _potential_energy(state[0])
+              for state in zip(theta, theta_dot)]
+
+    assert np.ptp(energy) < 1e-9 * np.abs(energy).max()
+
+
+def test_simulate_constant_torque():
+    theta, theta_dot = dynamics.simulate(M_LIST, G_LIST, S_LIST, THETA,
+                                         THETA_DOT, TAU, 0.01, steps=4)
+    expected = dynamics.simulate(M_LIST, G_LIST, S_LIST, THETA, THETA_DOT,
+                                 np.tile(TAU, (4, 1)), 0.01)
+
+    assert theta.shape == (5, 5, 6)
+    np.testing.assert_array_equal(theta, expected[0])
+    np.testing.assert_array_equal(theta_dot, expected[1])
+
+
+def test_simulate_constant_torque_needs_steps():
+    with pytest.raises(ValueError, match='steps'):
+        dynamics.simulate(M_LIST, G_LIST, S_LIST, THETA, THETA_DOT, TAU,
+                          0.01)
+
+
+@pytest.mark.parametrize('steps', [2, 5])
+def test_simulate_steps_must_match_torque_rows(steps):
+    with pytest.raises(ValueError, match='steps'):
+        dynamics.simulate(M_LIST, G_LIST, S_LIST, THETA, THETA_DOT,
+                          np.tile(TAU, (3, 1)), 0.01, steps=steps)
@@ -0,0 +1,137 @@
+"""
+Jacobians of the exponential of :py:mod:`modern_robotics.num`, checked
+against finite differences of the exponential, against the closed forms and
+the derivatives of the exponential of :py:mod:`modern_robotics.sym`, and
+against their inverses. The angles include the Taylor series branch below
+0.1.
+"""
+
+import numpy as np
+import pytest
+import modern_robotics.num as mr
+
+rng = np.random.default_rng(0)
+
+#: Rotation angles of the test points, below and above the series limit.
+ANGLES = (0, 1e-6, 1e-3, 0.09, 0.11, 1, 2.5)
+
+SIDES = ('left', 'right')
+
+
+def _twist(angle: float) -> np.array:
+    x = rng.normal(size=6)
+    x[0:3] *= angle / np.linalg.norm(x[0:3])
+    return x
+
+
+TWISTS = np.array([_twist(angle) for angle in ANGLES])
+
+
+def _exp(x: np.array) -> np.array:
+    theta = np.linalg.norm(x[0:3])
+    if theta == 0:
+        return mr.R_p_to_SE3(np.eye(3), x[3:6])
+    return mr.vec_to_SE3(x / theta, theta)
+
+
+def _vee(X: np.array) -> np.array:
+    return np.array([X[2, 1], X[0, 2], X[1, 0], X[0, 3], X[1, 3], X[2, 3]])
+
+
+def _finite_difference(x: np.array, side: str, h: float = 1e-6) -> np.array:
+    """
+    Central difference of the exponential in the direction of every
+    coordinate, as twist in the space (left) or body (right) frame.
+    """
+    T_inv = mr.inv_SE3(_exp(x))
+    J = np.empty((6, 6))
+    for i, e in enumerate(np.eye(6)):
+        dT = (_exp(x + h * e) - _exp(x - h * e)) / (2 * h)
+        J[:, i] = _vee(dT @ T_inv if side == 'left' else T_inv @ dT)
+
+    return J
+
+
+@pytest.mark.parametrize('side', SIDES)
+@pytest.mark.parametrize('angle', [a for a in ANGLES if a >= 1e-3])
+def test_finite_differences(side, angle):
+    x = TWISTS[ANGLES.index(angle)]
+    J = _finite_difference(x, side)
+
+    np.testing.assert_allclose(mr.exp_jacobian_SE3(x, side), J, atol=1e-8)
+    np.testing.assert_allclose(mr.exp_jacobian_SO3(x[0:3], side), J[0:3, 0:3],
+                               atol=1e-8)
+
+
+@pytest.mark.parametrize('side', SIDES)
+def test_inverse(side):
+    np.testing.assert_allclose(
+        mr.exp_jacobian_SE3(TWISTS, side)
+        @ mr.exp_jacobian_inv_SE3(TWISTS, side),
+        np.broadcast_to(np.eye(6), (len(TWISTS), 6, 6)), atol=1e-13)
+    np.testing.assert_allclose(
+        mr.exp_jacobian_SO3(TWISTS[:, 0:3], side)
+        @ mr.exp_jacobian_inv_SO3(TWISTS[:, 0:3], side),
+        np.broadcast_to(np.eye(3), (len(TWISTS), 3, 3)), atol=1e-13)
+
+
+@pytest.mark.parametrize('side', SIDES)
+def test_single_matches_batch(side):
+    batch = mr.exp_jacobian_SE3(TWISTS, side)
+    for x, J in zip(TWISTS, batch):
+        np.testing.assert_allclose(
+            mr.exp_jacobian_SE3(x.reshape(6, 1), side), J, atol=1e-15)
+
+
+def test_unknown_side():
+    with pytest.raises(ValueError, match='side'):
+        mr.exp_jacobian_SO3(TWISTS[0, 0:3], 'middle')
+
+
+def _exact(x: np.array):
+    """
+    x as exact rational sympy column vector.
+    """
+    sp = pytest.importorskip('sympy')
+    return sp.Matrix([sp.Rational(v) for v in x])
+
+
+def _evaluate(m) -> np.array:
+    return np.array(m.evalf(30).tolist(), dtype=float)
+
+
+@pytest.mark.parametrize('side', SIDES)
+@pytest.mark.parametrize('angle', ANGLES)
+def test_sym_closed_forms(side, angle):
+    ms = pytest.importorskip('modern_robotics.sym')
+    x = TWISTS[ANGLES.index(angle)]
+    for name, n in (('exp_jacobian_SO3', 3), ('exp_jacobian_inv_SO3', 3),
+                    ('exp_jacobian_SE3', 6), ('exp_jacobian_inv_SE3', 6)):
+        np.testing.assert_allclose(
+            getattr(mr, name)(x[0:n], side),
+            _evaluate(getattr(ms, name)(_exact(x[0:n]), side)), atol=1e-13,
+            err_msg=name)
+
+
+@pytest.mark.parametrize('angle', [0.09, 1])
+def test_sym_derivatives(angle):
+    sp = pytest.importorskip('sympy')
+    ms = pytest.importorskip('modern_robotics.sym')
+    x = TWISTS[ANGLES.index(angle)]
+    d = sp.symbols('d0:6', real=True)
+    xi = [sp.Float(v, 30) + di for v, di in zip(x, d)]
+    theta = sp.Matrix(xi[0:3]).norm()
+    T = ms.vec_to_SE3(sp.Matrix(xi) / theta, theta)
+    zero = dict.fromkeys(d, 0)
+    T_inv = np.linalg.inv(_evaluate(T.subs(zero)))
+
+    J_left = np.empty((6, 6))
+    J_right = np.empty((6, 6))
+    for i in range(6):
+        dT = _evaluate(T.diff(d[i]).subs(zero))
+        J_left[:, i] = _vee(dT @ T_inv)
+        J_right[:, i] = _vee(T_inv @ dT)
+
+    np.testing.assert_allclose(mr.exp_jacobian_SE3(x), J_left, atol=1e-13)
+    np.testing.assert_allclose(mr.exp_jacobian_SE3(x, 'right'), J_right,
+                               atol=1e-13)
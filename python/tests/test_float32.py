@@ -0,0 +1,259 @@
+"""
+Precision of :py:mod:`modern_robotics.num`: every function evaluated with
+float32 inputs has to return float32 results, which match the float64
+results within the float32 tolerances below.
+"""
+
+import numpy as np
+import pytest
+import modern_robotics.num as mr
+from modern_robotics.num import dynamics, gen, kinematics, pose, quaternion, \
+    trajectory
+from robots import B_LIST, G_LIST, M, M_LIST, S_LIST
+
+#: Tolerance of float32 results, relative to the largest magnitude of the
+#: float64 result (or absolute below 1). float32 has a resolution of about
+#: 1.2e-7, which leaves room for the rounding of a few hundred operations.
+TOLERANCE = 1e-4
+
+#: Tolerance of results that go through a linear solve or an iteration, which
+#: amplify rounding errors with the condition number.
+SOLVE_TOLERANCE = 1e-3
+
+rng = np.random.default_rng(0)
+
+OMEGA = rng.normal(size=(5, 3))
+TWIST = np.concatenate((OMEGA / np.linalg.norm(OMEGA, axis=1,
+                                               keepdims=True),
+                        rng.normal(size=(5, 3))), axis=1)
+ANGLE = rng.uniform(-3, 3, size=5)
+POSE = mr.vec_to_SE3(TWIST, ANGLE)
+QUATERNION = quaternion.from_SO3(POSE[:, 0:3, 0:3])
+DUAL_QUATERNION = quaternion.dual_from_SE3(POSE)
+
+THETA = rng.uniform(-1, 1, size=(5, 6)) + [0, 0, 0, 0, 1, 0]
+THETA_DOT = rng.normal(size=(5, 6))
+TAU = rng.normal(size=(5, 6))
+F_TIP = rng.normal(size=6)
+
+# Every case maps a function that converts arrays to the precision under test
+# to the result of the function under test, and its tolerance.
+CASES = {
+    'SO3_to_vec': (lambda c: mr.SO3_to_vec(c(POSE[:, 0:3, 0:3])),
+                   TOLERANCE),
+    'SO3_to_vec_robust': (lambda c: mr.SO3_to_vec(
+        c(POSE[:, 0:3, 0:3]), robust=True), TOLERANCE),
+    'vec_to_SO3': (lambda c: mr.vec_to_SO3(c(OMEGA)), TOLERANCE),
+    'vec_to_SO3_theta': (lambda c: mr.vec_to_SO3(c(TWIST[:, 0:3]),
+                                                 c(ANGLE)), TOLERANCE),
+    'vec_to_SO3_robust': (lambda c: mr.vec_to_SO3(c(OMEGA), robust=True),
+                          TOLERANCE),
+    'vec_to_so3': (lambda c: mr.vec_to_so3(c(OMEGA)), TOLERANCE),
+    'so3_to_vec': (lambda c: mr.so3_to_vec(mr.vec_to_so3(c(OMEGA))),
+                   TOLERANCE),
+    'SE3_to_vec': (lambda c: mr.SE3_to_vec(c(POSE)), TOLERANCE),
+    'SE3_to_vec_robust': (lambda c: mr.SE3_to_vec(c(POSE), robust=True),
+                          TOLERANCE),
+    'vec_to_SE3': (lambda c: mr.vec_to_SE3(c(TWIST), c(ANGLE)), TOLERANCE),
+    'vec_to_SE3_single': (lambda c: mr.vec_to_SE3(c(TWIST[0]), c(ANGLE[0])),
+                          TOLERANCE),
+    'big_adjoint': (lambda c: mr.big_adjoint(c(POSE)), TOLERANCE),
+    'little_adjoint': (lambda c: mr.little_adjoint(c(TWIST)), TOLERANCE),
+    'exp_jacobian_SO3': (lambda c: mr.exp_jacobian_SO3(c(OMEGA)),
+                         TOLERANCE),
+    'exp_jacobian_inv_SO3': (lambda c: mr.exp_jacobian_inv_SO3(c(OMEGA)),
+                             TOLERANCE),
+    'exp_jacobian_SE3': (lambda c: mr.exp_jacobian_SE3(c(TWIST)),
+                         TOLERANCE),
+    'exp_jacobian_inv_SE3': (lambda c: mr.exp_jacobian_inv_SE3(c(TWIST)),
+                             TOLERANCE),
+    'inv_SE3': (lambda c: mr.inv_SE3(c(POSE)), TOLERANCE),
+    'R_p_to_SE3': (lambda c: mr.R_p_to_SE3(c(POSE[:, 0:3, 0:3]),
+                                           c(POSE[:, 0:3, 3])), TOLERANCE),
+    'manipulability': (lambda c: mr.manipulability(
+        kinematics.jacobian_space(c(S_LIST), c(THETA))), SOLVE_TOLERANCE),
+
+    'gen.TRx': (lambda c: gen.TRx(c(ANGLE)[0]), TOLERANCE),
+    'gen.TRy': (lambda c: gen.TRy(c(ANGLE)[0]), TOLERANCE),
+    'gen.TRz': (lambda c: gen.TRz(c(ANGLE)[0]), TOLERANCE),
+    'gen.Tt': (lambda c: gen.Tt(c(OMEGA[0])), TOLERANCE),
+    'gen.TRzyx': (lambda c: gen.TRzyx(*c(ANGLE[0:3])), TOLERANCE),
+    'gen.TRrpy': (lambda c: gen.TRrpy(*c(ANGLE[0:3])), TOLERANCE),
+    'gen.TDH': (lambda c: gen.TDH(*c(ANGLE[0:4])), TOLERANCE),
+    'gen.TmDH': (lambda c: gen.TmDH(*c(ANGLE[0:4])), TOLERANCE),
+
+    'pose.SE3.exp': (lambda c: pose.SE3.exp(c(TWIST[0]), c(ANGLE[0])).matrix,
+                     TOLERANCE),
+    'pose.SE3.log': (lambda c: pose.SE3(c(POSE[0])).log(), TOLERANCE),
+    'pose.SE3.compose': (lambda c: pose.SE3(c(POSE[0])).compose(
+        pose.SE3(c(POSE[1]))).matrix, TOLERANCE),
+    'pose.SE3.inv': (lambda c: pose.SE3(c(POSE[0])).inv().matrix, TOLERANCE),
+    'pose.SE3.adjoint': (lambda c: pose.SE3(c(POSE[0])).adjoint(),
+                         TOLERANCE),
+    'pose.SE3.transform': (lambda c: pose.SE3(c(POSE[0])).transform(
+        c(OMEGA.T)), TOLERANCE),
+
+    'kinematics.FK_space': (lambda c: kinematics.FK_space(
+        c(M), c(S_LIST), c(THETA)), TOLERANCE),
+    'kinematics.FK_body': (lambda c: kinematics.FK_body(
+        c(M), c(B_LIST), c(THETA)), TOLERANCE),
+    'kinematics.link_poses': (lambda c: kinematics.link_poses(
+        c(M_LIST), c(S_LIST), c(THETA)), TOLERANCE),
+    'kinematics.jacobian_space': (lambda c: kinematics.jacobian_space(
+        c(S_LIST), c(THETA)), TOLERANCE),
+    'kinematics.jacobian_body': (lambda c: kinematics.jacobian_body(
+        c(B_LIST), c(THETA)), TOLERANCE),
+    'kinematics.FK_jacobian_space': (lambda c: kinematics.FK_jacobian_space(
+        c(M), c(S_LIST), c(THETA)), TOLERANCE),
+    'kinematics.FK_jacobian_body': (lambda c: kinematics.FK_jacobian_body(
+        c(M), c(B_LIST), c(THETA)), TOLERANCE),
+    'kinematics.IK_space': (lambda c: kinematics.IK_space(
+        c(S_LIST), c(M), kinematics.FK_space(c(M), c(S_LIST), c(THETA)),
+        c(THETA + 0.05)).theta, SOLVE_TOLERANCE),
+    'kinematics.IK_body': (lambda c: kinematics.IK_body(
+        c(B_LIST), c(M), kinematics.FK_body(c(M), c(B_LIST), c(THETA)),
+        c(THETA + 0.05)).theta, SOLVE_TOLERANCE),
+
+    'dynamics.inverse_dynamics': (lambda c: dynamics.inverse_dynamics(
+        c(M_LIST), c(G_LIST), c(S_LIST), c(THETA), c(THETA_DOT), c(TAU),
+        F_tip=c(F_TIP)), TOLERANCE),
+    'dynamics.mass_matrix': (lambda c: dynamics.mass_matrix(
+        c(M_LIST), c(G_LIST), c(S_LIST), c(THETA)), TOLERANCE),
+    'dynamics.velocity_quadratic_forces': (
+        lambda c: dynamics.velocity_quadratic_forces(
+            c(M_LIST), c(G_LIST), c(S_LIST), c(THETA), c(THETA_DOT)),
+        TOLERANCE),
+    'dynamics.gravity_forces': (lambda c: dynamics.gravity_forces(
+        c(M_LIST), c(G_LIST), c(S_LIST), c(THETA)), TOLERANCE),
+    'dynamics.end_effector_forces': (lambda c: dynamics.end_effector_forces(
+        c(M_LIST), c(G_LIST), c(S_LIST), c(THETA), c(F_TIP)), TOLERANCE),
+    'dynamics.forward_dynamics': (lambda c: dynamics.forward_dynamics(
+        c(M_LIST), c(G_LIST), c(S_LIST), c(THETA), c(THETA_DOT), c(TAU)),
+        SOLVE_TOLERANCE),
+    'dynamics.simulate': (lambda c: dynamics.simulate(
+        c(M_LIST), c(G_LIST), c(S_LIST), c(THETA), c(THETA_DOT),
+        c(np.repeat(TAU[:, np.newaxis], 3, axis=1)), 0.01), SOLVE_TOLERANCE),
+
+    'quaternion.mul': (lambda c: quaternion.mul(
+        c(QUATERNION), c(QUATERNION[::-1])), TOLERANCE),
+    'quaternion.conjugate': (lambda c: quaternion.conjugate(c(QUATERNION)),
+                             TOLERANCE),
+    'quaternion.inverse': (lambda c: quaternion.inverse(c(QUATERNION)),
+                           TOLERANCE),
+    'quaternion.normalize': (lambda c: quaternion.normalize(
+        c(2 * QUATERNION)), TOLERANCE),
+    'quaternion.exp': (lambda c: quaternion.exp(c(OMEGA)), TOLERANCE),
+    'quaternion.log': (lambda c: quaternion.log(c(QUATERNION)), TOLERANCE),
+    'quaternion.from_SO3': (lambda c: quaternion.from_SO3(
+        c(POSE[:, 0:3, 0:3])), TOLERANCE),
+    'quaternion.to_SO3': (lambda c: quaternion.to_SO3(c(QUATERNION)),
+                          TOLERANCE),
+    'quaternion.slerp': (lambda c: quaternion.slerp(
+        c(QUATERNION), c(QUATERNION[::-1]), c(np.linspace(0, 1, 5))),
+        TOLERANCE),
+    'quaternion.dual_mul': (lambda c: quaternion.dual_mul(
+        c(DUAL_QUATERNION), c(DUAL_QUATERNION[::-1])), TOLERANCE),
+    'quaternion.dual_inverse': (lambda c: quaternion.dual_inverse(
+        c(DUAL_QUATERNION)), TOLERANCE),
+    'quaternion.dual_normalize': (lambda c: quaternion.dual_normalize(
+        c(2 * DUAL_QUATERNION)), TOLERANCE),
+    'quaternion.dual_from_SE3': (lambda c: quaternion.dual_from_SE3(
+        c(POSE)), TOLERANCE),
+    'quaternion.dual_to_SE3': (lambda c: quaternion.dual_to_SE3(
+        c(DUAL_QUATERNION)), TOLERANCE),
+    'quaternion.dual_exp': (lambda c: quaternion.dual_exp(
+        c(TWIST), c(ANGLE)), TOLERANCE),
+    'quaternion.dual_log': (lambda c: quaternion.dual_log(
+        c(DUAL_QUATERNION)), TOLERANCE),
+    'quaternion.sclerp': (lambda c: quaternion.sclerp(
+        c(DUAL_QUATERNION), c(DUAL_QUATERNION[::-1]),
+        c(np.linspace(0, 1, 5))), TOLERANCE),
+
+    'trajectory.cubic_time_scaling': (
+        lambda c: trajectory.cubic_time_scaling(2, c(np.linspace(0, 2, 9))),
+        TOLERANCE),
+    'trajectory.quintic_time_scaling': (
+        lambda c: trajectory.quintic_time_scaling(2,
+                                                  c(np.linspace(0, 2, 9))),
+        TOLERANCE),
+    'trajectory.trapezoidal_time_scaling': (
+        lambda c: trajectory.trapezoidal_time_scaling(
+            2, c(np.linspace(0, 2, 9))), TOLERANCE),
+    'trajectory.joint_trajectory': (lambda c: trajectory.joint_trajectory(
+        c(THETA[0]), c(THETA[1]), 2, 9), TOLERANCE),
+    'trajectory.screw_trajectory': (lambda c: trajectory.screw_trajectory(
+        c(POSE[0]), c(POSE[1]), 2, 9), TOLERANCE),
+    'trajectory.cartesian_trajectory': (
+        lambda c: trajectory.cartesian_trajectory(c(POSE[0]), c(POSE[1]),
+                                                  2, 9), TOLERANCE),
+    'trajectory.iter_joint_trajectory': (
+        lambda c: list(trajectory.iter_joint_trajectory(
+            c(THETA[0]), c(THETA[1]), 2, 9, chunk_size=4)), TOLERANCE),
+    'trajectory.iter_screw_trajectory': (
+        lambda c: list(trajectory.iter_screw_trajectory(
+            c(POSE[0]), c(POSE[1]), 2, 9, chunk_size=4)), TOLERANCE),
+    'trajectory.iter_cartesian_trajectory': (
+        lambda c: list(trajectory.iter_cartesian_trajectory(
+            c(POSE[0]), c(POSE[1]), 2, 9, chunk_size=4)), TOLERANCE),
+}
+
+
+def _caster(dtype: np.dtype):
+    """
+    Function that converts arrays (and sequences of scalars) to dtype.
+    """
+    return lambda a: np.asarray(a, dtype=dtype)
+
+
+def _arrays(result) -> list:
+    """
+    Flattens the (tuples or lists of) arrays of a result into a list.
+    """
+    if isinstance(result, (tuple, list)):
+        return [a for r in result for a in _arrays(r)]
+
+    return [np.asarray(result)]
+
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_float32(name):
+    function, tolerance = CASES[name]
+    results32 = _arrays(function(_caster(np.float32)))
+    results64 = _arrays(function(_caster(np.float64)))
+
+    assert len(results32) == len(results64)
+    for a32, a64 in zip(results32, results64):
+        if not np.issubdtype(a64.dtype, np.floating):
+            # Flags and counters, e.g. of IKResult.
+            continue
+        assert a32.dtype == np.float32
+        assert a32.shape == a64.shape
+        scale = max(1, np.max(np.abs(a64), initial=0))
+        np.testing.assert_array_less(np.abs(a32 - a64), tolerance * scale)
+
+
+def test_manipulability_map_float32():
+    # The map is a record array of fixed type, see MANIPULABILITY_DTYPE, only
+    # its values depend on the precision of the inputs.
+    m32 = kinematics.manipulability_map_space(S_LIST.astype(np.float32),
+                                              THETA.astype(np.float32))
+    m64 = kinematics.manipulability_map_space(S_LIST, THETA)
+
+    np.testing.assert_array_equal(m32['singular'], m64['singular'])
+    np.testing.assert_allclose(m32['measure'], m64['measure'],
+                               rtol=SOLVE_TOLERANCE)
+    np.testing.assert_allclose(m32['condition'], m64['condition'],
+                               rtol=SOLVE_TOLERANCE)
+
+
+@pytest.mark.parametrize('name', ['vec_to_SO3', 'SE3_to_vec', 'FK_space'])
+def test_integers_give_float64(name):
+    result = {
+        'vec_to_SO3': lambda: mr.vec_to_SO3(np.array([1, 2, 3])),
+        'SE3_to_vec': lambda: mr.SE3_to_vec(np.eye(4, dtype=int)),
+        'FK_space': lambda: kinematics.FK_space(np.eye(4, dtype=int),
+                                                S_LIST.astype(int),
+                                                np.array([1, 0, 0, 0, 1, 0])),
+    }[name]()
+
+    assert result.dtype == np.float64
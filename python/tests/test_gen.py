@@ -0,0 +1,67 @@
+"""
+Closed forms of :py:mod:`modern_robotics.num.gen`, against the products of
+the elementary transformations they stand for.
+"""
+
+import numpy as np
+import pytest
+from modern_robotics.num import gen
+
+rng = np.random.default_rng(0)
+
+N = 7
+ANGLES = rng.uniform(-np.pi, np.pi, size=(3, N))
+OFFSETS = rng.normal(size=(2, N))
+
+
+def _TRzyx(alpha, beta, gamma) -> np.array:
+    return gen.TRz(alpha) @ gen.TRy(beta) @ gen.TRx(gamma)
+
+
+def _TDH(theta, d, a, alpha) -> np.array:
+    return gen.TRz(theta) @ gen.Tt(z=d) @ gen.Tt(x=a) @ gen.TRx(alpha)
+
+
+def _TmDH(alpha, a, theta, d) -> np.array:
+    return gen.TRx(alpha) @ gen.Tt(x=a) @ gen.TRz(theta) @ gen.Tt(z=d)
+
+
+# Closed form, product of elementary transformations and arguments.
+CASES = {
+    'TRzyx': (gen.TRzyx, _TRzyx, ANGLES),
+    'TRrpy': (gen.TRrpy, lambda roll, pitch, yaw: _TRzyx(yaw, pitch, roll),
+              ANGLES),
+    'TDH': (gen.TDH, _TDH, (ANGLES[0], OFFSETS[0], OFFSETS[1], ANGLES[1])),
+    'TmDH': (gen.TmDH, _TmDH, (ANGLES[0], OFFSETS[0], ANGLES[1],
+                               OFFSETS[1])),
+}
+
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_batch(name):
+    closed_form, product, args = CASES[name]
+    T = closed_form(*args)
+
+    assert T.shape == (N, 4, 4)
+    np.testing.assert_allclose(T, product(*args), atol=1e-15)
+
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_single(name):
+    closed_form, product, args = CASES[name]
+    args = [float(a[0]) for a in args]
+    T = closed_form(*args)
+
+    assert T.shape == (4, 4)
+    np.testing.assert_allclose(T, product(*args), atol=1e-15)
+
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_broadcast(name):
+    # A single value for the first parameter, e.g. one link for N angles.
+    closed_form, product, args = CASES[name]
+    args = [float(args[0][0])] + list(args[1:])
+
+    np.testing.assert_allclose(closed_form(*args),
+                               product(*np.broadcast_arrays(*args)),
+                               atol=1e-15)
@@ -0,0 +1,86 @@
+"""
+Import time budget of the lazily loaded package. Every test imports in a
+fresh interpreter, so that earlier imports of the test session don't count.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#: Budget in seconds for ``import modern_robotics``, which should not load
+#: numpy (about 0.1 s on its own) or sympy (about 0.5 s).
+IMPORT_BUDGET = 0.05
+
+
+def _import(statement: str) -> dict:
+    """
+    Runs statement in a fresh interpreter, and returns its duration in seconds
+    and the top-level packages that were loaded.
+    """
+    code = ('import json, sys, time\n'
+            'start = time.perf_counter()\n'
+            f'{statement}\n'
+            'duration = time.perf_counter() - start\n'
+            'print(json.dumps({"duration": duration, "modules": '
+            'sorted(sys.modules)}))')
+    env = {k: v for k, v in os.environ.items()
+           if not k.startswith('MODERN_ROBOTICS_')}
+    result = subprocess.run([sys.executable, '-c', code], cwd=PYTHON_DIR,
+                            env=env, check=True, capture_output=True,
+                            text=True)
+
+    return json.loads(result.stdout)
+
+
+def test_package_loads_nothing():
+    result = _import('import modern_robotics')
+
+    assert 'numpy' not in result['modules']
+    assert 'sympy' not in result['modules']
+    assert 'modern_robotics.num' not in result['modules']
+
+
+def test_package_within_budget():
+    # The fastest of a few runs, to be robust against a busy machine.
+    duration = min(_import('import modern_robotics')['duration']
+                   for _ in range(3))
+
+    assert duration < IMPORT_BUDGET
+
+
+def test_num_loads_no_sympy_or_submodules():
+    result = _import('import modern_robotics.num')
+
+    assert 'numpy' in result['modules']
+    assert 'sympy' not in result['modules']
+    assert 'modern_robotics.sym' not in result['modules']
+    assert 'modern_robotics.num.kinematics' not in result['modules']
+
+
+def test_function_access_loads_num_only():
+    result = _import('import modern_robotics\n'
+                     'modern_robotics.vec_to_SO3')
+
+    assert 'modern_robotics.num' in result['modules']
+    assert 'sympy' not in result['modules']
+
+
+def test_star_import_loads_no_submodules():
+    result = _import('from modern_robotics import *\n'
+                     'vec_to_SO3')
+
+    assert 'modern_robotics.num' in result['modules']
+    assert not [name for name in result['modules']
+                if name.startswith('modern_robotics.num.')]
+    assert 'numba' not in result['modules']
+    assert 'multiprocessing' not in result['modules']
+
+
+def test_sym_loads_gen_on_first_use():
+    result = _import('import modern_robotics.sym')
+
+    assert 'sympy' in result['modules']
+    assert 'modern_robotics.sym.gen' not in result['modules']
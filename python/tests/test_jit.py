@@ -0,0 +1,128 @@
+"""
+Parity of the kernels in :py:mod:`modern_robotics.num.jit` with the numpy
+implementations in :py:mod:`modern_robotics.num`, on random inputs and on the
+special cases of the numpy implementations. Skipped if numba is missing.
+"""
+
+import numpy as np
+import pytest
+import modern_robotics.num as mr
+
+pytest.importorskip('numba')
+
+from modern_robotics.num import jit  # noqa: E402
+
+#: Absolute tolerance of the kernels; they evaluate the same formulas as the
+#: numpy implementations, in a different order.
+TOLERANCE = 1e-12
+
+rng = np.random.default_rng(0)
+
+
+def _twist(omega: np.array, v: np.array) -> np.array:
+    return np.concatenate((omega, v)).astype(float)
+
+
+def _unit(v) -> np.array:
+    v = np.asarray(v, dtype=float)
+    return v / np.linalg.norm(v)
+
+
+# Unit screw axes with distances, for the exponentials and the poses.
+SCREWS = {
+    'random': [(_twist(_unit(rng.normal(size=3)), rng.normal(size=3)),
+                rng.uniform(-3, 3)) for _ in range(20)],
+    'zero': [(_twist(_unit([1, 2, 3]), [1, 0, 0]), 0.)],
+    'translation': [(_twist([0, 0, 0], _unit([1, -2, 3])), 1.5)],
+    'half_turn': [(_twist(_unit(axis), [0.1, 0.2, 0.3]), np.pi)
+                  for axis in ([1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 1, 0],
+                               [1, 2, 3], [-1, 0.5, 2])],
+    'near_zero': [(_twist(_unit([1, 2, 3]), [0.3, 0.2, 0.1]), angle)
+                  for angle in (1e-9, 1e-6, 1e-4)],
+}
+POSES = {name: [mr.vec_to_SE3(S, theta) for S, theta in screws]
+         for name, screws in SCREWS.items()}
+POSES['identity'] = [np.eye(4)]
+
+
+@pytest.fixture(autouse=True)
+def numpy_backend():
+    """
+    Evaluates the reference functions with numpy, and restores the backend
+    afterwards.
+    """
+    backend = mr.get_backend()
+    mr.set_backend('numpy')
+    yield
+    mr.set_backend(backend)
+
+
+def test_compiled():
+    assert jit.COMPILED
+
+
+@pytest.mark.parametrize('case', sorted(SCREWS))
+def test_vec_to_SO3(case):
+    for S, theta in SCREWS[case]:
+        np.testing.assert_allclose(jit.vec_to_SO3(S[0:3], theta),
+                                   mr.vec_to_SO3(S[0:3], theta),
+                                   atol=TOLERANCE)
+        if theta != 0 and np.any(S[0:3]):
+            omega = S[0:3] * theta
+            np.testing.assert_allclose(jit.vec_to_SO3(omega),
+                                       mr.vec_to_SO3(omega), atol=TOLERANCE)
+
+
+@pytest.mark.parametrize('case', sorted(SCREWS))
+def test_vec_to_SE3(case):
+    for S, theta in SCREWS[case]:
+        expected = mr.vec_to_SE3(S, theta)
+        np.testing.assert_allclose(jit.vec_to_SE3(S, theta), expected,
+                                   atol=TOLERANCE)
+        out = np.full((4, 4), np.nan)
+        assert jit.vec_to_SE3(S, theta, out) is out
+        np.testing.assert_allclose(out, expected, atol=TOLERANCE)
+
+
+@pytest.mark.parametrize('case', sorted(POSES))
+def test_SE3_to_vec(case):
+    for T in POSES[case]:
+        # NaN for the identity in both.
+        np.testing.assert_allclose(jit.SE3_to_vec(T), mr.SE3_to_vec(T),
+                                   atol=TOLERANCE)
+
+
+@pytest.mark.parametrize('case', sorted(POSES))
+def test_big_adjoint(case):
+    for T in POSES[case]:
+        expected = mr.big_adjoint(T)
+        np.testing.assert_allclose(jit.big_adjoint(T), expected,
+                                   atol=TOLERANCE)
+        out = np.full((6, 6), np.nan)
+        assert jit.big_adjoint(T, out) is out
+        np.testing.assert_allclose(out, expected, atol=TOLERANCE)
+
+
+@pytest.mark.parametrize('case', sorted(POSES))
+def test_inv_SE3(case):
+    for T in POSES[case]:
+        expected = mr.inv_SE3(T)
+        np.testing.assert_allclose(jit.inv_SE3(T), expected, atol=TOLERANCE)
+        # In place.
+        out = T.copy()
+        assert jit.inv_SE3(out, out) is out
+        np.testing.assert_allclose(out, expected, atol=TOLERANCE)
+
+
+def test_backend_dispatch():
+    S, theta = SCREWS['random'][0]
+    T = POSES['random'][0]
+    expected = (mr.vec_to_SO3(S[0:3], theta), mr.vec_to_SE3(S, theta),
+                mr.SE3_to_vec(T), mr.big_adjoint(T), mr.inv_SE3(T))
+
+    mr.set_backend('numba')
+    results = (mr.vec_to_SO3(S[0:3], theta), mr.vec_to_SE3(S, theta),
+               mr.SE3_to_vec(T), mr.big_adjoint(T), mr.inv_SE3(T))
+
+    for result, e in zip(results, expected):
+        np.testing.assert_allclose(result, e, atol=TOLERANCE)
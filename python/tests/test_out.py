@@ -0,0 +1,121 @@
+"""
+Preallocated output buffers: functions that take ``out`` return it, and
+steady-state calls with ``out`` allocate no memory that outlives the call.
+The building blocks of :py:mod:`modern_robotics.num` create no arrays at all,
+apart from a few short-lived views.
+"""
+
+import tracemalloc
+import numpy as np
+import pytest
+import modern_robotics.num as mr
+from modern_robotics.num import kinematics, pose, quaternion, trajectory
+
+#: Number of calls per measurement, and before it.
+CALLS = 1000
+WARMUP = 1000
+
+#: Bytes that the traced memory may grow by over all calls, which is less
+#: than a single 4 by 4 float64 array per 10 calls.
+MAX_GROWTH = 1024
+
+#: Bytes that may be in use at once during a call of a building block, for a
+#: few views but no buffers.
+MAX_PEAK = 2048
+
+T = mr.vec_to_SE3(np.array([0, 0.6, 0.8, 1, 2, 3]), 0.7)
+S_LIST = np.array([[0, 0, 1, 0, 0, 0],
+                   [0, 1, 0, -1, 0, 0],
+                   [0, 1, 0, -2, 0, 0]], dtype=float).T
+THETA = np.array([0.1, 0.2, 0.3])
+Q = quaternion.from_SO3(T[0:3, 0:3])
+DQ = quaternion.dual_from_SE3(T)
+
+BUILDING_BLOCKS = {
+    'vec_to_so3': (lambda out: mr.vec_to_so3(np.array([1., 2., 3.]),
+                                             out=out), (3, 3)),
+    'vec_to_SE3': (lambda out: mr.vec_to_SE3(
+        np.array([0, 0.6, 0.8, 1, 2, 3]), 0.7, out=out), (4, 4)),
+    'big_adjoint': (lambda out: mr.big_adjoint(T, out=out), (6, 6)),
+    'little_adjoint': (lambda out: mr.little_adjoint(np.arange(6.),
+                                                     out=out), (6, 6)),
+    'inv_SE3': (lambda out: mr.inv_SE3(T, out=out), (4, 4)),
+    'R_p_to_SE3': (lambda out: mr.R_p_to_SE3(T[0:3, 0:3], T[0:3, 3],
+                                             out=out), (4, 4)),
+}
+
+# These evaluate intermediate arrays, e.g. the joint exponentials, which are
+# released again after every call.
+COMPOSITES = {
+    'kinematics.FK_space': (lambda out: kinematics.FK_space(
+        np.eye(4), S_LIST, THETA, out=out), (4, 4)),
+    'kinematics.FK_body': (lambda out: kinematics.FK_body(
+        np.eye(4), S_LIST, THETA, out=out), (4, 4)),
+    'quaternion.mul': (lambda out: quaternion.mul(Q, Q, out=out), (4,)),
+    'quaternion.to_SO3': (lambda out: quaternion.to_SO3(Q, out=out), (3, 3)),
+    'quaternion.dual_mul': (lambda out: quaternion.dual_mul(DQ, DQ, out=out),
+                            (8,)),
+    'quaternion.dual_to_SE3': (lambda out: quaternion.dual_to_SE3(DQ,
+                                                                  out=out),
+                               (4, 4)),
+    'pose.SE3.adjoint': (lambda out: pose.SE3(T).adjoint(out=out), (6, 6)),
+    'trajectory.joint_trajectory': (lambda out: trajectory.joint_trajectory(
+        np.zeros(3), THETA, 1, 10, out=out), (10, 3)),
+    'trajectory.screw_trajectory': (lambda out: trajectory.screw_trajectory(
+        np.eye(4), T, 1, 10, out=out), (10, 4, 4)),
+    'trajectory.cartesian_trajectory': (
+        lambda out: trajectory.cartesian_trajectory(np.eye(4), T, 1, 10,
+                                                    out=out), (10, 4, 4)),
+}
+
+
+def _measure(function, out) -> tuple:
+    """
+    Calls function(out) CALLS times after WARMUP calls, and returns whether
+    every call returned out, the growth of the traced memory and its peak, in
+    bytes.
+    """
+    returned_out = True
+    tracemalloc.start()
+    try:
+        # The first traced calls fill caches of numpy and the interpreter,
+        # e.g. the cache of small dimension buffers of numpy, which keeps
+        # blocks that look like a leak to tracemalloc until it is full.
+        for _ in range(WARMUP):
+            function(out)
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(CALLS):
+            returned_out &= function(out) is out
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return returned_out, current - start, peak - start
+
+
+@pytest.mark.parametrize('name', sorted(BUILDING_BLOCKS))
+def test_building_block_allocates_nothing(name):
+    function, shape = BUILDING_BLOCKS[name]
+    returned_out, growth, peak = _measure(function, np.empty(shape))
+
+    assert returned_out
+    assert growth < MAX_GROWTH
+    assert peak < MAX_PEAK
+
+
+@pytest.mark.parametrize('name', sorted(COMPOSITES))
+def test_composite_releases_temporaries(name):
+    function, shape = COMPOSITES[name]
+    returned_out, growth, _ = _measure(function, np.empty(shape))
+
+    assert returned_out
+    assert growth < MAX_GROWTH
+
+
+@pytest.mark.parametrize('name', sorted(BUILDING_BLOCKS) + sorted(COMPOSITES))
+def test_out_matches_allocating_call(name):
+    function, shape = {**BUILDING_BLOCKS, **COMPOSITES}[name]
+    out = np.full(shape, np.nan)
+
+    np.testing.assert_allclose(function(out), function(None), atol=1e-15)
@@ -0,0 +1,108 @@
+"""
+Chunked evaluation on a pool of processes, of
+:py:mod:`modern_robotics.num.parallel`.
+"""
+
+import functools
+import os
+import numpy as np
+import pytest
+from modern_robotics.num import kinematics, parallel
+from robots import M, S_LIST
+
+rng = np.random.default_rng(0)
+
+#: Rows of the batches, not a multiple of the chunk size.
+K = 10
+CHUNK_SIZE = 3
+
+
+def _affine(a: np.array, b: np.array) -> np.array:
+    return 2 * a + b
+
+
+def _pid(a: np.array) -> np.array:
+    return np.full(len(a), os.getpid())
+
+
+def _fail(a: np.array) -> np.array:
+    if np.any(a >= K - 1):
+        raise ArithmeticError('last chunk')
+    return a
+
+
+def _shared_memory_blocks() -> set:
+    # The blocks of multiprocessing.shared_memory are files in /dev/shm.
+    return {name for name in os.listdir('/dev/shm') if name.startswith('psm_')}
+
+
+@pytest.fixture(scope='module')
+def executor():
+    with parallel.Executor(processes=2, chunk_size=CHUNK_SIZE) as executor:
+        yield executor
+
+
+def test_results_in_input_order(executor):
+    a = np.arange(K * 2.).reshape(K, 2)
+    b = rng.normal(size=K)[:, np.newaxis]
+
+    np.testing.assert_array_equal(executor.map_batch(_affine, a, b),
+                                  2 * a + b)
+
+
+def test_module_level_map_batch():
+    a = np.arange(K)
+
+    np.testing.assert_array_equal(
+        parallel.map_batch(_affine, a, a, processes=2, chunk_size=CHUNK_SIZE),
+        3 * a)
+
+
+def test_named_tuple(executor):
+    theta = rng.uniform(-1, 1, size=(K, 6))
+    T_d = kinematics.FK_space(M, S_LIST, theta)
+    theta0 = theta + rng.normal(scale=0.05, size=theta.shape)
+    IK = functools.partial(kinematics.IK_space, S_LIST, M)
+    result = executor.map_batch(IK, T_d, theta0)
+    expected = IK(T_d, theta0)
+
+    assert type(result) is kinematics.IKResult
+    for field in kinematics.IKResult._fields:
+        np.testing.assert_array_equal(getattr(result, field),
+                                      getattr(expected, field))
+
+
+def test_chunks_in_processes(executor):
+    assert os.getpid() not in executor.map_batch(_pid, np.arange(K))
+
+
+def test_single_process_in_process():
+    with parallel.Executor(processes=1, chunk_size=CHUNK_SIZE) as executor:
+        np.testing.assert_array_equal(executor.map_batch(_pid, np.arange(K)),
+                                      os.getpid())
+        assert executor._pool is None
+
+
+@pytest.mark.skipif(not os.path.isdir('/dev/shm'),
+                    reason='Shared memory is not in /dev/shm')
+def test_worker_exception_releases_shared_memory(executor):
+    before = _shared_memory_blocks()
+
+    with pytest.raises(ArithmeticError, match='last chunk'):
+        executor.map_batch(_fail, np.arange(K))
+    assert _shared_memory_blocks() == before
+
+
+def test_tune_chunk_size():
+    with parallel.Executor(processes=2) as executor:
+        chunk_size = executor.tune_chunk_size(_affine, np.arange(K),
+                                              np.arange(K), candidates=[2, 5],
+                                              repeat=1)
+
+        assert chunk_size in (2, 5)
+        assert executor.chunk_size == chunk_size
+
+
+def test_different_lengths(executor):
+    with pytest.raises(ValueError, match='same length'):
+        executor.map_batch(_affine, np.arange(K), np.arange(K - 1))
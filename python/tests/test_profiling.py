@@ -0,0 +1,88 @@
+"""
+Profiling of lazily loaded modules. Every test runs in a fresh interpreter,
+so that no module of the package is imported before the profile starts.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(code: str, **env) -> dict:
+    """
+    Runs code in a fresh interpreter with the additional environment
+    variables, and returns what it printed as JSON.
+    """
+    env = dict({k: v for k, v in os.environ.items()
+                if not k.startswith('MODERN_ROBOTICS_')}, **env)
+    result = subprocess.run([sys.executable, '-c', code], cwd=PYTHON_DIR,
+                            env=env, check=True, capture_output=True,
+                            text=True)
+
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_environment_variable_keeps_lazy_loading(tmp_path):
+    path = tmp_path / 'profile.json'
+    loaded = _run('import json, sys\n'
+                  'import modern_robotics\n'
+                  'print(json.dumps(sorted(sys.modules)))',
+                  MODERN_ROBOTICS_PROFILE=str(path))
+
+    for module in ('numpy', 'sympy', 'modern_robotics.num',
+                   'modern_robotics.num.jit'):
+        assert module not in loaded
+    assert json.loads(path.read_text()) == {'functions': {}, 'branches': {}}
+
+
+def test_modules_imported_later_are_instrumented(tmp_path):
+    path = tmp_path / 'profile.json'
+    _run('import json\n'
+         'import numpy as np\n'
+         'import modern_robotics\n'
+         'from modern_robotics.num import kinematics\n'
+         'modern_robotics.SO3_to_vec(np.eye(3))\n'
+         'kinematics.FK_space(np.eye(4), np.array([[0, 0, 1, 0, 0, 0]]).T,'
+         ' [1])\n'
+         'print(json.dumps(None))',
+         MODERN_ROBOTICS_PROFILE=str(path))
+    stats = json.loads(path.read_text())
+
+    assert stats['functions']['num.SO3_to_vec']['calls'] == 1
+    assert stats['functions']['num.kinematics.FK_space']['calls'] == 1
+    assert stats['branches']['num.SO3_to_vec.identity'] \
+        == {'hits': 1, 'total': 1}
+
+
+def test_stop_restores_functions_forwarded_later():
+    restored = _run(
+        'import json\n'
+        'import modern_robotics\n'
+        'from modern_robotics import profiling\n'
+        'with profiling.Profile():\n'
+        '    instrumented = modern_robotics.vec_to_SO3\n'
+        'import modern_robotics.num as mr\n'
+        'print(json.dumps([instrumented is not mr.vec_to_SO3,\n'
+        '                  modern_robotics.vec_to_SO3 is mr.vec_to_SO3]))')
+
+    assert restored == [True, True]
+
+
+def test_sym_imported_later_is_instrumented():
+    pytest.importorskip('sympy')
+    stats = _run(
+        'import json\n'
+        'import sympy as sp\n'
+        'from modern_robotics import profiling\n'
+        'with profiling.Profile() as profile:\n'
+        '    import modern_robotics.sym as ms\n'
+        '    ms.SO3_to_vec(sp.eye(3))\n'
+        'print(json.dumps(profile.stats()))')
+
+    assert stats['functions']['sym.SO3_to_vec']['calls'] == 1
+    assert stats['branches']['sym.SO3_to_vec.identity'] \
+        == {'hits': 1, 'total': 1}
@@ -0,0 +1,128 @@
+"""
+Unit quaternions and dual quaternions of
+:py:mod:`modern_robotics.num.quaternion`, against the rotation and
+transformation matrices they represent.
+"""
+
+import numpy as np
+import modern_robotics.num as mr
+from modern_robotics.num import quaternion, trajectory
+
+rng = np.random.default_rng(0)
+
+#: Rotation angles, including the identity and (close to) a half turn.
+ANGLES = np.array([0, 1e-8, 0.3, 1, 2, 3, np.pi - 1e-6, np.pi])
+
+#: Rotations below a half turn, which have a unique logarithm.
+UNIQUE = ANGLES < np.pi
+
+
+def _unit(n: int, size: int) -> np.array:
+    a = rng.normal(size=(n, size))
+    return a / np.linalg.norm(a, axis=-1, keepdims=True)
+
+
+OMEGA = _unit(len(ANGLES), 3) * ANGLES[:, np.newaxis]
+TWIST = np.concatenate((OMEGA, rng.normal(size=(len(ANGLES), 3))), axis=-1)
+R = mr.vec_to_SO3(OMEGA, robust=True)
+T = mr.R_p_to_SE3(R, rng.normal(size=(len(ANGLES), 3)))
+
+
+def _vec_to_SE3(S: np.array) -> np.array:
+    """
+    Exponential of twists S with length theta, including zero rotations.
+    """
+    T = np.empty(S.shape[:-1] + (4, 4))
+    for i, S_i in enumerate(S):
+        theta = np.linalg.norm(S_i[0:3])
+        T[i] = mr.vec_to_SE3(S_i / theta, theta) if theta > 0 \
+            else mr.R_p_to_SE3(np.eye(3), S_i[3:6])
+
+    return T
+
+
+def _assert_same_rotation(q: np.array, p: np.array):
+    # q and -q represent the same rotation.
+    sign = np.where(np.sum(q * p, axis=-1, keepdims=True) < 0, -1, 1)
+    np.testing.assert_allclose(q, sign * p, atol=1e-12)
+
+
+def test_SO3_round_trip():
+    q = quaternion.from_SO3(R)
+
+    np.testing.assert_allclose(np.linalg.norm(q, axis=-1), 1, atol=1e-15)
+    np.testing.assert_allclose(quaternion.to_SO3(q), R, atol=1e-15)
+    _assert_same_rotation(quaternion.from_SO3(quaternion.to_SO3(q)), q)
+
+
+def test_SE3_round_trip():
+    Q = quaternion.dual_from_SE3(T)
+
+    np.testing.assert_allclose(quaternion.dual_to_SE3(Q), T, atol=1e-15)
+    _assert_same_rotation(
+        quaternion.dual_from_SE3(quaternion.dual_to_SE3(Q)), Q)
+
+
+def test_exp_matches_vec_to_SO3():
+    np.testing.assert_allclose(quaternion.to_SO3(quaternion.exp(OMEGA)), R,
+                               atol=1e-15)
+
+
+def test_log_inverts_exp():
+    omega = quaternion.log(quaternion.exp(OMEGA))
+
+    np.testing.assert_allclose(omega[UNIQUE], OMEGA[UNIQUE], atol=1e-9)
+    np.testing.assert_allclose(np.linalg.norm(omega, axis=-1), ANGLES,
+                               atol=1e-9)
+
+
+def test_dual_exp_matches_vec_to_SE3():
+    np.testing.assert_allclose(
+        quaternion.dual_to_SE3(quaternion.dual_exp(TWIST, 1)),
+        _vec_to_SE3(TWIST), atol=1e-14)
+
+
+def test_dual_log_round_trips():
+    Q = quaternion.dual_from_SE3(T)
+    S = quaternion.dual_log(Q)
+
+    _assert_same_rotation(quaternion.dual_exp(S, 1), Q)
+    np.testing.assert_allclose(
+        quaternion.dual_log(quaternion.dual_exp(TWIST, 1))[UNIQUE],
+        TWIST[UNIQUE], atol=1e-9)
+
+
+def test_mul_matches_matrix_product():
+    q = quaternion.from_SO3(R)
+    p = q[::-1]
+
+    np.testing.assert_allclose(quaternion.to_SO3(quaternion.mul(q, p)),
+                               R @ R[::-1], atol=1e-14)
+    np.testing.assert_allclose(quaternion.to_SO3(quaternion.inverse(q)),
+                               np.swapaxes(R, -1, -2), atol=1e-15)
+
+
+def test_dual_mul_matches_matrix_product():
+    Q = quaternion.dual_from_SE3(T)
+    P = Q[::-1]
+
+    np.testing.assert_allclose(
+        quaternion.dual_to_SE3(quaternion.dual_mul(Q, P)), T @ T[::-1],
+        atol=1e-14)
+    np.testing.assert_allclose(
+        quaternion.dual_to_SE3(quaternion.dual_inverse(Q)), mr.inv_SE3(T),
+        atol=1e-15)
+
+
+def test_sclerp_matches_screw_trajectory():
+    T_f, N = 2, 11
+    X_start, X_end = T[2], T[4]
+    s = trajectory.quintic_time_scaling(T_f, np.linspace(0, T_f, N))
+    Q = quaternion.sclerp(quaternion.dual_from_SE3(X_start),
+                          quaternion.dual_from_SE3(X_end), s)
+    X = quaternion.dual_to_SE3(Q)
+
+    np.testing.assert_allclose(X[0], X_start, atol=1e-15)
+    np.testing.assert_allclose(X[-1], X_end, atol=1e-14)
+    np.testing.assert_allclose(
+        X, trajectory.screw_trajectory(X_start, X_end, T_f, N), atol=1e-14)
@@ -0,0 +1,99 @@
+"""
+Robust mode of the exponentials and logarithms of
+:py:mod:`modern_robotics.num`, checked against :py:mod:`modern_robotics.sym`
+evaluated to 40 digits, at and close to the angles where the closed forms
+divide by zero.
+"""
+
+import numpy as np
+import pytest
+import modern_robotics.num as mr
+from modern_robotics.num import pose
+
+sp = pytest.importorskip('sympy')
+ms = pytest.importorskip('modern_robotics.sym')
+
+#: Exact unit rotation axis and linear velocity of the twist.
+OMEGA = sp.Matrix([2, 3, 6]) / 7
+V = sp.Matrix([sp.Rational(1, 3), -2, sp.Rational(5, 4)])
+
+ANGLES = {
+    'zero': sp.Integer(0),
+    '1e-8': sp.Rational(1, 10**8),
+    '1e-4': sp.Rational(1, 10**4),
+    'pi-1e-6': sp.pi - sp.Rational(1, 10**6),
+    'pi': sp.pi,
+}
+
+# Relative to the entries, since the twists are as small as the angle.
+RTOL = 1e-10
+ATOL = 1e-15
+
+
+def _evaluate(m) -> np.array:
+    return np.array(sp.N(m, 40).tolist(), dtype=float)
+
+
+def _exact(name: str) -> tuple:
+    """
+    Angle, rotation vector, twist, rotation matrix and pose of the angle
+    name, from the exact exponentials of sym.
+    """
+    theta = ANGLES[name]
+    S = OMEGA.col_join(V)
+    R = ms.vec_to_SO3(OMEGA, theta) if theta != 0 else sp.eye(3)
+    return (float(theta), _evaluate(OMEGA * theta)[:, 0],
+            _evaluate(S * theta)[:, 0], _evaluate(R),
+            _evaluate(ms.vec_to_SE3(S, theta)))
+
+
+@pytest.mark.parametrize('name', sorted(ANGLES))
+def test_vec_to_SO3(name):
+    _, omega, _, R, _ = _exact(name)
+
+    np.testing.assert_allclose(mr.vec_to_SO3(omega, robust=True), R,
+                               rtol=RTOL, atol=ATOL)
+
+
+@pytest.mark.parametrize('name', sorted(ANGLES))
+def test_vec_to_SE3(name):
+    theta, _, _, _, T = _exact(name)
+
+    np.testing.assert_allclose(
+        mr.vec_to_SE3(_evaluate(OMEGA.col_join(V))[:, 0], theta), T,
+        rtol=RTOL, atol=ATOL)
+
+
+@pytest.mark.parametrize('name', sorted(set(ANGLES) - {'pi'}))
+def test_SO3_to_vec(name):
+    _, omega, _, R, _ = _exact(name)
+
+    np.testing.assert_allclose(mr.SO3_to_vec(R, robust=True)[:, 0], omega,
+                               rtol=RTOL, atol=ATOL)
+
+
+@pytest.mark.parametrize('name', sorted(set(ANGLES) - {'pi'}))
+def test_SE3_to_vec(name):
+    _, _, S, _, T = _exact(name)
+
+    np.testing.assert_allclose(mr.SE3_to_vec(T, robust=True)[:, 0], S,
+                               rtol=RTOL, atol=ATOL)
+
+
+def test_half_turn_round_trip():
+    # The sign of the axis of a half turn is arbitrary, so only the
+    # exponential of the logarithm is unique.
+    theta, _, _, R, T = _exact('pi')
+    omega = mr.SO3_to_vec(R, robust=True)[:, 0]
+    S = mr.SE3_to_vec(T, robust=True)[:, 0]
+
+    assert np.linalg.norm(omega) == pytest.approx(theta)
+    assert np.linalg.norm(S[0:3]) == pytest.approx(theta)
+    np.testing.assert_allclose(mr.vec_to_SO3(omega, robust=True), R,
+                               atol=1e-14)
+    np.testing.assert_allclose(mr.vec_to_SE3(S / theta, theta), T, atol=1e-14)
+
+
+def test_pose_log_of_identity():
+    np.testing.assert_array_equal(pose.SE3.exp(np.zeros(6), 0).log(),
+                                  np.zeros((6, 1)))
@@ -0,0 +1,71 @@
+"""
+Lazily generated trajectories of :py:mod:`modern_robotics.num.trajectory`,
+against the trajectories generated in one call.
+"""
+
+import functools
+import numpy as np
+import pytest
+import modern_robotics.num as mr
+from modern_robotics.num import trajectory
+
+#: Number of samples, and a chunk size that does not divide it.
+N = 101
+CHUNK_SIZE = 7
+
+X_START = mr.gen.Tt(x=0.5, z=-1) @ mr.gen.TRzyx(0.3, -0.2, 1)
+X_END = mr.gen.Tt(x=1, y=2) @ mr.gen.TRz(np.pi/2)
+THETA_START = np.array([0, 0.5, -1])
+THETA_END = np.array([1, -0.5, 2])
+
+# Lazy and vectorized variant of every trajectory, and its end points.
+CASES = {
+    'joint': (trajectory.iter_joint_trajectory, trajectory.joint_trajectory,
+              THETA_START, THETA_END),
+    'screw': (trajectory.iter_screw_trajectory, trajectory.screw_trajectory,
+              X_START, X_END),
+    'cartesian': (trajectory.iter_cartesian_trajectory,
+                  trajectory.cartesian_trajectory, X_START, X_END),
+}
+
+TIME_SCALINGS = {
+    'quintic': None,
+    'cubic': trajectory.cubic_time_scaling,
+    'trapezoidal': functools.partial(trajectory.trapezoidal_time_scaling,
+                                     v=0.6),
+}
+
+
+@pytest.mark.parametrize('time_scaling', sorted(TIME_SCALINGS))
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_chunks_equal_full_trajectory(name, time_scaling):
+    lazy, full, start, end = CASES[name]
+    time_scaling = TIME_SCALINGS[time_scaling]
+    samples = list(lazy(start, end, 2, N, time_scaling,
+                        chunk_size=CHUNK_SIZE))
+    expected = full(start, end, 2, N, time_scaling)
+
+    assert len(samples) == N
+    np.testing.assert_array_equal(np.stack(samples), expected)
+    np.testing.assert_allclose(samples[0], start, atol=1e-15)
+    np.testing.assert_allclose(samples[-1], end, atol=1e-14)
+
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_samples_stay_valid(name):
+    # Every chunk has its own array, later chunks don't overwrite samples.
+    lazy, _, start, end = CASES[name]
+    samples = lazy(start, end, 2, N, chunk_size=CHUNK_SIZE)
+    first = next(samples)
+    for _ in samples:
+        pass
+
+    np.testing.assert_allclose(first, start, atol=1e-15)
+
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_too_few_samples(name):
+    lazy, _, start, end = CASES[name]
+
+    with pytest.raises(ValueError, match='2 samples'):
+        list(lazy(start, end, 2, 1))